@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Compares the scalar and vectorized DPDash name functions.
+
+Usage: python benchmarks/dpdash_names.py [--count 1000000]
+"""
+
+import sys
+from pathlib import Path
+
+file = Path(__file__).resolve()
+parent = file.parent
+root = None
+for parent in file.parents:
+    if parent.name == "ampscz-interview-qc":
+        root = parent
+sys.path.append(str(root))
+
+# remove current directory from path
+try:
+    sys.path.remove(str(parent))
+except ValueError:
+    pass
+
+import time
+from argparse import ArgumentParser
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+from interviewqc.helpers import dpdash
+
+console = Console(color_system="standard")
+
+
+def get_fields(count: int, subjects: int) -> pd.DataFrame:
+    """
+    Generates the fields of `count` interview names, of `subjects` subjects
+    interviewed on their first 100 days.
+
+    Args:
+        count (int): The number of names.
+        subjects (int): The number of subjects.
+
+    Returns:
+        pd.DataFrame: The study, subject, data_type, category and time_range columns.
+    """
+    rng = np.random.default_rng(seed=0)
+    subject_ids = pd.Series(rng.integers(10000, 10000 + subjects, size=count)).astype(
+        str
+    )
+
+    return pd.DataFrame(
+        {
+            "study": "Prescient" + subject_ids.str[:2],
+            "subject": "GW" + subject_ids,
+            "data_type": "interview",
+            "category": rng.choice(["open", "psychs"], size=count),
+            "time_range": "day"
+            + pd.Series(rng.integers(1, 101, size=count)).astype(str).str.zfill(4),
+        }
+    )
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    """
+    Runs a function.
+
+    Args:
+        function (Callable[[], object]): The function.
+
+    Returns:
+        Tuple[float, object]: The duration (in seconds) and the result.
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def get_names_scalar(fields: pd.DataFrame) -> List[str]:
+    return [
+        dpdash.get_dpdash_name(
+            study=row.study,
+            subject=row.subject,
+            data_type=row.data_type,
+            category=row.category,
+            time_range=row.time_range,
+        )
+        for row in fields.itertuples(index=False)
+    ]
+
+
+def parse_names_scalar(names: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame(
+        [dpdash.parse_dpdash_name(name) for name in names], index=names.index
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--count", type=int, default=1_000_000, help="The number of names."
+    )
+    arg_parser.add_argument(
+        "--subjects", type=int, default=2_000, help="The number of subjects."
+    )
+    args = arg_parser.parse_args()
+
+    fields = get_fields(args.count, args.subjects)
+    console.print(
+        f"Benchmarking {args.count} names of {args.subjects} subjects "
+        f"(the parse cache holds {dpdash.NAME_CACHE_SIZE} names)..."
+    )
+
+    # (scalar, scalar with a warm cache, vectorized) durations
+    results: Dict[str, Tuple[float, float, float]] = {}
+
+    scalar_s, names = timed(lambda: get_names_scalar(fields))
+    cached_s, _ = timed(lambda: get_names_scalar(fields))
+    vectorized_s, names_series = timed(lambda: dpdash.get_dpdash_names(fields))
+    assert names_series.tolist() == names
+    results["get_dpdash_name(s)"] = (scalar_s, cached_s, vectorized_s)
+
+    names_series = names_series + ".mp3"
+    dpdash._parse_dpdash_name.cache_clear()  # pylint: disable=protected-access
+    scalar_s, parsed = timed(lambda: parse_names_scalar(names_series))
+    cached_s, _ = timed(lambda: parse_names_scalar(names_series))
+    vectorized_s, parsed_series = timed(lambda: dpdash.parse_dpdash_names(names_series))
+    assert parsed_series.equals(parsed[parsed_series.columns])
+    results["parse_dpdash_name(s)"] = (scalar_s, cached_s, vectorized_s)
+
+    table = Table(title=f"DPDash names ({args.count} rows)")
+    table.add_column("Function")
+    table.add_column("Scalar (s)", justify="right")
+    table.add_column("Scalar, warm cache (s)", justify="right")
+    table.add_column("Vectorized (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    for function, (scalar_s, cached_s, vectorized_s) in results.items():
+        table.add_row(
+            function,
+            f"{scalar_s:.2f}",
+            f"{cached_s:.2f}",
+            f"{vectorized_s:.2f}",
+            f"{scalar_s / vectorized_s:.1f}x",
+        )
+
+    console.print(table)
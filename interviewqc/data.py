@@ -1,27 +1,203 @@
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Sequence, Union
+import threading
 
-from interviewqc.helpers import db
+import numpy as np
+import pandas as pd
 
+from interviewqc.helpers import db, dpdash
 
-def get_consent_data(config_file: Path, subject_id: str) -> Optional[datetime]:
-    query = f"""
-        SELECT
-            consent_date
-        FROM
-            subjects
-        WHERE
-            subject_id = '{subject_id}';
+_CONSENT_INDEXES: Dict[str, "ConsentIndex"] = {}
+_CONSENT_INDEXES_LOCK = threading.Lock()
+
+
+class ConsentIndex:
+    """
+    Consent dates of all subjects, loaded from the 'subjects' table with a single query.
+
+    Attributes:
+        consent_dates (pd.Series): The consent dates (datetime64[ns]), indexed by subject ID.
+    """
+
+    def __init__(self, consent_dates: pd.Series):
+        self.consent_dates = consent_dates
+
+    def __len__(self) -> int:
+        return len(self.consent_dates)
+
+    def __contains__(self, subject_id: str) -> bool:
+        return subject_id in self.consent_dates.index
+
+    @staticmethod
+    def load(config_file: Path) -> "ConsentIndex":
+        """
+        Loads the consent dates of all subjects.
+
+        Args:
+            config_file (Path): The path to the configuration file.
+
+        Returns:
+            ConsentIndex: The consent dates of all subjects.
+        """
+        query = """
+            SELECT
+                subject_id,
+                consent_date
+            FROM
+                subjects;
+        """
+
+        df = db.execute_sql(config_file=config_file, query=query)
+        consent_dates = pd.Series(
+            pd.to_datetime(df["consent_date"]).to_numpy(dtype="datetime64[ns]"),
+            index=df["subject_id"].to_numpy(),
+        )
+
+        return ConsentIndex(consent_dates=consent_dates)
+
+    def get_consent_date(self, subject_id: str) -> Optional[datetime]:
+        """
+        Returns the consent date of a subject.
+
+        Args:
+            subject_id (str): The ID of the subject.
+
+        Returns:
+            Optional[datetime]: The consent date, or None if the subject is unknown.
+        """
+        consent_date = self.consent_dates.get(subject_id)
+        if consent_date is None:
+            return None
+
+        return pd.Timestamp(consent_date).to_pydatetime()
+
+    def _get_consent_dates(
+        self, subject_ids: Union[str, Sequence[str]], count: int
+    ) -> np.ndarray:
+        if isinstance(subject_ids, str):
+            if subject_ids not in self:
+                raise ValueError(f"Subject {subject_ids} has no consent date")
+            return np.full(count, self.consent_dates[subject_ids], dtype="datetime64[ns]")
+
+        if len(subject_ids) != count:
+            raise ValueError(
+                f"Got {len(subject_ids)} subject IDs for {count} event dates"
+            )
+
+        consent_dates = self.consent_dates.reindex(subject_ids).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        missing = np.isnat(consent_dates)
+        if missing.any():
+            subject_id = np.asarray(subject_ids)[missing][0]
+            raise ValueError(f"Subject {subject_id} has no consent date")
+
+        return consent_dates
+
+    def days_since_consent(
+        self,
+        subject_ids: Union[str, Sequence[str]],
+        event_dates: Sequence[datetime],
+    ) -> np.ndarray:
+        """
+        Computes the number of days since consent of many events, as
+        `compute_days_since_consent` does for one: consent day is day 1.
+
+        Args:
+            subject_ids (Union[str, Sequence[str]]): The ID of the subject of all
+                the events, or the ID of the subject of each event.
+            event_dates (Sequence[datetime]): The dates of the events.
+
+        Returns:
+            np.ndarray: The number of days since consent of each event.
+
+        Raises:
+            ValueError: If a subject has no consent date, or an event date is missing.
+        """
+        events = _to_datetime64(event_dates)
+        consent_dates = self._get_consent_dates(subject_ids, len(events))
+
+        return (events - consent_dates) // np.timedelta64(1, "D") + 1
+
+    def dpdash_timepoint(
+        self,
+        subject_ids: Union[str, Sequence[str]],
+        event_dates: Sequence[datetime],
+    ) -> np.ndarray:
+        """
+        Generates the DPDash timepoints (dayXXXX) of many events, as
+        `dpdash.get_dpdash_timepoint` does for one.
+
+        Args:
+            subject_ids (Union[str, Sequence[str]]): The ID of the subject of all
+                the events, or the ID of the subject of each event.
+            event_dates (Sequence[datetime]): The dates of the events.
+
+        Returns:
+            np.ndarray: The timepoint of each event.
+
+        Raises:
+            ValueError: If a subject has no consent date, or an event date is missing.
+        """
+        events = _to_datetime64(event_dates)
+        consent_dates = self._get_consent_dates(subject_ids, len(events))
+
+        return dpdash.get_dpdash_timepoints(
+            consent_dates=consent_dates, event_dates=events
+        )
+
+
+def _to_datetime64(event_dates: Sequence[datetime]) -> np.ndarray:
+    events = pd.to_datetime(pd.Series(event_dates, dtype=object)).to_numpy(
+        dtype="datetime64[ns]"
+    )
+    if np.isnat(events).any():
+        raise ValueError("Event dates must not be missing")
+
+    return events
+
+
+def get_consent_index(config_file: Path) -> ConsentIndex:
+    """
+    Returns the consent dates of all subjects, loading them on first use.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        ConsentIndex: The consent dates of all subjects.
     """
+    key = str(Path(config_file).resolve())
 
-    date = db.fetch_record(config_file=config_file, query=query)
+    with _CONSENT_INDEXES_LOCK:
+        consent_index = _CONSENT_INDEXES.get(key)
+        if consent_index is None:
+            consent_index = ConsentIndex.load(config_file=config_file)
+            _CONSENT_INDEXES[key] = consent_index
 
-    if date is None:
-        return None
+    return consent_index
+
+
+def invalidate_consent_index(config_file: Optional[Path] = None) -> None:
+    """
+    Discards the loaded consent dates, e.g. after the 'subjects' table is modified.
+
+    Args:
+        config_file (Optional[Path], optional): The path to the configuration file.
+            Defaults to None (all configuration files).
+    """
+    with _CONSENT_INDEXES_LOCK:
+        if config_file is None:
+            _CONSENT_INDEXES.clear()
+        else:
+            _CONSENT_INDEXES.pop(str(Path(config_file).resolve()), None)
+
+
+def get_consent_data(config_file: Path, subject_id: str) -> Optional[datetime]:
+    consent_index = get_consent_index(config_file=config_file)
 
-    date_dt = datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
-    return date_dt
+    return consent_index.get_consent_date(subject_id)
 
 
 def compute_days_since_consent(
@@ -0,0 +1,4 @@
+# package init file
+"""
+Filesystem access to the PHOENIX data root.
+"""
@@ -0,0 +1,443 @@
+"""
+Snapshots (manifests) of the PHOENIX tree, to process only what changed since
+the previous run.
+
+A manifest holds the path (relative to the data root), size, mtime, inode, kind
+and digest (if cached, see hash.get_cached_hashes) of every entry found by
+walker.walk. It is stored column-wise, as a directory of .npy files that are
+memory-mapped when loaded:
+
+    <name>.manifest/
+        meta.json       version, data root, creation time
+        paths.npy       UTF-8 paths, concatenated (uint8)
+        offsets.npy     end offset of each path in paths.npy (int64)
+        sizes.npy, mtimes_ns.npy, inodes.npy (int64), kinds.npy (uint8)
+        digests.npy     MD5 digests (fixed-width bytes, empty if unknown)
+
+Manifest.diff returns the entries added, removed and modified since a previous
+manifest, and the subjects and interviews they belong to.
+"""
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from interviewqc.fs import walker
+from interviewqc.helpers import cli, throttle
+from interviewqc.helpers import hash as hash_helpers
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest"
+
+KIND_CODES = {walker.KIND_FILE: 0, walker.KIND_DIR: 1}
+
+# Number of components of '<section>/<site>/<data_type>/<subject>'
+SUBJECT_DEPTH = 4
+# Number of components of '<subject path>/interviews/<type>/<interview>'
+INTERVIEW_DEPTH = SUBJECT_DEPTH + 3
+
+_COLUMNS = ("sizes", "mtimes_ns", "inodes", "kinds", "digests")
+
+
+def get_default_manifest_file(module_name: str) -> Path:
+    """
+    Returns the default manifest of a runner: data/manifests/<module_name>.manifest
+    in the repository.
+
+    Args:
+        module_name (str): The name of the runner module.
+
+    Returns:
+        Path: The path to the manifest.
+    """
+    return cli.get_repo_root() / "data" / "manifests" / f"{module_name}{MANIFEST_SUFFIX}"
+
+
+class Manifest:
+    """
+    A snapshot of entries of the PHOENIX tree, stored column-wise.
+
+    Attributes:
+        data_root (Path): The root of the PHOENIX tree.
+        paths (np.ndarray): The paths of the entries, relative to data_root (str).
+        sizes (np.ndarray): The sizes of the entries in bytes (int64).
+        mtimes_ns (np.ndarray): The modification times of the entries in ns (int64).
+        inodes (np.ndarray): The inode numbers of the entries (int64).
+        kinds (np.ndarray): The kinds of the entries, see KIND_CODES (uint8).
+        digests (np.ndarray): The MD5 digests of the files (bytes, b'' if unknown).
+    """
+
+    def __init__(
+        self,
+        data_root: Path,
+        paths: np.ndarray,
+        sizes: np.ndarray,
+        mtimes_ns: np.ndarray,
+        inodes: np.ndarray,
+        kinds: np.ndarray,
+        digests: np.ndarray,
+    ):
+        self.data_root = Path(data_root)
+        self.paths = paths
+        self.sizes = sizes
+        self.mtimes_ns = mtimes_ns
+        self.inodes = inodes
+        self.kinds = kinds
+        self.digests = digests
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def get_file_paths(self) -> List[Path]:
+        """
+        Returns the paths of the files (not directories) of the manifest.
+
+        Returns:
+            List[Path]: The paths of the files, under data_root.
+        """
+        is_file = np.asarray(self.kinds) == KIND_CODES[walker.KIND_FILE]
+        return [self.data_root / path for path in self.paths[is_file]]
+
+    @staticmethod
+    def scan(
+        data_root: Path,
+        data_type: str,
+        sections: Collection[str] = ("PROTECTED",),
+        network: Optional[str] = None,
+        subdirectories: Optional[Collection[str]] = None,
+        recursive: bool = False,
+    ) -> "Manifest":
+        """
+        Takes a snapshot of the entries found by walker.walk.
+
+        Args:
+            data_root (Path): The root of the PHOENIX tree.
+            data_type (str): 'raw' or 'processed'.
+            sections (Collection[str], optional): The sections to walk.
+                Defaults to ('PROTECTED',).
+            network (Optional[str], optional): Only walk sites of this network.
+                Defaults to None (all networks).
+            subdirectories (Optional[Collection[str]], optional): The names of the
+                subdirectories of the interview type directories to descend into.
+                Defaults to None.
+            recursive (bool, optional): Whether to descend into all subdirectories.
+                Defaults to False.
+
+        Returns:
+            Manifest: The snapshot.
+        """
+        root = os.path.join(data_root, "")
+        paths: List[str] = []
+        sizes: List[int] = []
+        mtimes_ns: List[int] = []
+        inodes: List[int] = []
+        kinds: List[int] = []
+        digests: List[bytes] = []
+
+        for section in sections:
+            for event in walker.walk(
+                data_root=data_root,
+                data_type=data_type,
+                network=network,
+                subdirectories=subdirectories,
+                recursive=recursive,
+                section=section,
+            ):
+                throttle.throttle()
+                try:
+                    entry_stat = event.entry.stat()
+                except FileNotFoundError:
+                    continue  # removed while walking
+
+                digest = b""
+                if event.kind == walker.KIND_FILE:
+                    digest = (
+                        hash_helpers.get_cached_hashes(entry_stat, ["md5"])
+                        .get("md5", "")
+                        .encode("ascii")
+                    )
+
+                paths.append(event.entry.path[len(root) :])
+                sizes.append(entry_stat.st_size)
+                mtimes_ns.append(entry_stat.st_mtime_ns)
+                inodes.append(entry_stat.st_ino)
+                kinds.append(KIND_CODES[event.kind])
+                digests.append(digest)
+
+        paths_array = np.empty(len(paths), dtype=object)
+        paths_array[:] = paths
+
+        return Manifest(
+            data_root=data_root,
+            paths=paths_array,
+            sizes=np.asarray(sizes, dtype=np.int64),
+            mtimes_ns=np.asarray(mtimes_ns, dtype=np.int64),
+            inodes=np.asarray(inodes, dtype=np.int64),
+            kinds=np.asarray(kinds, dtype=np.uint8),
+            digests=np.asarray(digests, dtype=np.bytes_) if digests else np.empty(
+                0, dtype="S1"
+            ),
+        )
+
+    def take(self, indices: np.ndarray) -> "Manifest":
+        """
+        Returns the entries at the given positions.
+
+        Args:
+            indices (np.ndarray): The positions of the entries.
+
+        Returns:
+            Manifest: The entries.
+        """
+        return Manifest(
+            data_root=self.data_root,
+            paths=self.paths[indices],
+            **{column: np.asarray(getattr(self, column))[indices] for column in _COLUMNS},
+        )
+
+    def save(self, manifest_file: Path) -> None:
+        """
+        Writes the manifest, replacing an existing one at once.
+
+        Args:
+            manifest_file (Path): The path to the manifest (a directory).
+        """
+        manifest_file = Path(manifest_file)
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+
+        encoded = [
+            path.encode("utf-8", errors="surrogateescape") for path in self.paths
+        ]
+        offsets = np.cumsum(
+            np.fromiter((len(path) for path in encoded), dtype=np.int64, count=len(encoded))
+        )
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        tmp_file = manifest_file.with_name(f".{manifest_file.name}.tmp")
+        shutil.rmtree(tmp_file, ignore_errors=True)
+        tmp_file.mkdir()
+
+        np.save(tmp_file / "paths.npy", blob)
+        np.save(tmp_file / "offsets.npy", offsets)
+        for column in _COLUMNS:
+            np.save(tmp_file / f"{column}.npy", np.asarray(getattr(self, column)))
+        with open(tmp_file / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "data_root": str(self.data_root),
+                    "created_at": datetime.now().isoformat(),
+                    "entries": len(self),
+                },
+                f,
+            )
+
+        old_file = manifest_file.with_name(f".{manifest_file.name}.old")
+        shutil.rmtree(old_file, ignore_errors=True)
+        if manifest_file.exists():
+            os.replace(manifest_file, old_file)
+        os.replace(tmp_file, manifest_file)
+        shutil.rmtree(old_file, ignore_errors=True)
+
+        logger.info(f"Wrote manifest of {len(self)} entries to {manifest_file}")
+
+    @staticmethod
+    def load(manifest_file: Path) -> Optional["Manifest"]:
+        """
+        Reads a manifest; its numeric columns are memory-mapped.
+
+        Args:
+            manifest_file (Path): The path to the manifest (a directory).
+
+        Returns:
+            Optional[Manifest]: The manifest, or None if it does not exist (or
+                was written by an incompatible version).
+        """
+        manifest_file = Path(manifest_file)
+        try:
+            with open(manifest_file / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if meta.get("version") != MANIFEST_VERSION:
+            logger.warning(
+                f"Ignoring manifest {manifest_file} of version {meta.get('version')}"
+            )
+            return None
+
+        blob = np.load(manifest_file / "paths.npy", mmap_mode="r").tobytes()
+        offsets = np.load(manifest_file / "offsets.npy")
+        starts = np.concatenate(([0], offsets[:-1])) if len(offsets) else offsets
+
+        paths = np.empty(len(offsets), dtype=object)
+        paths[:] = [
+            blob[start:end].decode("utf-8", errors="surrogateescape")
+            for start, end in zip(starts.tolist(), offsets.tolist())
+        ]
+
+        columns: Dict[str, np.ndarray] = {
+            column: np.load(manifest_file / f"{column}.npy", mmap_mode="r")
+            for column in _COLUMNS
+        }
+
+        return Manifest(data_root=Path(meta["data_root"]), paths=paths, **columns)
+
+    def diff(self, previous: "Manifest") -> "ManifestDiff":
+        """
+        Compares the manifest with a previous one.
+
+        An entry is modified if its size, mtime, inode or kind changed, or if
+        both manifests know its digest and it changed.
+
+        Args:
+            previous (Manifest): The previous manifest.
+
+        Returns:
+            ManifestDiff: The added, removed and modified entries.
+        """
+        previous_positions = pd.Index(previous.paths).get_indexer(self.paths)
+        matched = previous_positions >= 0
+        current_matched = np.flatnonzero(matched)
+        previous_matched = previous_positions[matched]
+
+        def changed(column: str) -> np.ndarray:
+            return (
+                np.asarray(getattr(self, column))[current_matched]
+                != np.asarray(getattr(previous, column))[previous_matched]
+            )
+
+        current_digests = np.asarray(self.digests)[current_matched]
+        previous_digests = np.asarray(previous.digests)[previous_matched]
+        digest_changed = (
+            (current_digests != b"")
+            & (previous_digests != b"")
+            & (current_digests != previous_digests)
+        )
+
+        modified = (
+            changed("sizes")
+            | changed("mtimes_ns")
+            | changed("inodes")
+            | changed("kinds")
+            | digest_changed
+        )
+
+        removed = np.ones(len(previous), dtype=bool)
+        removed[previous_matched] = False
+
+        return ManifestDiff(
+            added=self.take(np.flatnonzero(~matched)),
+            removed=previous.take(np.flatnonzero(removed)),
+            modified=self.take(current_matched[modified]),
+        )
+
+
+@dataclass
+class ManifestDiff:
+    """
+    The changes between two manifests.
+
+    Attributes:
+        added (Manifest): The entries that are new.
+        removed (Manifest): The entries that no longer exist (from the previous
+            manifest).
+        modified (Manifest): The entries that changed.
+    """
+
+    added: Manifest
+    removed: Manifest
+    modified: Manifest
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.modified)} modified entries "
+            f"({len(self.get_subjects())} subjects)"
+        )
+
+    def get_paths(self) -> List[str]:
+        """
+        Returns the relative paths of all the changed entries.
+        """
+        return (
+            self.added.paths.tolist()
+            + self.removed.paths.tolist()
+            + self.modified.paths.tolist()
+        )
+
+    def get_subjects(self) -> Set[str]:
+        """
+        Returns the IDs of the subjects with changed entries.
+        """
+        subjects: Set[str] = set()
+        for path in self.get_paths():
+            parts = path.split(os.sep)
+            if len(parts) > SUBJECT_DEPTH:
+                subjects.add(parts[SUBJECT_DEPTH - 1])
+
+        return subjects
+
+    def get_interview_paths(self, data_root: Path) -> Set[Path]:
+        """
+        Returns the paths of the interviews (the entries of the interview type
+        directories) with changed entries.
+
+        Args:
+            data_root (Path): The root of the PHOENIX tree.
+
+        Returns:
+            Set[Path]: The paths of the interviews.
+        """
+        interview_paths: Set[Path] = set()
+        for path in self.get_paths():
+            parts = path.split(os.sep)
+            if len(parts) >= INTERVIEW_DEPTH:
+                interview_paths.add(Path(data_root, *parts[:INTERVIEW_DEPTH]))
+
+        return interview_paths
+
+
+def get_changes(
+    manifest_file: Path, current: Manifest
+) -> Optional[ManifestDiff]:
+    """
+    Compares a snapshot of the tree with the manifest of the previous run.
+
+    Args:
+        manifest_file (Path): The path to the manifest of the previous run.
+        current (Manifest): The snapshot of the tree.
+
+    Returns:
+        Optional[ManifestDiff]: The changes, or None if there is no previous
+            manifest (or it is of another data root): everything must be processed.
+    """
+    previous = Manifest.load(manifest_file)
+    if previous is None:
+        logger.warning(f"No manifest at {manifest_file}: processing everything")
+        return None
+
+    if previous.data_root != current.data_root:
+        logger.warning(
+            f"Manifest {manifest_file} is of another data root "
+            f"({previous.data_root}): processing everything"
+        )
+        return None
+
+    changes = current.diff(previous)
+    logger.info(f"Changes since {manifest_file}: {changes}")
+
+    return changes
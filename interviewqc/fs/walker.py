@@ -0,0 +1,337 @@
+"""
+Walks the PHOENIX tree of interviews:
+
+    <data_root>/<section>/<site>/<data_type>/<subject>/interviews/<type>/...
+
+where section is PROTECTED (or GENERAL) and data_type is raw or processed,
+with os.scandir, listing each directory at most once. The type of each entry
+(file or directory) comes from the listing, so no stat is needed to tell them
+apart; known paths (e.g. '<subject>/interviews/open') are listed directly,
+without listing (or stat'ing) their parents first.
+
+Symlinks to directories are never descended into (like os.walk), so that the
+walk stays within the tree and cannot loop. Directories that cannot be listed
+(missing, or not readable) are skipped.
+
+Every listing goes through the I/O throttle (see helpers/throttle.py).
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Collection, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from interviewqc.helpers import throttle
+
+logger = logging.getLogger(__name__)
+
+INTERVIEW_TYPES = ("open", "psychs")
+
+# Directories of PROTECTED that are not sites
+EXCLUDED_SITES = ("box_transfer",)
+
+KIND_FILE = "file"
+KIND_DIR = "dir"
+
+PathType = Union[str, os.PathLike]
+
+
+class WalkEvent(NamedTuple):
+    """
+    An entry found under an interview type directory.
+
+    Attributes:
+        site (str): The name of the site directory, e.g. 'PronetYA'.
+        subject (str): The subject ID.
+        interview_type (str): The interview type, e.g. 'open'.
+        kind (str): KIND_FILE or KIND_DIR.
+        entry (os.DirEntry): The directory entry.
+        relative_dir (str): The directory of the entry, relative to the interview
+            type directory ('' for its direct children).
+    """
+
+    site: str
+    subject: str
+    interview_type: str
+    kind: str
+    entry: os.DirEntry
+    relative_dir: str = ""
+
+    @property
+    def path(self) -> Path:
+        """
+        Returns the path to the entry.
+        """
+        return Path(self.entry.path)
+
+
+def scandir(directory: PathType) -> Optional[List[os.DirEntry]]:
+    """
+    Lists a directory once, sorted by name.
+
+    Args:
+        directory (PathType): The path to the directory.
+
+    Returns:
+        Optional[List[os.DirEntry]]: The entries, or None if the directory does
+            not exist (or is not a directory, or is not readable).
+    """
+    throttle.throttle()
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except PermissionError as e:
+        logger.warning(f"Could not list {directory}: {e}")
+        return None
+
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+
+def get_kind(entry: os.DirEntry) -> str:
+    """
+    Returns the kind of an entry (without following symlinks).
+
+    Args:
+        entry (os.DirEntry): The directory entry.
+
+    Returns:
+        str: KIND_DIR, or KIND_FILE (including symlinks to directories).
+    """
+    return KIND_DIR if entry.is_dir(follow_symlinks=False) else KIND_FILE
+
+
+def iter_sites(
+    data_root: Path,
+    sites: Optional[Collection[str]] = None,
+    network: Optional[str] = None,
+    section: str = "PROTECTED",
+) -> Iterator[os.DirEntry]:
+    """
+    Yields the site directories of <data_root>/<section>.
+
+    Args:
+        data_root (Path): The root of the PHOENIX tree.
+        sites (Optional[Collection[str]], optional): The site directory names to
+            yield (e.g. 'PronetYA'). Defaults to None (all sites).
+        network (Optional[str], optional): Only yield sites of this network
+            (e.g. 'Pronet'). Defaults to None (all networks).
+        section (str, optional): 'PROTECTED' or 'GENERAL'. Defaults to 'PROTECTED'.
+
+    Yields:
+        os.DirEntry: The site directories.
+    """
+    for entry in scandir(Path(data_root) / section) or []:
+        if entry.name in EXCLUDED_SITES:
+            continue
+        if sites is not None and entry.name not in sites:
+            continue
+        if network is not None and not entry.name.startswith(network):
+            continue
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        yield entry
+
+
+def iter_subjects(
+    site_dir: PathType,
+    data_type: str,
+    subjects: Optional[Collection[str]] = None,
+) -> Iterator[os.DirEntry]:
+    """
+    Yields the subject directories of a site.
+
+    Args:
+        site_dir (PathType): The site directory (a path or an os.DirEntry).
+        data_type (str): 'raw' or 'processed'.
+        subjects (Optional[Collection[str]], optional): The subject IDs to yield.
+            Defaults to None (all subjects).
+
+    Yields:
+        os.DirEntry: The subject directories.
+    """
+    entries = scandir(os.path.join(site_dir, data_type))
+    if entries is None:
+        logger.warning(f"Site {os.path.basename(site_dir)} has no {data_type} data")
+        return
+
+    for entry in entries:
+        if subjects is not None and entry.name not in subjects:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield entry
+
+
+def iter_interview_types(
+    subject_dir: PathType,
+    interview_types: Collection[str] = INTERVIEW_TYPES,
+) -> Iterator[Tuple[str, str, List[os.DirEntry]]]:
+    """
+    Lists the interview type directories of a subject that exist.
+
+    Args:
+        subject_dir (PathType): The subject directory (a path or an os.DirEntry).
+        interview_types (Collection[str], optional): The interview types.
+            Defaults to INTERVIEW_TYPES.
+
+    Yields:
+        Tuple[str, str, List[os.DirEntry]]: The interview type, the path to its
+            directory, and its entries.
+    """
+    for interview_type in interview_types:
+        interview_type_dir = os.path.join(subject_dir, "interviews", interview_type)
+        entries = scandir(interview_type_dir)
+        if entries is not None:
+            yield interview_type, interview_type_dir, entries
+
+
+def iter_entries(
+    entries: List[os.DirEntry],
+    subdirectories: Optional[Collection[str]] = None,
+    recursive: bool = False,
+    relative_dir: str = "",
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Yields entries, and the entries of the subdirectories to descend into.
+
+    Args:
+        entries (List[os.DirEntry]): The entries of a directory (see scandir).
+        subdirectories (Optional[Collection[str]], optional): The names of the
+            subdirectories of the first level to descend into. Defaults to None.
+        recursive (bool, optional): Whether to descend into all subdirectories,
+            at all levels. Defaults to False.
+        relative_dir (str, optional): The relative path of the directory.
+
+    Yields:
+        Tuple[str, os.DirEntry]: The relative directory of the entry, and the entry.
+    """
+    for entry in entries:
+        yield relative_dir, entry
+
+        descend = recursive or (
+            subdirectories is not None
+            and not relative_dir
+            and entry.name in subdirectories
+        )
+        if not descend or not entry.is_dir(follow_symlinks=False):
+            continue
+
+        sub_entries = scandir(entry.path)
+        if sub_entries is None:
+            continue
+        yield from iter_entries(
+            sub_entries,
+            recursive=recursive,
+            relative_dir=os.path.join(relative_dir, entry.name),
+        )
+
+
+def scan_files(directory: PathType, recursive: bool = True) -> Iterator[os.DirEntry]:
+    """
+    Yields the files of a directory (like os.walk, listing each directory once).
+    Symlinks to files are yielded; symlinks to directories are neither descended
+    into nor yielded.
+
+    Args:
+        directory (PathType): The path to the directory.
+        recursive (bool, optional): Whether to yield the files of subdirectories.
+            Defaults to True.
+
+    Yields:
+        os.DirEntry: The files.
+    """
+    for _, entry in iter_entries(scandir(directory) or [], recursive=recursive):
+        if entry.is_file():
+            yield entry
+
+
+def walk_subject(
+    site: str,
+    subject_dir: os.DirEntry,
+    interview_types: Collection[str] = INTERVIEW_TYPES,
+    subdirectories: Optional[Collection[str]] = None,
+    recursive: bool = False,
+) -> Iterator[WalkEvent]:
+    """
+    Yields the entries of the interview type directories of a subject.
+
+    Args:
+        site (str): The name of the site directory.
+        subject_dir (os.DirEntry): The subject directory.
+        interview_types (Collection[str], optional): The interview types.
+            Defaults to INTERVIEW_TYPES.
+        subdirectories (Optional[Collection[str]], optional): The names of the
+            subdirectories of the interview type directories to descend into
+            (e.g. 'transcripts'). Defaults to None.
+        recursive (bool, optional): Whether to descend into all subdirectories.
+            Defaults to False.
+
+    Yields:
+        WalkEvent: The entries.
+    """
+    for interview_type, _, entries in iter_interview_types(
+        subject_dir, interview_types=interview_types
+    ):
+        for relative_dir, entry in iter_entries(
+            entries, subdirectories=subdirectories, recursive=recursive
+        ):
+            yield WalkEvent(
+                site=site,
+                subject=subject_dir.name,
+                interview_type=interview_type,
+                kind=get_kind(entry),
+                entry=entry,
+                relative_dir=relative_dir,
+            )
+
+
+def walk(
+    data_root: Path,
+    data_type: str,
+    sites: Optional[Collection[str]] = None,
+    subjects: Optional[Collection[str]] = None,
+    network: Optional[str] = None,
+    interview_types: Collection[str] = INTERVIEW_TYPES,
+    subdirectories: Optional[Collection[str]] = None,
+    recursive: bool = False,
+    section: str = "PROTECTED",
+) -> Iterator[WalkEvent]:
+    """
+    Yields the entries of the interview type directories of all subjects:
+
+        <data_root>/<section>/<site>/<data_type>/<subject>/interviews/<type>/<entry>
+
+    Args:
+        data_root (Path): The root of the PHOENIX tree.
+        data_type (str): 'raw' or 'processed'.
+        sites (Optional[Collection[str]], optional): The site directory names.
+            Defaults to None (all sites).
+        subjects (Optional[Collection[str]], optional): The subject IDs.
+            Defaults to None (all subjects).
+        network (Optional[str], optional): Only walk sites of this network.
+            Defaults to None (all networks).
+        interview_types (Collection[str], optional): The interview types.
+            Defaults to INTERVIEW_TYPES.
+        subdirectories (Optional[Collection[str]], optional): The names of the
+            subdirectories of the interview type directories to descend into
+            (e.g. 'transcripts'). Defaults to None.
+        recursive (bool, optional): Whether to descend into all subdirectories.
+            Defaults to False.
+        section (str, optional): 'PROTECTED' or 'GENERAL'. Defaults to 'PROTECTED'.
+
+    Yields:
+        WalkEvent: The entries, site by site and subject by subject.
+    """
+    for site_dir in iter_sites(
+        data_root, sites=sites, network=network, section=section
+    ):
+        for subject_dir in iter_subjects(site_dir, data_type, subjects=subjects):
+            yield from walk_subject(
+                site=site_dir.name,
+                subject_dir=subject_dir,
+                interview_types=interview_types,
+                subdirectories=subdirectories,
+                recursive=recursive,
+            )
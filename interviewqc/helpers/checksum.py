@@ -0,0 +1,336 @@
+"""
+Reads and writes the .checksum sidecar files stored next to interview files.
+
+Sidecars are in the md5sum / sha256sum format ('<digest>  <name>' lines), or
+in the BSD format ('MD5 (<name>) = <digest>'). A '.checksum.<algorithm>'
+sidecar holds digests of that algorithm; the algorithm of the digests in
+other '.checksum*' sidecars is inferred from their length (e.g. 32 hex
+digits: MD5).
+
+Sidecars written by `write_sidecar_hashes` record the size and mtime of each
+file, in a comment line before its digest. A digest is only trusted if its
+size was recorded and matches the file (as does its mtime), and if the file
+was not modified after the sidecar was written.
+
+The sidecars of a directory are read once per run, and kept in memory (see
+SIDECAR_CACHE_SIZE); those written by this process are updated in place.
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from interviewqc.helpers import throttle
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_FILE_PREFIX = ".checksum"
+
+# Algorithms of digests, by number of hex digits
+ALGORITHMS_BY_LENGTH = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+
+# Number of parsed directories kept in memory
+SIDECAR_CACHE_SIZE = 256
+
+_GNU_LINE = re.compile(r"^\\?(?P<digest>[0-9a-fA-F]+) [ *](?P<name>.+)$")
+_BSD_LINE = re.compile(
+    r"^(?P<algorithm>[\w-]+) ?\((?P<name>.+)\) ?= ?(?P<digest>[0-9a-fA-F]+)$"
+)
+_STAT_COMMENT = re.compile(
+    r"^#\s*size=(?P<size>\d+)\s+mtime_ns=(?P<mtime_ns>\d+)\s*$"
+)
+
+# Parsed sidecars, by directory
+_SIDECARS: "OrderedDict[str, DirectorySidecars]" = OrderedDict()
+_SIDECARS_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SidecarEntry:
+    """
+    A digest read from a sidecar.
+
+    Attributes:
+        digest (str): The digest (lowercase hex).
+        sidecar_mtime_ns (int): The modification time of the sidecar.
+        size (Optional[int]): The size of the file, if recorded.
+        mtime_ns (Optional[int]): The modification time of the file, if recorded.
+    """
+
+    digest: str
+    sidecar_mtime_ns: int
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+
+    def matches(self, file_stat: os.stat_result) -> bool:
+        """
+        Returns whether the digest can be trusted for a file.
+
+        Args:
+            file_stat (os.stat_result): The stat of the file.
+
+        Returns:
+            bool: True if the file was not modified since the digest was written.
+        """
+        if self.size is None or self.size != file_stat.st_size:
+            return False
+        if self.mtime_ns is not None and self.mtime_ns != file_stat.st_mtime_ns:
+            return False
+
+        return file_stat.st_mtime_ns <= self.sidecar_mtime_ns
+
+
+@dataclass
+class DirectorySidecars:
+    """
+    The sidecars of a directory.
+
+    Attributes:
+        sidecars (Dict[str, Dict[Tuple[str, str], SidecarEntry]]): The digests of
+            each sidecar, by sidecar name, and by (file name, algorithm).
+        entries (Dict[Tuple[str, str], SidecarEntry]): The digests of all the
+            sidecars, by (file name, algorithm); those of the most recent sidecar
+            win.
+    """
+
+    sidecars: Dict[str, Dict[Tuple[str, str], SidecarEntry]] = field(
+        default_factory=dict
+    )
+    entries: Dict[Tuple[str, str], SidecarEntry] = field(default_factory=dict)
+
+
+def get_sidecar_algorithm(sidecar_name: str) -> Optional[str]:
+    """
+    Returns the algorithm of a '.checksum.<algorithm>' sidecar.
+
+    Args:
+        sidecar_name (str): The name of the sidecar.
+
+    Returns:
+        Optional[str]: The algorithm, or None if it is inferred from the digests.
+    """
+    suffix = sidecar_name[len(CHECKSUM_FILE_PREFIX) :]
+    if suffix.startswith(".") and len(suffix) > 1:
+        return suffix[1:].lower()
+    return None
+
+
+def parse_sidecar(
+    lines: Sequence[str], algorithm: Optional[str], sidecar_mtime_ns: int
+) -> Dict[Tuple[str, str], SidecarEntry]:
+    """
+    Parses the lines of a sidecar. Later entries of a file replace earlier ones.
+
+    Args:
+        lines (Sequence[str]): The lines of the sidecar.
+        algorithm (Optional[str]): The algorithm of the digests, or None to infer it.
+        sidecar_mtime_ns (int): The modification time of the sidecar.
+
+    Returns:
+        Dict[Tuple[str, str], SidecarEntry]: The digests, by (file name, algorithm).
+    """
+    entries: Dict[Tuple[str, str], SidecarEntry] = {}
+    recorded_stat: Optional[Tuple[int, int]] = None
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+
+        stat_match = _STAT_COMMENT.match(line)
+        if stat_match is not None:
+            recorded_stat = (int(stat_match["size"]), int(stat_match["mtime_ns"]))
+            continue
+
+        line_algorithm = algorithm
+        match = _GNU_LINE.match(line)
+        if match is None:
+            match = _BSD_LINE.match(line)
+            if match is not None:
+                line_algorithm = match["algorithm"].lower().replace("-", "")
+
+        if match is None:
+            recorded_stat = None
+            continue
+
+        digest = match["digest"].lower()
+        if line_algorithm is None:
+            line_algorithm = ALGORITHMS_BY_LENGTH.get(len(digest))
+        if line_algorithm is not None:
+            size, mtime_ns = recorded_stat if recorded_stat else (None, None)
+            entries[(match["name"], line_algorithm)] = SidecarEntry(
+                digest=digest,
+                sidecar_mtime_ns=sidecar_mtime_ns,
+                size=size,
+                mtime_ns=mtime_ns,
+            )
+        recorded_stat = None
+
+    return entries
+
+
+def _read_directory_sidecars(directory: Path) -> DirectorySidecars:
+    sidecar_stats: List[Tuple[os.DirEntry, os.stat_result]] = []
+    try:
+        throttle.throttle()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(CHECKSUM_FILE_PREFIX) and entry.is_file():
+                    throttle.throttle()
+                    sidecar_stats.append((entry, entry.stat()))
+    except OSError:
+        return DirectorySidecars()
+
+    directory_sidecars = DirectorySidecars()
+    for sidecar, sidecar_stat in sorted(
+        sidecar_stats, key=lambda sidecar_stat: sidecar_stat[1].st_mtime_ns
+    ):
+        try:
+            with open(sidecar.path, "r", encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+        except OSError as e:
+            logger.warning(f"Could not read {sidecar.path}: {e}")
+            continue
+        throttle.throttle(nbytes=sidecar_stat.st_size)
+
+        entries = parse_sidecar(
+            lines,
+            algorithm=get_sidecar_algorithm(sidecar.name),
+            sidecar_mtime_ns=sidecar_stat.st_mtime_ns,
+        )
+        directory_sidecars.sidecars[sidecar.name] = entries
+        directory_sidecars.entries.update(entries)
+
+    return directory_sidecars
+
+
+def _get_directory_sidecars(directory: Path) -> DirectorySidecars:
+    key = str(directory)
+    with _SIDECARS_LOCK:
+        directory_sidecars = _SIDECARS.get(key)
+        if directory_sidecars is not None:
+            _SIDECARS.move_to_end(key)
+            return directory_sidecars
+
+    directory_sidecars = _read_directory_sidecars(directory)
+
+    with _SIDECARS_LOCK:
+        # another thread may have read (and updated) them meanwhile
+        directory_sidecars = _SIDECARS.setdefault(key, directory_sidecars)
+        _SIDECARS.move_to_end(key)
+        while len(_SIDECARS) > SIDECAR_CACHE_SIZE:
+            _SIDECARS.popitem(last=False)
+
+    return directory_sidecars
+
+
+def format_sidecar(entries: Dict[Tuple[str, str], SidecarEntry]) -> str:
+    """
+    Formats the entries of a sidecar, in the md5sum format, with the size and
+    mtime of each file (if recorded) in a comment line before its digest.
+
+    Args:
+        entries (Dict[Tuple[str, str], SidecarEntry]): The digests, by
+            (file name, algorithm).
+
+    Returns:
+        str: The content of the sidecar.
+    """
+    lines: List[str] = []
+    for (name, _), entry in sorted(entries.items()):
+        if entry.size is not None and entry.mtime_ns is not None:
+            lines.append(f"# size={entry.size} mtime_ns={entry.mtime_ns}\n")
+        lines.append(f"{entry.digest}  {name}\n")
+
+    return "".join(lines)
+
+
+def get_sidecar_hashes(
+    file_path: Path, file_stat: os.stat_result, hash_types: Sequence[str]
+) -> Dict[str, str]:
+    """
+    Returns the trusted digests of a file, from the sidecars in its directory.
+
+    Args:
+        file_path (Path): The path to the file.
+        file_stat (os.stat_result): The stat of the file.
+        hash_types (Sequence[str]): The hash algorithms.
+
+    Returns:
+        Dict[str, str]: The digests, by algorithm.
+    """
+    file_path = Path(file_path)
+    if file_path.name.startswith(CHECKSUM_FILE_PREFIX):
+        return {}
+
+    entries = _get_directory_sidecars(file_path.parent).entries
+    if not entries:
+        return {}
+
+    hashes: Dict[str, str] = {}
+    for hash_type in hash_types:
+        entry = entries.get((file_path.name, hash_type))
+        if entry is not None and entry.matches(file_stat):
+            hashes[hash_type] = entry.digest
+
+    return hashes
+
+
+def write_sidecar_hashes(
+    file_path: Path, file_stat: os.stat_result, hashes: Dict[str, str]
+) -> None:
+    """
+    Records the digests of a file in the '.checksum.<algorithm>' sidecars of its
+    directory, with its size and mtime.
+
+    Each sidecar is rewritten with a single entry per file (replacing a temporary
+    file), from the sidecars kept in memory, so that it is never parsed again.
+    Directories that are not writable are skipped.
+
+    Args:
+        file_path (Path): The path to the file.
+        file_stat (os.stat_result): The stat of the file, before it was hashed.
+        hashes (Dict[str, str]): The digests, by algorithm.
+    """
+    file_path = Path(file_path)
+    if file_path.name.startswith(CHECKSUM_FILE_PREFIX) or "\n" in file_path.name:
+        return
+
+    directory_sidecars = _get_directory_sidecars(file_path.parent)
+
+    with _SIDECARS_LOCK:
+        for hash_type, hash_str in hashes.items():
+            sidecar = file_path.parent / f"{CHECKSUM_FILE_PREFIX}.{hash_type}"
+            entries = dict(directory_sidecars.sidecars.get(sidecar.name, {}))
+            entries[(file_path.name, hash_type)] = SidecarEntry(
+                digest=hash_str,
+                sidecar_mtime_ns=0,
+                size=file_stat.st_size,
+                mtime_ns=file_stat.st_mtime_ns,
+            )
+
+            tmp_sidecar = sidecar.with_name(f".{os.getpid()}{sidecar.name}.tmp")
+            content = format_sidecar(entries).encode("utf-8")
+            try:
+                throttle.throttle(nbytes=len(content))
+                with open(tmp_sidecar, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_sidecar, sidecar)
+                sidecar_mtime_ns = os.stat(sidecar).st_mtime_ns
+            except OSError as e:
+                logger.debug(f"Could not write {sidecar}: {e}")
+                try:
+                    os.unlink(tmp_sidecar)
+                except OSError:
+                    pass
+                return
+
+            entries = {
+                key: replace(entry, sidecar_mtime_ns=sidecar_mtime_ns)
+                for key, entry in entries.items()
+            }
+            directory_sidecars.sidecars[sidecar.name] = entries
+            directory_sidecars.entries.update(entries)
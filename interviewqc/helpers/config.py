@@ -1,10 +1,469 @@
 """
 Configuration file parser.
+
+The configuration file is parsed once per process into a typed Settings object,
+which is re-read only if the file is modified. Any value can be overridden with
+an environment variable named INTERVIEWQC_<SECTION>_<KEY>, e.g.
+INTERVIEWQC_POSTGRESQL_HOST or INTERVIEWQC_GENERAL_DATA_ROOT.
 """
 
+import os
+import re
+import threading
 from configparser import ConfigParser
+from dataclasses import dataclass, fields
+from datetime import time
+from functools import cached_property
 from pathlib import Path
-from typing import Dict
+from typing import ClassVar, Dict, Optional, Set, Tuple
+
+ENV_PREFIX = "INTERVIEWQC"
+
+TRUE_VALUES = ("true", "yes", "on", "1")
+
+_SETTINGS: Dict[str, Tuple[int, "Settings"]] = {}
+_SETTINGS_LOCK = threading.Lock()
+
+
+def to_bool(value: str) -> bool:
+    """
+    Converts a configuration value to a boolean.
+
+    Args:
+        value (str): The value, e.g. 'true', 'yes', 'on' or '1'.
+
+    Returns:
+        bool: True if the value is truthy, False otherwise.
+    """
+    return value.strip().lower() in TRUE_VALUES
+
+
+def get_env_var_name(section: str, key: str) -> str:
+    """
+    Returns the name of the environment variable that overrides a configuration value.
+
+    Args:
+        section (str): The section of the configuration file.
+        key (str): The key within the section.
+
+    Returns:
+        str: The environment variable name, e.g. INTERVIEWQC_POSTGRESQL_HOST.
+    """
+    name = f"{ENV_PREFIX}_{section}_{key}"
+    return re.sub(r"[^A-Za-z0-9]", "_", name).upper()
+
+
+def get_section_keys(section_type: type) -> Set[str]:
+    """
+    Returns the keys of a section read by its typed settings: their fields,
+    except the DERIVED_FIELDS computed from other keys (e.g. log_files).
+
+    Args:
+        section_type (type): The settings dataclass of the section.
+
+    Returns:
+        Set[str]: The keys of the section.
+    """
+    derived_fields = getattr(section_type, "DERIVED_FIELDS", ())
+    return {
+        field.name for field in fields(section_type) if field.name not in derived_fields
+    }
+
+
+@dataclass(frozen=True)
+class GeneralSettings:
+    """
+    The [general] section.
+    """
+
+    data_root: Path
+    network: Optional[str] = None  # e.g. Pronet or Prescient
+    sites_json: Optional[Path] = None
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "GeneralSettings":
+        sites_json = params.get("sites_json")
+        return GeneralSettings(
+            data_root=Path(params["data_root"]),
+            network=params.get("network"),
+            sites_json=Path(sites_json) if sites_json else None,
+        )
+
+    def require_network(self) -> str:
+        """
+        Returns the network, for the runners that only work on one network
+        (e.g. the site directories PROTECTED/<network><site>).
+
+        Raises:
+            ValueError: If the [general] section does not set a network.
+        """
+        if self.network is None:
+            raise ValueError(
+                "The [general] section must set network (e.g. Pronet or Prescient)"
+            )
+        return self.network
+
+
+@dataclass(frozen=True)
+class PostgresSettings:
+    """
+    The [postgresql] section: connection parameters and connection pool settings.
+    """
+
+    host: str
+    port: int
+    database: str
+    user: str
+    password: str
+    pool_min_size: int = 1
+    pool_max_size: int = 4
+    pool_idle_timeout: float = 300  # seconds
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "PostgresSettings":
+        defaults = PostgresSettings("", 0, "", "", "")
+        return PostgresSettings(
+            host=params["host"],
+            port=int(params["port"]),
+            database=params["database"],
+            user=params["user"],
+            password=params["password"],
+            pool_min_size=int(params.get("pool_min_size", defaults.pool_min_size)),
+            pool_max_size=int(params.get("pool_max_size", defaults.pool_max_size)),
+            pool_idle_timeout=float(
+                params.get("pool_idle_timeout", defaults.pool_idle_timeout)
+            ),
+        )
+
+    def connection_params(self) -> Dict[str, str]:
+        """
+        Returns the keyword arguments for psycopg2.connect.
+        """
+        return {
+            "host": self.host,
+            "port": str(self.port),
+            "database": self.database,
+            "user": self.user,
+            "password": self.password,
+        }
+
+
+@dataclass(frozen=True)
+class MoveSettings:
+    """
+    The [move] section.
+    """
+
+    backup_root: Path
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "MoveSettings":
+        return MoveSettings(backup_root=Path(params["backup_root"]))
+
+
+@dataclass(frozen=True)
+class SheetsSettings:
+    """
+    The [sheets] section.
+    """
+
+    service_account_file: Path
+    sheet_id: str
+    datailed_worksheet_name: str
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "SheetsSettings":
+        return SheetsSettings(
+            service_account_file=Path(params["service_account_file"]),
+            sheet_id=params["sheet_id"],
+            datailed_worksheet_name=params["datailed_worksheet_name"],
+        )
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    """
+    The [logging] section: log files per module, and SQL statement timing.
+    """
+
+    log_files: Dict[str, Path]
+    query_timing: bool = False
+    slow_query_ms: float = 1000.0
+
+    # fields that are not keys of the section
+    DERIVED_FIELDS: ClassVar[Tuple[str, ...]] = ("log_files",)
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "LoggingSettings":
+        defaults = LoggingSettings(log_files={})
+        # the model's own fields are not module names
+        options = {field.name for field in fields(LoggingSettings)}
+        log_files = {
+            module_name: Path(log_file)
+            for module_name, log_file in params.items()
+            if module_name not in options
+        }
+
+        return LoggingSettings(
+            log_files=log_files,
+            query_timing=to_bool(params.get("query_timing", "false")),
+            slow_query_ms=float(params.get("slow_query_ms", defaults.slow_query_ms)),
+        )
+
+    def get_log_file(self, module_name: str) -> Path:
+        """
+        Returns the log file of a module.
+
+        Args:
+            module_name (str): The name of the module.
+
+        Returns:
+            Path: The path to the log file.
+
+        Raises:
+            KeyError: If no log file is configured for the module.
+        """
+        return self.log_files[module_name]
+
+
+def get_default_digest_cache_file() -> Path:
+    """
+    Returns the default path of the digest cache: interviewqc/digests.sqlite3
+    in $XDG_CACHE_HOME (or ~/.cache).
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "interviewqc" / "digests.sqlite3"
+
+
+@dataclass(frozen=True)
+class HashSettings:
+    """
+    The (optional) [hash] section: digest algorithm, hashing threads and reads,
+    the local cache of file digests and .checksum sidecar files.
+    """
+
+    cache_file: Path
+    cache: bool = True
+    verify: bool = False  # re-read cached files, and report mismatches
+    digest_algorithm: str = "md5"  # stored next to the MD5 hash of files
+    workers: int = 4  # hashing threads
+    read_sidecars: bool = False  # trust digests of .checksum files
+    write_sidecars: bool = False  # append computed digests to .checksum.<algorithm>
+    buffer_size: int = 1024 * 1024  # bytes per read, for each hashing thread
+    drop_cache: bool = True  # evict hashed files from the page cache (fadvise)
+    order_by_inode: bool = False  # hash batches of files in inode order
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "HashSettings":
+        defaults = HashSettings(cache_file=Path())
+        cache_file = params.get("cache_file")
+        return HashSettings(
+            cache_file=Path(cache_file)
+            if cache_file
+            else get_default_digest_cache_file(),
+            cache=to_bool(params.get("cache", "true")),
+            verify=to_bool(params.get("verify", "false")),
+            digest_algorithm=params.get(
+                "digest_algorithm", defaults.digest_algorithm
+            ).strip(),
+            workers=int(params.get("workers", defaults.workers)),
+            read_sidecars=to_bool(params.get("read_sidecars", "false")),
+            write_sidecars=to_bool(params.get("write_sidecars", "false")),
+            buffer_size=int(params.get("buffer_size", defaults.buffer_size)),
+            drop_cache=to_bool(params.get("drop_cache", "true")),
+            order_by_inode=to_bool(params.get("order_by_inode", "false")),
+        )
+
+
+def parse_hours(value: str) -> Tuple[Tuple[time, time], ...]:
+    """
+    Parses a comma-separated list of daily time windows.
+
+    Args:
+        value (str): The windows, e.g. '08:00-12:00, 13:00-20:00'. A window may
+            span midnight, e.g. '22:00-06:00'.
+
+    Returns:
+        Tuple[Tuple[time, time], ...]: The (start, end) of each window.
+
+    Raises:
+        ValueError: If a window is not in the HH:MM-HH:MM format.
+    """
+    windows = []
+    for window in value.split(","):
+        window = window.strip()
+        if not window:
+            continue
+        try:
+            start, end = window.split("-")
+            windows.append(
+                (time.fromisoformat(start.strip()), time.fromisoformat(end.strip()))
+            )
+        except ValueError as e:
+            raise ValueError(
+                f"Invalid time window (expected HH:MM-HH:MM): {window}"
+            ) from e
+
+    return tuple(windows)
+
+
+@dataclass(frozen=True)
+class IOSettings:
+    """
+    The (optional) [io] section: limits of the filesystem I/O of the runners
+    (see helpers/throttle.py). Limits of 0 disable throttling.
+    """
+
+    max_mib_per_s: float = 0  # MiB read and written per second
+    max_ops_per_s: float = 0  # reads, writes, stats and directory listings per second
+    burst_s: float = 1.0  # seconds of I/O at the limits allowed in a burst
+    throttle_hours: Tuple[Tuple[time, time], ...] = ()  # empty: always throttled
+
+    @staticmethod
+    def from_section(params: Dict[str, str]) -> "IOSettings":
+        defaults = IOSettings()
+        return IOSettings(
+            max_mib_per_s=float(params.get("max_mib_per_s", defaults.max_mib_per_s)),
+            max_ops_per_s=float(params.get("max_ops_per_s", defaults.max_ops_per_s)),
+            burst_s=float(params.get("burst_s", defaults.burst_s)),
+            throttle_hours=parse_hours(params.get("throttle_hours", "")),
+        )
+
+
+# Typed sections, and the keys they read (used for environment variable overrides)
+SECTION_TYPES = {
+    "general": GeneralSettings,
+    "postgresql": PostgresSettings,
+    "move": MoveSettings,
+    "sheets": SheetsSettings,
+    "logging": LoggingSettings,
+    "hash": HashSettings,
+    "io": IOSettings,
+}
+
+
+class Settings:
+    """
+    Typed view of the configuration file.
+
+    Each section is parsed on first access, and raises a ValueError if the
+    section is not in the configuration file.
+
+    Attributes:
+        path (Path): The path to the configuration file.
+        sections (Dict[str, Dict[str, str]]): The raw values of all sections,
+            with environment variable overrides applied.
+    """
+
+    def __init__(self, path: Path, sections: Dict[str, Dict[str, str]]):
+        self.path = path
+        self.sections = sections
+
+    def section(self, section: str) -> Dict[str, str]:
+        """
+        Returns the raw values of a section.
+
+        Args:
+            section (str): The name of the section.
+
+        Returns:
+            Dict[str, str]: A copy of the section's values.
+
+        Raises:
+            ValueError: If the section is not in the configuration file.
+        """
+        if section not in self.sections:
+            raise ValueError(f"Section {section} not found in the {self.path} file")
+
+        return dict(self.sections[section])
+
+    @cached_property
+    def general(self) -> GeneralSettings:
+        return GeneralSettings.from_section(self.section("general"))
+
+    @cached_property
+    def postgresql(self) -> PostgresSettings:
+        return PostgresSettings.from_section(self.section("postgresql"))
+
+    @cached_property
+    def move(self) -> MoveSettings:
+        return MoveSettings.from_section(self.section("move"))
+
+    @cached_property
+    def sheets(self) -> SheetsSettings:
+        return SheetsSettings.from_section(self.section("sheets"))
+
+    @cached_property
+    def logging(self) -> LoggingSettings:
+        return LoggingSettings.from_section(self.section("logging"))
+
+    @cached_property
+    def hash(self) -> HashSettings:
+        # optional section
+        return HashSettings.from_section(self.sections.get("hash", {}))
+
+    @cached_property
+    def io(self) -> IOSettings:
+        # optional section
+        return IOSettings.from_section(self.sections.get("io", {}))
+
+
+def read_settings(path: Path) -> Settings:
+    """
+    Parses the configuration file, and applies environment variable overrides.
+
+    Args:
+        path (Path): The path to the configuration file.
+
+    Returns:
+        Settings: The parsed settings.
+    """
+    parser = ConfigParser()
+    parser.read(path)
+
+    sections: Dict[str, Dict[str, str]] = {}
+    for section in parser.sections():
+        sections[section] = dict(parser.items(section))
+
+    for section, section_type in SECTION_TYPES.items():
+        keys = get_section_keys(section_type)
+        keys.update(sections.get(section, {}).keys())
+
+        for key in keys:
+            value = os.environ.get(get_env_var_name(section, key))
+            if value is not None:
+                sections.setdefault(section, {})[key] = value
+
+    return Settings(path=Path(path), sections=sections)
+
+
+def get_settings(path: Path) -> Settings:
+    """
+    Returns the settings for the given configuration file.
+
+    The file is parsed once per process, and parsed again only if it is modified.
+
+    Args:
+        path (Path): The path to the configuration file.
+
+    Returns:
+        Settings: The parsed settings.
+    """
+    key = str(Path(path).resolve())
+    try:
+        mtime_ns = os.stat(key).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = -1
+
+    with _SETTINGS_LOCK:
+        cached = _SETTINGS.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        settings = read_settings(Path(path))
+        _SETTINGS[key] = (mtime_ns, settings)
+
+    return settings
 
 
 def config(path: Path, section: str) -> Dict[str, str]:
@@ -21,15 +480,4 @@ def config(path: Path, section: str) -> Dict[str, str]:
     Raises:
         Exception: If the specified section is not found in the configuration file.
     """
-    parser = ConfigParser()
-    parser.read(path)
-
-    conf = {}
-    if parser.has_section(section):
-        params = parser.items(section)
-        for param in params:
-            conf[param[0]] = param[1]
-    else:
-        raise ValueError(f"Section {section} not found in the {path} file")
-
-    return conf
+    return get_settings(path).section(section)
@@ -3,16 +3,62 @@ Database helper functions for working with PostgreSQL databases.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+from datetime import date, datetime
+import atexit
+import hashlib
+import itertools
 import json
+import os
+import threading
+import time
 
 import psycopg2
+import psycopg2.extensions
+from psycopg2.extensions import connection
 from rich.console import Console
 import pandas as pd
 import sqlalchemy
 
-from interviewqc.helpers.config import config
-from interviewqc.helpers import utils
+from interviewqc.helpers.config import get_settings
+from interviewqc.helpers import query_stats, utils
+
+COPY_BUFFER_SIZE = 1 << 16  # characters per read from the COPY stream
+DEFAULT_CHUNK_SIZE = 10000  # rows per DataFrame yielded by execute_sql_iter
+
+# Tracks the chunks of query batches committed by execute_queries(chunk_size=...)
+# (see migrations.v0009_query_batch_progress)
+BATCH_PROGRESS_TABLE = "query_batch_progress"
+BATCH_SAVEPOINT = "batch_query"
+
+_POOLS: Dict[str, "ConnectionPool"] = {}
+_POOLS_LOCK = threading.Lock()
+
+# Pools inherited from a parent process. Their sockets belong to the parent, so
+# they are kept referenced (never closed or garbage collected) in the child.
+_INHERITED_POOLS: List["ConnectionPool"] = []
+
+_ENGINES: Dict[str, sqlalchemy.engine.Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+_INHERITED_ENGINES: List[sqlalchemy.engine.Engine] = []
+
+
+class QueryBatchError(Exception):
+    """
+    Raised by execute_queries_in_chunks when queries of the batch failed.
+
+    The other queries are committed, and rerunning the same batch retries the
+    failed queries only.
+
+    Attributes:
+        failed (List[Tuple[int, str, str]]): The index, query and error of each
+            failed query.
+    """
+
+    def __init__(self, failed: List[Tuple[int, str, str]]):
+        super().__init__(f"{len(failed)} query(ies) of the batch failed")
+        self.failed = failed
 
 
 def handle_null(query: str) -> str:
@@ -74,16 +120,264 @@ def sanitize_json(json_dict: dict) -> str:
     return json.dumps(json_dict)
 
 
+class ConnectionPool:
+    """
+    A thread-safe pool of PostgreSQL connections.
+
+    Callers block when all connections are in use, returned connections are kept
+    open for reuse (up to `max_size`), and connections that have been idle for
+    longer than `idle_timeout` seconds are closed instead of being handed out.
+
+    Attributes:
+        min_size (int): The number of connections opened upfront.
+        max_size (int): The maximum number of open connections.
+        idle_timeout (float): Seconds after which an idle connection is closed.
+            0 disables the check.
+        pid (int): The ID of the process that owns the connections.
+    """
+
+    def __init__(
+        self, params: Dict[str, str], min_size: int, max_size: int, idle_timeout: float
+    ):
+        """
+        Initialize a ConnectionPool object.
+
+        Args:
+            params (Dict[str, str]): Keyword arguments for psycopg2.connect.
+            min_size (int): The number of connections opened upfront.
+            max_size (int): The maximum number of open connections.
+            idle_timeout (float): Seconds after which an idle connection is closed.
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.pid = os.getpid()
+
+        self._params = params
+        self._idle: List[Tuple[connection, float]] = []
+        self._size = 0
+        self._condition = threading.Condition()
+
+        for _ in range(min_size):
+            self._idle.append((psycopg2.connect(**params), time.monotonic()))
+            self._size += 1
+
+    def getconn(self) -> connection:
+        """
+        Get a connection from the pool, waiting for one to be returned if
+        `max_size` connections are already in use.
+
+        Returns:
+            connection: An open psycopg2 connection.
+        """
+        with self._condition:
+            while True:
+                while self._idle:
+                    conn, last_used = self._idle.pop()
+                    idle_for = time.monotonic() - last_used
+                    if conn.closed or (self.idle_timeout and idle_for > self.idle_timeout):
+                        conn.close()
+                        self._size -= 1
+                        continue
+                    return conn
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                self._condition.wait()
+
+        try:
+            return psycopg2.connect(**self._params)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def putconn(self, conn: connection, close: bool = False) -> None:
+        """
+        Return a connection to the pool. Any open transaction is rolled back.
+
+        Args:
+            conn (connection): The connection to return.
+            close (bool, optional): Whether to close the connection instead of
+                keeping it for reuse. Defaults to False.
+        """
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+
+        with self._condition:
+            if close or conn.closed:
+                conn.close()
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def closeall(self) -> None:
+        """
+        Close all idle connections in the pool.
+        """
+        with self._condition:
+            for conn, _ in self._idle:
+                conn.close()
+            self._size -= len(self._idle)
+            self._idle.clear()
+
+
+def get_connection_params(config_file: Path) -> Dict[str, str]:
+    """
+    Returns the psycopg2 connection parameters from the [postgresql] section,
+    without the connection pool settings.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        Dict[str, str]: The connection parameters.
+    """
+    return get_settings(config_file).postgresql.connection_params()
+
+
+def get_pool_settings(config_file: Path) -> Tuple[int, int, float]:
+    """
+    Returns the connection pool settings from the [postgresql] section.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        Tuple[int, int, float]: The minimum size, maximum size and idle timeout
+            (in seconds) of the connection pool.
+    """
+    settings = get_settings(config_file).postgresql
+
+    max_size = max(settings.pool_max_size, 1)
+    min_size = min(max(settings.pool_min_size, 0), max_size)
+
+    return min_size, max_size, settings.pool_idle_timeout
+
+
+def _forget_pools() -> None:
+    """
+    Drops the pools inherited from the parent process after a fork.
+
+    The inherited connections share their sockets with the parent, so closing
+    them here would terminate the parent's sessions. The locks are created
+    again, as another thread of the parent may have held them at fork time.
+    """
+    global _POOLS_LOCK, _ENGINES_LOCK
+
+    _POOLS_LOCK = threading.Lock()
+    _ENGINES_LOCK = threading.Lock()
+
+    _INHERITED_POOLS.extend(_POOLS.values())
+    _POOLS.clear()
+
+    _INHERITED_ENGINES.extend(_ENGINES.values())
+    _ENGINES.clear()
+
+
+def close_connection_pools() -> None:
+    """
+    Closes all connection pools and engines owned by the current process.
+    """
+    with _POOLS_LOCK:
+        for connection_pool in _POOLS.values():
+            if connection_pool.pid == os.getpid():
+                connection_pool.closeall()
+        _POOLS.clear()
+
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+
+os.register_at_fork(after_in_child=_forget_pools)
+atexit.register(close_connection_pools)
+
+
+def get_connection_pool(config_file: Path) -> ConnectionPool:
+    """
+    Returns the process-wide connection pool for the given configuration file,
+    creating it on first use.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        ConnectionPool: The connection pool.
+    """
+    key = str(Path(config_file).resolve())
+
+    with _POOLS_LOCK:
+        connection_pool = _POOLS.get(key)
+        if connection_pool is not None and connection_pool.pid != os.getpid():
+            # Inherited without going through os.fork (e.g. a copied module state)
+            _INHERITED_POOLS.append(connection_pool)
+            connection_pool = None
+
+        if connection_pool is None:
+            min_size, max_size, idle_timeout = get_pool_settings(config_file)
+            connection_pool = ConnectionPool(
+                params=get_connection_params(config_file),
+                min_size=min_size,
+                max_size=max_size,
+                idle_timeout=idle_timeout,
+            )
+            _POOLS[key] = connection_pool
+
+    return connection_pool
+
+
+@contextmanager
+def get_connection(config_file: Path) -> Iterator[connection]:
+    """
+    Borrows a connection from the connection pool for the duration of the
+    `with` block. Uncommitted changes are rolled back when it is returned.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Yields:
+        connection: An open psycopg2 connection.
+    """
+    connection_pool = get_connection_pool(config_file)
+    conn = connection_pool.getconn()
+
+    broken = False
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    finally:
+        connection_pool.putconn(conn, close=broken)
+
+
 def execute_queries(
     config_file: Path,
     queries: list,
     show_commands=True,
     show_progress=False,
     silent=False,
+    chunk_size: Optional[int] = None,
 ) -> list:
     """
     Executes a list of SQL queries on a PostgreSQL database.
 
+    By default, all queries run in a single transaction. With `chunk_size`, see
+    execute_queries_in_chunks.
+
     Args:
         config_file_path (str): The path to the configuration file containing
             the connection parameters.
@@ -92,17 +386,30 @@ def execute_queries(
             Defaults to True.
         show_progress (bool, optional): Whether to display a progress bar. Defaults to False.
         silent (bool, optional): Whether to suppress output. Defaults to False.
+        chunk_size (Optional[int], optional): Commit every `chunk_size` queries,
+            isolating failing queries and resuming from the last committed chunk
+            on rerun (raises QueryBatchError if queries failed).
+            Defaults to None (single transaction).
 
     Returns:
         list: A list of tuples containing the results of the executed queries.
     """
+    if chunk_size:
+        return execute_queries_in_chunks(
+            config_file=config_file,
+            queries=queries,
+            chunk_size=chunk_size,
+            show_commands=show_commands,
+            show_progress=show_progress,
+            silent=silent,
+        )
+
     console = Console(color_system="standard")
-    conn = None
     command = None
     output = []
     try:
         # read the connection parameters
-        params = config(path=config_file, section="postgresql")
+        params = get_connection_params(config_file)
         # connect to the PostgreSQL server
         if show_commands:
             console.log("\nConnecting to the PostgreSQL database...")
@@ -110,36 +417,39 @@ def execute_queries(
                 f"{params['host']}:{params['port']} {params['database']} ({params['user']})"
             )
 
-        conn = psycopg2.connect(**params)  # type: ignore
-        cur = conn.cursor()
-
-        def execute_query(query: str):
-            if show_commands:
-                console.log("Executing Query: ")
-                console.log(query, style="bold blue")
-            cur.execute(query)
-            try:
-                output.append(cur.fetchall())
-            except psycopg2.ProgrammingError:
-                pass
-
-        if show_progress:
-            with utils.get_progress_bar() as progress:
-                task = progress.add_task("Executing SQL queries...", total=len(queries))
-
+        with get_connection(config_file) as conn:
+            cur = conn.cursor()
+
+            def execute_query(query: str):
+                if show_commands:
+                    console.log("Executing Query: ")
+                    console.log(query, style="bold blue")
+                with query_stats.timed(query):
+                    cur.execute(query)
+                try:
+                    output.append(cur.fetchall())
+                except psycopg2.ProgrammingError:
+                    pass
+
+            if show_progress:
+                with utils.get_progress_bar() as progress:
+                    task = progress.add_task(
+                        "Executing SQL queries...", total=len(queries)
+                    )
+
+                    for command in queries:
+                        progress.update(task, advance=1)
+                        execute_query(command)
+
+            else:
                 for command in queries:
-                    progress.update(task, advance=1)
                     execute_query(command)
 
-        else:
-            for command in queries:
-                execute_query(command)
-
-        # close communication with the PostgreSQL database server
-        cur.close()
+            # close the cursor, the connection goes back to the pool
+            cur.close()
 
-        # commit the changes
-        conn.commit()
+            # commit the changes
+            conn.commit()
 
         if not silent:
             console.log(f"Executed {len(queries)} SQL query(ies).")
@@ -149,13 +459,441 @@ def execute_queries(
             console.log(f"[red]For query: [bold]{command}[/bold][/red]")
         console.log("Error: " + str(e), style="red")
         raise e
-    finally:
-        if conn is not None:
-            conn.close()
 
     return output
 
 
+def get_batch_id(queries: List[str], chunk_size: int) -> str:
+    """
+    Returns an ID identifying a batch of queries split into chunks of `chunk_size`.
+
+    Args:
+        queries (List[str]): The SQL queries.
+        chunk_size (int): The number of queries per chunk.
+
+    Returns:
+        str: The batch ID (a SHA-256 hex digest).
+    """
+    batch_hash = hashlib.sha256(str(chunk_size).encode("utf-8"))
+    for query in queries:
+        batch_hash.update(b"\0")
+        batch_hash.update(query.encode("utf-8"))
+
+    return batch_hash.hexdigest()
+
+
+def drop_batch_progress_table_query() -> str:
+    """
+    Returns the SQL query to drop the query_batch_progress table
+    (created by migrations.v0009_query_batch_progress).
+    """
+    sql_query = f"""
+    DROP TABLE IF EXISTS {BATCH_PROGRESS_TABLE};
+    """
+
+    return sql_query
+
+
+def execute_queries_in_chunks(
+    config_file: Path,
+    queries: List[str],
+    chunk_size: int,
+    show_commands: bool = False,
+    show_progress: bool = False,
+    silent: bool = False,
+) -> list:
+    """
+    Executes a list of SQL queries, committing every `chunk_size` queries.
+
+    Each query runs under a savepoint, so a failing query is rolled back and
+    reported without aborting the rest of its chunk.
+
+    The number of committed chunks, and the failed queries of these chunks, are
+    recorded in the query_batch_progress table, in the same transaction as the
+    chunk. Rerunning the same list of queries retries the failed queries, and
+    skips the chunks that were already committed.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+        queries (List[str]): The SQL queries to execute.
+        chunk_size (int): The number of queries per transaction.
+        show_commands (bool, optional): Whether to display the executed SQL queries.
+            Defaults to False.
+        show_progress (bool, optional): Whether to display a progress bar. Defaults to False.
+        silent (bool, optional): Whether to suppress output. Defaults to False.
+
+    Returns:
+        list: A list of tuples containing the results of the queries executed
+            (and not failed) in this run.
+
+    Raises:
+        QueryBatchError: If queries failed, once all the chunks are committed.
+    """
+    console = Console(color_system="standard")
+    output = []
+    errors: Dict[int, str] = {}
+
+    batch_id = get_batch_id(queries, chunk_size)
+    chunks_count = (len(queries) + chunk_size - 1) // chunk_size
+
+    with get_connection(config_file) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT chunks_committed, failed_queries
+            FROM {BATCH_PROGRESS_TABLE}
+            WHERE batch_id = %s;
+            """,
+            (batch_id,),
+        )
+        row = cur.fetchone()
+        conn.commit()
+
+        first_chunk = row[0] if row else 0
+        failed_indexes: List[int] = list(row[1]) if row else []
+        if first_chunk > 0 and not silent:
+            console.log(
+                f"Resuming query batch: skipping {first_chunk}/{chunks_count} "
+                f"committed chunk(s), retrying {len(failed_indexes)} failed query(ies)."
+            )
+
+        def execute_isolated(indexes: Iterable[int]) -> List[int]:
+            savepoint_open = False
+            chunk_failed: List[int] = []
+            for idx in indexes:
+                query = queries[idx]
+                if show_commands:
+                    console.log("Executing Query: ")
+                    console.log(query, style="bold blue")
+
+                # release the previous query's savepoint in the same round-trip
+                statement = f"SAVEPOINT {BATCH_SAVEPOINT}; {query}"
+                if savepoint_open:
+                    statement = f"RELEASE SAVEPOINT {BATCH_SAVEPOINT}; {statement}"
+
+                try:
+                    with query_stats.timed(query):
+                        cur.execute(statement)
+                except psycopg2.Error as e:
+                    cur.execute(f"ROLLBACK TO SAVEPOINT {BATCH_SAVEPOINT};")
+                    chunk_failed.append(idx)
+                    errors[idx] = str(e).strip()
+                    savepoint_open = True
+                    continue
+
+                savepoint_open = True
+                errors.pop(idx, None)
+                try:
+                    output.append(cur.fetchall())
+                except psycopg2.ProgrammingError:
+                    pass
+
+            return chunk_failed
+
+        def commit_progress(chunks_committed: int) -> None:
+            cur.execute(
+                f"""
+                INSERT INTO {BATCH_PROGRESS_TABLE}
+                    (batch_id, chunk_size, chunks_committed, queries_count,
+                    failed_queries)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (batch_id) DO UPDATE
+                SET chunks_committed = EXCLUDED.chunks_committed,
+                    failed_queries = EXCLUDED.failed_queries,
+                    updated_at = NOW();
+                """,
+                (batch_id, chunk_size, chunks_committed, len(queries), failed_indexes),
+            )
+            conn.commit()
+
+        if failed_indexes:
+            failed_indexes = execute_isolated(failed_indexes)
+            commit_progress(first_chunk)
+
+        with utils.get_progress_bar(transient=not show_progress) as progress:
+            task = progress.add_task(
+                "Executing SQL queries...",
+                total=len(queries),
+                completed=min(first_chunk * chunk_size, len(queries)),
+                visible=show_progress,
+            )
+
+            for chunk_idx in range(first_chunk, chunks_count):
+                chunk_start = chunk_idx * chunk_size
+                chunk_end = min(chunk_start + chunk_size, len(queries))
+
+                failed_indexes += execute_isolated(range(chunk_start, chunk_end))
+                commit_progress(chunk_idx + 1)
+                progress.update(task, advance=chunk_end - chunk_start)
+
+        if not failed_indexes:
+            # The batch is complete, a rerun should execute it again
+            cur.execute(
+                f"DELETE FROM {BATCH_PROGRESS_TABLE} WHERE batch_id = %s;",
+                (batch_id,),
+            )
+            conn.commit()
+        cur.close()
+
+    failed = [(idx, queries[idx], errors[idx]) for idx in failed_indexes]
+    for idx, query, error in failed:
+        console.log(f"[red]Query {idx} failed: [bold]{query.strip()}[/bold][/red]")
+        console.log("Error: " + error, style="red")
+
+    if not silent:
+        console.log(
+            f"Executed {len(queries)} SQL query(ies) in {chunks_count} chunk(s), "
+            f"{len(failed)} failed."
+        )
+
+    if failed:
+        raise QueryBatchError(failed)
+
+    return output
+
+
+def to_copy_value(value: Any) -> str:
+    """
+    Formats a Python value as a field of PostgreSQL's COPY text format.
+
+    None, NaN and NaT become NULL (\\N), and backslashes, tabs and newlines are escaped.
+
+    Args:
+        value (Any): The value to format.
+
+    Returns:
+        str: The formatted field.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class CopyStream:
+    """
+    A read-only file-like object that renders rows as COPY text lazily,
+    so that rows are streamed to the server without being held in memory.
+
+    Attributes:
+        count (int): The number of rows read so far.
+    """
+
+    _END = object()
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        """
+        Initialize a CopyStream object.
+
+        Args:
+            rows (Iterable[Sequence[Any]]): The rows to stream.
+        """
+        self.count = 0
+        self._rows = iter(rows)
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        """
+        Read up to `size` characters of COPY text.
+
+        Args:
+            size (int, optional): The number of characters to read. Defaults to -1 (all).
+
+        Returns:
+            str: The COPY text, or an empty string once all rows have been read.
+        """
+        chunks = [self._buffer]
+        length = len(self._buffer)
+
+        while size < 0 or length < size:
+            row = next(self._rows, self._END)
+            if row is self._END:
+                break
+            line = "\t".join(to_copy_value(value) for value in row) + "\n"  # type: ignore
+            chunks.append(line)
+            length += len(line)
+            self.count += 1
+
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> str:
+        """
+        Read a single line of COPY text.
+        """
+        return self.read(size)
+
+
+def copy_rows_with_cursor(
+    cur: psycopg2.extensions.cursor,
+    staging_table: str,
+    columns: Dict[str, str],
+    rows: Iterable[Sequence[Any]],
+    from_staging_query: str,
+) -> Tuple[int, int]:
+    """
+    Bulk loads rows as copy_rows does, in the current transaction of `cur`,
+    without committing it. Use it to load several tables in one transaction.
+
+    Args:
+        cur (psycopg2.extensions.cursor): The cursor to execute the queries with.
+        staging_table (str): The name of the temporary staging table.
+        columns (Dict[str, str]): The staging table columns, mapped to their SQL types.
+        rows (Iterable[Sequence[Any]]): The rows to load, in the order of `columns`.
+        from_staging_query (str): The SQL query that moves the rows out of the staging table.
+
+    Returns:
+        Tuple[int, int]: The number of rows copied, and the number of rows
+            affected by `from_staging_query`.
+    """
+    column_defs = ", ".join(f"{name} {sql_type}" for name, sql_type in columns.items())
+    column_names = ", ".join(columns.keys())
+
+    stream = CopyStream(rows)
+    cur.execute(f"CREATE TEMP TABLE {staging_table} ({column_defs}) ON COMMIT DROP;")
+    copy_query = f"COPY {staging_table} ({column_names}) FROM STDIN"
+    with query_stats.timed(copy_query):
+        cur.copy_expert(copy_query, stream, size=COPY_BUFFER_SIZE)
+    with query_stats.timed(from_staging_query):
+        cur.execute(from_staging_query)
+
+    return stream.count, cur.rowcount
+
+
+def copy_rows(
+    config_file: Path,
+    staging_table: str,
+    columns: Dict[str, str],
+    rows: Iterable[Sequence[Any]],
+    from_staging_query: str,
+    pre_queries: Optional[List[str]] = None,
+) -> Tuple[int, int]:
+    """
+    Bulk loads rows with COPY FROM STDIN into a temporary staging table, and then
+    moves them into the target table(s) with `from_staging_query`, which handles
+    conflicts with existing rows (e.g. INSERT ... SELECT ... ON CONFLICT DO NOTHING).
+
+    Everything runs in a single transaction, and the staging table is dropped on commit.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+        staging_table (str): The name of the temporary staging table.
+        columns (Dict[str, str]): The staging table columns, mapped to their SQL types.
+        rows (Iterable[Sequence[Any]]): The rows to load, in the order of `columns`.
+        from_staging_query (str): The SQL query that moves the rows out of the staging table.
+        pre_queries (Optional[List[str]], optional): SQL queries to execute first,
+            in the same transaction (e.g. recreating the target table).
+            Defaults to None.
+
+    Returns:
+        Tuple[int, int]: The number of rows copied, and the number of rows
+            affected by `from_staging_query`.
+    """
+    with get_connection(config_file) as conn:
+        with conn.cursor() as cur:
+            for query in pre_queries or []:
+                with query_stats.timed(query):
+                    cur.execute(query)
+            copied, affected = copy_rows_with_cursor(
+                cur=cur,
+                staging_table=staging_table,
+                columns=columns,
+                rows=rows,
+                from_staging_query=from_staging_query,
+            )
+        conn.commit()
+
+    return copied, affected
+
+
+def copy_models(
+    config_file: Path,
+    models: Iterable[Any],
+    silent: bool = False,
+    pre_queries: Optional[List[str]] = None,
+) -> int:
+    """
+    Bulk loads model objects (File, Interview, Transcript, etc.) into their table
+    with COPY, instead of one INSERT query per object.
+
+    All objects must be of the same class, which must provide `copy_columns()`,
+    `from_staging_query(staging_table)` and `to_copy_row()`.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+        models (Iterable[Any]): The objects to load. Consumed lazily.
+        silent (bool, optional): Whether to suppress output. Defaults to False.
+        pre_queries (Optional[List[str]], optional): SQL queries to execute first,
+            in the same transaction (see copy_rows). Executed even if there is
+            no object to load. Defaults to None.
+
+    Returns:
+        int: The number of rows inserted (or updated) in the target table.
+    """
+    console = Console(color_system="standard")
+
+    models_iter = iter(models)
+    first = next(models_iter, None)
+    if first is None:
+        if pre_queries:
+            execute_queries(
+                config_file=config_file,
+                queries=pre_queries,
+                show_commands=False,
+                silent=True,
+            )
+        return 0
+
+    model_class = type(first)
+    staging_table = f"{model_class.__name__.lower()}_staging"
+
+    def rows() -> Iterator[Sequence[Any]]:
+        for model in itertools.chain([first], models_iter):
+            if type(model) is not model_class:
+                raise TypeError(
+                    f"Cannot copy {type(model).__name__} along with {model_class.__name__}"
+                )
+            yield model.to_copy_row()
+
+    try:
+        copied, inserted = copy_rows(
+            config_file=config_file,
+            staging_table=staging_table,
+            columns=model_class.copy_columns(),
+            rows=rows(),
+            from_staging_query=model_class.from_staging_query(staging_table),
+            pre_queries=pre_queries,
+        )
+    except (Exception, psycopg2.DatabaseError) as e:
+        console.log(f"Error copying {model_class.__name__} objects.", style="red")
+        console.log("Error: " + str(e), style="red")
+        raise e
+
+    if not silent:
+        console.log(
+            f"Copied {copied} {model_class.__name__} row(s), inserted {inserted}."
+        )
+
+    return inserted
+
+
 def get_db_connection(config_file: Path) -> sqlalchemy.engine.base.Engine:
     """
     Establishes a connection to the PostgreSQL database using the provided configuration file.
@@ -166,23 +904,47 @@ def get_db_connection(config_file: Path) -> sqlalchemy.engine.base.Engine:
     Returns:
         sqlalchemy.engine.base.Engine: The database connection engine.
     """
-    params = config(path=config_file, section="postgresql")
+    settings = get_settings(config_file).postgresql
+    _, max_size, idle_timeout = get_pool_settings(config_file)
     engine = sqlalchemy.create_engine(
-        "postgresql+psycopg2://"
-        + params["user"]
-        + ":"
-        + params["password"]
-        + "@"
-        + params["host"]
-        + ":"
-        + params["port"]
-        + "/"
-        + params["database"]
+        sqlalchemy.engine.URL.create(
+            drivername="postgresql+psycopg2",
+            username=settings.user,
+            password=settings.password,
+            host=settings.host,
+            port=settings.port,
+            database=settings.database,
+        ),
+        pool_size=max_size,
+        pool_recycle=idle_timeout if idle_timeout > 0 else -1,
+        pool_pre_ping=True,
     )
 
     return engine
 
 
+def get_engine(config_file: Path) -> sqlalchemy.engine.base.Engine:
+    """
+    Returns the process-wide SQLAlchemy engine for the given configuration file,
+    creating it on first use.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        sqlalchemy.engine.base.Engine: The cached database connection engine.
+    """
+    key = str(Path(config_file).resolve())
+
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = get_db_connection(config_file=config_file)
+            _ENGINES[key] = engine
+
+    return engine
+
+
 def execute_sql(config_file: Path, query: str) -> pd.DataFrame:
     """
     Executes a SQL query on a PostgreSQL database and
@@ -196,15 +958,41 @@ def execute_sql(config_file: Path, query: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A pandas DataFrame containing the result of the SQL query.
     """
-    engine = get_db_connection(config_file=config_file)
-
-    df = pd.read_sql(query, engine)
+    engine = get_engine(config_file=config_file)
 
-    engine.dispose()
+    with query_stats.timed(query):
+        df = pd.read_sql(query, engine)
 
     return df
 
 
+def execute_sql_iter(
+    config_file: Path, query: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Executes a SQL query on a PostgreSQL database and yields the result as
+    pandas DataFrames of up to `chunk_size` rows.
+
+    Rows are fetched through a server-side cursor, so only one chunk is held in
+    memory at a time.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+        query (str): The SQL query to execute.
+        chunk_size (int, optional): The number of rows per DataFrame.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Yields:
+        pd.DataFrame: The next chunk of the result of the SQL query.
+    """
+    engine = get_engine(config_file=config_file)
+
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+        for df in pd.read_sql(query, conn, chunksize=chunk_size):
+            yield df
+
+
 def fetch_record(config_file: Path, query: str) -> Optional[str]:
     """
     Fetches a single record from the database using the provided SQL query.
@@ -0,0 +1,217 @@
+"""
+Finds the moved files (recorded in the 'moved_files' table) that are copies of a file.
+
+Files are compared in increasing order of cost:
+1. size: the moved files are loaded once, and indexed by size (moved files
+   recorded without a size are stat'ed once, and their size written back)
+2. sample hash: a hash of the size, and the first and last bytes of the files
+   (see hash.compute_sample_hash)
+3. MD5 hash of the file (cached, see hash.compute_hash), against the recorded MD5
+
+Most files match no moved file by size, and are never read.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from interviewqc.helpers import db, throttle
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.models.moved_file import MovedFile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MovedFileEntry:
+    """
+    A moved file, as indexed by MovedFileIndex.
+
+    Attributes:
+        path (Path): The destination path of the moved file.
+        md5 (str): The MD5 hash recorded when the file was moved.
+        sample_hash (Optional[str]): The sample hash of the destination file,
+            computed on first use.
+    """
+
+    path: Path
+    md5: str
+    sample_hash: Optional[str] = None
+
+
+@dataclass
+class DedupStats:
+    """
+    Counters of the files compared with MovedFileIndex.find_duplicates.
+
+    Attributes:
+        files (int): Files compared.
+        size_mismatches (int): Files skipped, as no moved file has their size.
+        sample_mismatches (int): Files skipped, as no moved file has their sample hash.
+        hashed (int): Files fully hashed.
+        duplicates (int): Moved files found to be copies of a file.
+    """
+
+    files: int = 0
+    size_mismatches: int = 0
+    sample_mismatches: int = 0
+    hashed: int = 0
+    duplicates: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} files: {self.size_mismatches} skipped by size, "
+            f"{self.sample_mismatches} skipped by sample hash, {self.hashed} hashed, "
+            f"{self.duplicates} duplicates found"
+        )
+
+
+@dataclass
+class MovedFileIndex:
+    """
+    The moved files, indexed by size.
+
+    Attributes:
+        entries_by_size (Dict[int, Dict[Path, MovedFileEntry]]): The moved files,
+            by size and destination path.
+        sizes_by_path (Dict[Path, int]): The size of each moved file, by destination path.
+        stats (DedupStats): The counters of find_duplicates.
+    """
+
+    entries_by_size: Dict[int, Dict[Path, MovedFileEntry]]
+    sizes_by_path: Dict[Path, int]
+    stats: DedupStats = field(default_factory=DedupStats)
+
+    def __len__(self) -> int:
+        return len(self.sizes_by_path)
+
+    @staticmethod
+    def load(config_file: Path) -> "MovedFileIndex":
+        """
+        Loads all the moved files, with a single query.
+
+        Moved files recorded without a size are stat'ed, and their size is written
+        back, so that they are only stat'ed once; those that no longer exist are
+        left out, as there is nothing to remove.
+
+        Args:
+            config_file (Path): The path to the configuration file.
+
+        Returns:
+            MovedFileIndex: The moved files, indexed by size.
+        """
+        query = """
+            SELECT moved_file_id,
+                interviewqc_path(destination_directory_id, destination_name)
+                    AS destination_file_path,
+                md5,
+                file_size
+            FROM moved_files;
+        """
+
+        moved_files_df = db.execute_sql(config_file=config_file, query=query)
+
+        entries_by_size: Dict[int, Dict[Path, MovedFileEntry]] = {}
+        sizes_by_path: Dict[Path, int] = {}
+        backfilled_sizes: List[Tuple[int, int]] = []
+        missing = 0
+        for moved_file_id, destination_file_path, md5, file_size in (
+            moved_files_df.itertuples(index=False)
+        ):
+            path = Path(destination_file_path)
+            if file_size is None or file_size != file_size:  # NULL or NaN
+                throttle.throttle()
+                try:
+                    file_size = os.stat(path).st_size
+                except FileNotFoundError:
+                    missing += 1
+                    continue
+                backfilled_sizes.append((int(moved_file_id), file_size))
+
+            file_size = int(file_size)
+            entries_by_size.setdefault(file_size, {})[path] = MovedFileEntry(
+                path=path, md5=md5
+            )
+            sizes_by_path[path] = file_size
+
+        if backfilled_sizes:
+            _, updated = db.copy_rows(
+                config_file=config_file,
+                staging_table="moved_file_sizes_staging",
+                columns=MovedFile.size_backfill_columns(),
+                rows=backfilled_sizes,
+                from_staging_query=MovedFile.size_backfill_query(
+                    staging_table="moved_file_sizes_staging"
+                ),
+            )
+            logger.info(f"Backfilled the size of {updated} moved files")
+
+        index = MovedFileIndex(
+            entries_by_size=entries_by_size, sizes_by_path=sizes_by_path
+        )
+        logger.info(
+            f"Indexed {len(index)} moved files by size "
+            f"({len(entries_by_size)} distinct sizes, {missing} missing files)"
+        )
+
+        return index
+
+    def find_duplicates(self, file_path: Path) -> List[Path]:
+        """
+        Returns the moved files that are copies of a file.
+
+        Args:
+            file_path (Path): The path to the file.
+
+        Returns:
+            List[Path]: The destination paths of the copies.
+        """
+        self.stats.files += 1
+
+        throttle.throttle()
+        candidates = self.entries_by_size.get(os.stat(file_path).st_size)
+        if not candidates:
+            self.stats.size_mismatches += 1
+            return []
+
+        sample_hash = hash_helpers.compute_sample_hash(file_path)
+        sample_candidates: List[MovedFileEntry] = []
+        for entry in candidates.values():
+            if entry.sample_hash is None:
+                try:
+                    entry.sample_hash = hash_helpers.compute_sample_hash(entry.path)
+                except FileNotFoundError:
+                    logger.warning(f"Expected File, {entry.path} does not exist.")
+                    entry.sample_hash = ""
+            if entry.sample_hash == sample_hash:
+                sample_candidates.append(entry)
+
+        if not sample_candidates:
+            self.stats.sample_mismatches += 1
+            return []
+
+        self.stats.hashed += 1
+        md5_hash = hash_helpers.compute_hash(file_path)
+        duplicates = [entry.path for entry in sample_candidates if entry.md5 == md5_hash]
+        self.stats.duplicates += len(duplicates)
+
+        return duplicates
+
+    def remove(self, paths: List[Path]) -> None:
+        """
+        Removes moved files from the index, e.g. once they are deleted.
+
+        Args:
+            paths (List[Path]): The destination paths of the moved files.
+        """
+        for path in paths:
+            file_size = self.sizes_by_path.pop(path, None)
+            if file_size is None:
+                continue
+
+            entries = self.entries_by_size[file_size]
+            del entries[path]
+            if not entries:
+                del self.entries_by_size[file_size]
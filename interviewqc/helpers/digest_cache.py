@@ -0,0 +1,199 @@
+"""
+Persistent cache of file digests, stored in a local SQLite file.
+
+Digests are keyed by the file's (device, inode, size, mtime_ns) and the hash
+algorithm: a file is only read again once it is modified (or replaced). Moving
+a file within a filesystem keeps its key, so its digest stays cached.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Seconds to wait for a lock held by another process writing to the cache
+SQLITE_TIMEOUT_S = 60.0
+
+CacheKey = Tuple[int, int, int, int]
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of digest cache lookups.
+
+    Attributes:
+        hits (int): Digests returned from the cache.
+        sidecar_hits (int): Digests read from .checksum sidecar files.
+        misses (int): Digests computed, as the file was not in the cache (or modified).
+        verified (int): Cached digests that matched the file, in verify mode.
+        mismatches (int): Cached digests that did not match the file, in verify mode.
+        bytes_read (int): Bytes read to compute digests.
+    """
+
+    hits: int = 0
+    sidecar_hits: int = 0
+    misses: int = 0
+    verified: int = 0
+    mismatches: int = 0
+    bytes_read: int = 0
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            **{
+                field.name: getattr(self, field.name) + getattr(other, field.name)
+                for field in fields(self)
+            }
+        )
+
+    def __sub__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            **{
+                field.name: getattr(self, field.name) - getattr(other, field.name)
+                for field in fields(self)
+            }
+        )
+
+    def __str__(self) -> str:
+        hits = self.hits + self.sidecar_hits
+        lookups = hits + self.misses + self.verified + self.mismatches
+        hit_rate = hits / lookups * 100 if lookups else 0.0
+        return (
+            f"{self.hits} hits, {self.sidecar_hits} sidecar hits, "
+            f"{self.misses} misses ({hit_rate:.1f}% hit rate), "
+            f"{self.verified} verified, {self.mismatches} mismatches, "
+            f"{self.bytes_read / 1024**2:.1f} MiB read"
+        )
+
+
+class DigestCache:
+    """
+    Digests of files, keyed by (device, inode, size, mtime_ns) and algorithm.
+
+    Each thread (and process) uses its own SQLite connection. The database is
+    in WAL mode, so that parallel importers can read while one of them writes.
+
+    Attributes:
+        path (Path): The path to the SQLite file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+
+    @staticmethod
+    def get_key(file_stat: os.stat_result) -> CacheKey:
+        """
+        Returns the cache key of a file.
+
+        Args:
+            file_stat (os.stat_result): The stat of the file.
+
+        Returns:
+            CacheKey: The (device, inode, size, mtime_ns) of the file.
+        """
+        return (
+            file_stat.st_dev,
+            file_stat.st_ino,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+        )
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        # Connections are not shared with forked worker processes
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path, timeout=SQLITE_TIMEOUT_S, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode = WAL;")
+        connection.execute("PRAGMA synchronous = NORMAL;")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digests (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                computed_at REAL NOT NULL,
+                PRIMARY KEY (device, inode, size, mtime_ns, algorithm)
+            );
+            """
+        )
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+
+        return connection
+
+    def get(self, file_stat: os.stat_result, algorithm: str) -> Optional[str]:
+        """
+        Returns the cached digest of a file.
+
+        Args:
+            file_stat (os.stat_result): The stat of the file.
+            algorithm (str): The hash algorithm.
+
+        Returns:
+            Optional[str]: The digest, or None if the file is not cached.
+        """
+        row = (
+            self._get_connection()
+            .execute(
+                """
+                SELECT digest FROM digests
+                WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?
+                    AND algorithm = ?;
+                """,
+                (*self.get_key(file_stat), algorithm),
+            )
+            .fetchone()
+        )
+
+        if row is None:
+            return None
+        return row[0]
+
+    def put(
+        self,
+        file_path: Path,
+        file_stat: os.stat_result,
+        algorithm: str,
+        digest: str,
+    ) -> None:
+        """
+        Caches the digest of a file.
+
+        Args:
+            file_path (Path): The path to the file.
+            file_stat (os.stat_result): The stat of the file, before it was read.
+            algorithm (str): The hash algorithm.
+            digest (str): The digest of the file.
+        """
+        self._get_connection().execute(
+            """
+            INSERT OR REPLACE INTO digests (
+                device, inode, size, mtime_ns, algorithm,
+                digest, file_path, computed_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            (
+                *self.get_key(file_stat),
+                algorithm,
+                digest,
+                str(file_path),
+                time.time(),
+            ),
+        )
@@ -3,8 +3,15 @@ Module that provides helper functions for working with dpdash-compliant names.
 """
 
 from typing import Dict, Union
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Size of the LRU cache of parse_dpdash_name
+NAME_CACHE_SIZE = 1 << 16
 
 
 def get_days_between_dates(consent_date: datetime, event_date: datetime) -> int:
@@ -71,6 +78,34 @@ def get_dpdash_timepoint(consent_date: datetime, event_date: datetime) -> str:
     return timepoint
 
 
+def get_dpdash_timepoints(
+    consent_dates: Sequence[datetime], event_dates: Sequence[datetime]
+) -> np.ndarray:
+    """
+    Generates the DPDash compliant timepoints of many events, as get_dpdash_timepoint
+    does for one.
+
+    Args:
+        consent_dates (Sequence[datetime]): The consent date of each event.
+        event_dates (Sequence[datetime]): The date of each event.
+
+    Returns:
+        np.ndarray: The timepoint of each event.
+    """
+    consent_dates = pd.to_datetime(pd.Series(consent_dates)).to_numpy(
+        dtype="datetime64[ns]"
+    )
+    event_dates = pd.to_datetime(pd.Series(event_dates)).to_numpy(
+        dtype="datetime64[ns]"
+    )
+
+    days = np.abs((consent_dates - event_dates) // np.timedelta64(1, "D"))
+    timepoints = np.char.add("day", np.char.zfill(days.astype(str), 4))
+    timepoints[consent_dates == event_dates] = "day0001"
+
+    return timepoints
+
+
 def get_dpdash_name(
     study: str,
     subject: str,
@@ -182,6 +217,24 @@ def parse_dpdash_name(
             - optional_tags (List[str] or None): Any optional tags, if present.
             - time_range (str): The time range.
     """
+    study, subject, data_type, category, optional_tag, time_range = _parse_dpdash_name(
+        name, maxsplit
+    )
+
+    return {
+        "study": study,
+        "subject": subject,
+        "data_type": data_type,
+        "category": category,
+        "optional_tags": list(optional_tag) if optional_tag is not None else None,
+        "time_range": time_range,
+    }
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _parse_dpdash_name(
+    name: str, maxsplit: int
+) -> Tuple[str, str, str, Optional[str], Optional[Tuple[str, ...]], str]:
     # Remove any extensions
     name = name.split(".")[0]
 
@@ -194,22 +247,15 @@ def parse_dpdash_name(
     parts: List[str] = data_type_category_tags.split("_")
     data_type = parts[0]
     category = None
-    optional_tag: Optional[List[str]] = None
+    optional_tag: Optional[Tuple[str, ...]] = None
 
     if len(parts) > 1:
         category = parts[1]
 
     if len(parts) > 2:
-        optional_tag = parts[2:]
+        optional_tag = tuple(parts[2:])
 
-    return {
-        "study": study,
-        "subject": subject,
-        "data_type": data_type,
-        "category": category,
-        "optional_tags": optional_tag,
-        "time_range": time_range,
-    }
+    return study, subject, data_type, category, optional_tag, time_range
 
 
 def get_dpdash_name_from_dict(
@@ -256,3 +302,210 @@ def get_dpdash_name_from_dict(
         time_range=dpdash_dict["time_range"],  # type: ignore
     )
     return name
+
+
+def get_dpdash_names(df: pd.DataFrame) -> pd.Series:
+    """
+    Generates the DPDash compliant names of all the rows of a DataFrame, as
+    get_dpdash_name does for one.
+
+    The DataFrame must have the 'study' and 'subject' columns, and either a
+    'time_range' column or the 'consent_date' and 'event_date' columns (used
+    for the rows without a time range). The 'data_type', 'category' and
+    'optional_tags' (lists of tags) columns are optional.
+
+    Args:
+        df (pd.DataFrame): The fields of the names.
+
+    Returns:
+        pd.Series: The names, with the index of the DataFrame.
+
+    Raises:
+        ValueError: If a row has neither a time range, nor a consent and event date.
+    """
+
+    if df.empty:
+        return pd.Series(index=df.index, dtype=object)
+
+    def get_column(column: str) -> Tuple[np.ndarray, np.ndarray]:
+        if column not in df.columns:
+            return np.zeros(len(df), dtype=np.intp), np.array([""], dtype=object)
+        return _factorize(df[column])
+
+    time_range_codes, time_ranges = get_column("time_range")
+    missing_time_range = (time_ranges == "")[time_range_codes]
+    if missing_time_range.any():
+        if "consent_date" not in df.columns or "event_date" not in df.columns:
+            raise ValueError(
+                "Either 'time_range' or 'consent_date and event_date' must be provided"
+            )
+        consent_dates = df["consent_date"][missing_time_range]
+        event_dates = df["event_date"][missing_time_range]
+        if consent_dates.isna().any() or event_dates.isna().any():
+            raise ValueError(
+                "Either 'time_range' or 'consent_date and event_date' must be provided"
+            )
+        time_range = time_ranges[time_range_codes]
+        time_range[missing_time_range] = get_dpdash_timepoints(
+            consent_dates.tolist(), event_dates.tolist()
+        )
+        time_range_codes, time_ranges = _factorize(time_range)
+
+    if "optional_tags" in df.columns:
+        optional_tags = _factorize(
+            df["optional_tags"].map(
+                lambda tags: "_".join(tags) if isinstance(tags, (list, tuple)) else ""
+            )
+        )
+    else:
+        optional_tags = get_column("optional_tags")
+
+    # Join the distinct values of each field once, then take the names by code
+    codes, names_so_far = get_column("study")
+    for separator, (value_codes, values), required in (
+        ("-", get_column("subject"), True),
+        ("-", get_column("data_type"), False),
+        ("_", get_column("category"), False),
+        ("_", optional_tags, False),
+        ("-", (time_range_codes, time_ranges), True),
+    ):
+        codes, names_so_far = _join_factorized(
+            codes,
+            names_so_far,
+            value_codes,
+            values,
+            separator=separator,
+            required=required,
+        )
+
+    names = pd.Series(names_so_far[codes], index=df.index, dtype=object)
+
+    return names
+
+
+def parse_dpdash_names(names: pd.Series, errors: str = "raise") -> pd.DataFrame:
+    """
+    Parses many dpdash file names, as parse_dpdash_name does for one.
+
+    Args:
+        names (pd.Series): The dpdash file names to parse.
+        errors (str, optional): 'raise' to raise a ValueError on invalid names,
+            or 'coerce' to return missing values for them. Defaults to 'raise'.
+
+    Returns:
+        pd.DataFrame: The parsed values, with the index of the Series, and the
+            columns study, subject, data_type, category, optional_tags (lists of
+            tags, or None; shared by the rows of equal names) and time_range.
+
+    Raises:
+        ValueError: If a name is invalid, and errors is 'raise'.
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError(f"Invalid errors value: {errors}")
+
+    # Split off the extension and time range, then parse each distinct
+    # study-subject-dataType_category_tags prefix once
+    stems = [name.partition(".")[0].rpartition("-") for name in names.astype(str)]
+    prefix_codes, prefixes = _factorize([stem[0] for stem in stems])
+    time_ranges = np.array([stem[2] for stem in stems], dtype=object)
+
+    parsed_prefixes: List[Optional[Tuple[str, ...]]] = []
+    for prefix in prefixes:
+        parts = prefix.split("-")
+        if len(parts) != 3:
+            parsed_prefixes.append(None)
+            continue
+        study, subject, data_type_category_tags = parts
+        data_type, _, category_tags = data_type_category_tags.partition("_")
+        category, _, tags = category_tags.partition("_")
+        parsed_prefixes.append(
+            (
+                study,
+                subject,
+                data_type,
+                category if "_" in data_type_category_tags else None,
+                tags.split("_") if "_" in category_tags else None,
+            )
+        )
+
+    invalid_prefixes = np.array(
+        [parsed is None for parsed in parsed_prefixes], dtype=bool
+    )
+    invalid = invalid_prefixes[prefix_codes]
+    if errors == "raise" and invalid.any():
+        # Raise the same error as parse_dpdash_name
+        name = names.astype(str)[invalid].iloc[0]
+        parse_dpdash_name(name)
+        raise ValueError(f"Invalid name: {name}")
+
+    columns: Dict[str, np.ndarray] = {}
+    for position, column in enumerate(
+        ["study", "subject", "data_type", "category", "optional_tags"]
+    ):
+        values = np.empty(len(prefixes), dtype=object)
+        values[:] = [
+            parsed[position] if parsed is not None else None
+            for parsed in parsed_prefixes
+        ]
+        columns[column] = values[prefix_codes]
+    time_ranges[invalid] = None
+    columns["time_range"] = time_ranges
+
+    return pd.DataFrame(columns, index=names.index)
+
+
+def _factorize(values: Sequence[object]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes values as codes into their distinct strings. Empty, None and NaN
+    values are encoded as '', as they are omitted from names by get_dpdash_name.
+
+    Args:
+        values (Sequence[object]): The values.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The codes and distinct strings.
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+
+    strings = np.empty(len(uniques) + 1, dtype=object)
+    strings[:-1] = [str(value) for value in uniques]
+    strings[-1] = ""
+    codes[codes == -1] = len(uniques)
+
+    return codes, strings
+
+
+def _join_factorized(
+    codes: np.ndarray,
+    uniques: np.ndarray,
+    value_codes: np.ndarray,
+    value_uniques: np.ndarray,
+    separator: str,
+    required: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Appends factorized values to factorized strings, joining each distinct pair once.
+
+    Args:
+        codes (np.ndarray): The codes of the strings.
+        uniques (np.ndarray): The distinct strings.
+        value_codes (np.ndarray): The codes of the values.
+        value_uniques (np.ndarray): The distinct values.
+        separator (str): The separator between the strings and the values.
+        required (bool): Whether to append the separator to empty values.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The codes and distinct joined strings.
+    """
+    pair_codes, pairs = pd.factorize(
+        codes.astype(np.int64) * len(value_uniques) + value_codes
+    )
+    string_indices, value_indices = np.divmod(pairs, len(value_uniques))
+
+    joined = np.empty(len(pairs), dtype=object)
+    joined[:] = [
+        string + separator + value if value or required else string
+        for string, value in zip(uniques[string_indices], value_uniques[value_indices])
+    ]
+
+    return pair_codes, joined
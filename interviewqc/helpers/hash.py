@@ -1,9 +1,393 @@
 """
 Helper functions for computing hash digests of files.
+
+Several digests of a file are computed in a single read pass, and batches of
+files are hashed on a thread pool (hashlib, blake3 and xxhash release the GIL
+while hashing). Besides the hashlib algorithms (md5, blake2b, sha256, ...),
+'blake3' and the xxHash algorithms ('xxh3_64', 'xxh3_128', 'xxh64') are
+supported if the optional blake3 / xxhash packages are installed.
+
+Once `configure` is called, digests are cached in a local SQLite file (see
+`digest_cache`), and files are only read again once they are modified. Digests
+of unmodified files can also be read from the .checksum sidecars next to them
+(see `checksum`), if configured.
+
+Files are read into a reusable buffer of each hashing thread, with sequential
+read-ahead, and are evicted from the page cache once hashed (posix_fadvise),
+so that hashing the data root does not evict the pages of other services.
 """
 
 import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from interviewqc.helpers import checksum, throttle
+from interviewqc.helpers.config import get_settings
+from interviewqc.helpers.digest_cache import CacheStats, DigestCache
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+XXHASH_ALGORITHMS = ("xxh3_64", "xxh3_128", "xxh32", "xxh64", "xxh128")
+
+# Default size of the reads, shared by all the digests of a file
+CHUNK_SIZE = 1024 * 1024
+
+# Bytes read at each end of a file by compute_sample_hash
+SAMPLE_SIZE = 64 * 1024
+
+DEFAULT_DIGEST_ALGORITHM = "md5"
+DEFAULT_WORKERS = 4
+
+_CACHE: Optional[DigestCache] = None
+_VERIFY = False
+_DIGEST_ALGORITHM = DEFAULT_DIGEST_ALGORITHM
+_WORKERS = DEFAULT_WORKERS
+_READ_SIDECARS = False
+_WRITE_SIDECARS = False
+_BUFFER_SIZE = CHUNK_SIZE
+_DROP_CACHE = True
+_ORDER_BY_INODE = False
+_BUFFERS = threading.local()
+_STATS = CacheStats()
+_STATS_LOCK = threading.Lock()
+# Hashing thread pools by size, kept for the life of the process so their
+# threads (and the read buffers and digest cache connections of each thread)
+# are reused across batches
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _forget_executors() -> None:
+    """
+    Forgets the hashing thread pools inherited from the parent process, after
+    a fork: their threads only exist in the parent. The lock is created again,
+    as another thread of the parent may have held it at fork time.
+    """
+    global _EXECUTORS, _EXECUTORS_LOCK
+
+    _EXECUTORS = {}
+    _EXECUTORS_LOCK = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_executors)
+
+
+def configure(config_file: Path) -> None:
+    """
+    Configures the digest algorithm, the hashing threads and reads, the digest
+    cache and the .checksum sidecars, as set in the [hash] section of the
+    configuration file.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Raises:
+        ValueError: If the digest algorithm is not supported.
+    """
+    global _CACHE, _VERIFY, _DIGEST_ALGORITHM, _WORKERS
+    global _READ_SIDECARS, _WRITE_SIDECARS
+    global _BUFFER_SIZE, _DROP_CACHE, _ORDER_BY_INODE
+
+    hash_settings = get_settings(config_file).hash
+
+    # fail early on unsupported algorithms
+    get_hasher(hash_settings.digest_algorithm)
+
+    _CACHE = DigestCache(hash_settings.cache_file) if hash_settings.cache else None
+    _VERIFY = hash_settings.verify
+    _DIGEST_ALGORITHM = hash_settings.digest_algorithm
+    _WORKERS = hash_settings.workers
+    _READ_SIDECARS = hash_settings.read_sidecars
+    _WRITE_SIDECARS = hash_settings.write_sidecars
+    _BUFFER_SIZE = hash_settings.buffer_size
+    _DROP_CACHE = hash_settings.drop_cache
+    _ORDER_BY_INODE = hash_settings.order_by_inode
+
+    logger.info(
+        f"Digest algorithm: {_DIGEST_ALGORITHM} (hashing on {_WORKERS} threads, "
+        f"{_BUFFER_SIZE / 1024:.0f} KiB reads, drop page cache: {_DROP_CACHE}, "
+        f"inode order: {_ORDER_BY_INODE})"
+    )
+    if _CACHE is None:
+        logger.info("Digest cache disabled")
+    elif _VERIFY:
+        logger.info(f"Verifying cached digests against files: {_CACHE.path}")
+    else:
+        logger.info(f"Using digest cache: {_CACHE.path}")
+    logger.info(
+        f"Reading .checksum sidecars: {_READ_SIDECARS}, "
+        f"writing .checksum sidecars: {_WRITE_SIDECARS}"
+    )
+
+
+def get_digest_algorithm() -> str:
+    """
+    Returns the configured digest algorithm, stored next to the MD5 hash of files.
+    """
+    return _DIGEST_ALGORITHM
+
+
+def get_hasher(hash_type: str) -> Any:
+    """
+    Returns a new hash object, with the hashlib interface (update, hexdigest).
+
+    Args:
+        hash_type (str): The hash algorithm, e.g. 'md5', 'blake2b', 'blake3' or 'xxh3_128'.
+
+    Returns:
+        Any: The hash object.
+
+    Raises:
+        ValueError: If the algorithm is not supported, or its package is not installed.
+    """
+    if hash_type == "blake3":
+        if blake3 is None:
+            raise ValueError("The 'blake3' package is required for blake3 digests")
+        return blake3.blake3()
+
+    if hash_type in XXHASH_ALGORITHMS:
+        if xxhash is None:
+            raise ValueError(f"The 'xxhash' package is required for {hash_type} digests")
+        return getattr(xxhash, hash_type)()
+
+    try:
+        return hashlib.new(hash_type)
+    except ValueError as e:
+        raise ValueError(f"Unsupported hash algorithm: {hash_type}") from e
+
+
+def get_cache_stats() -> CacheStats:
+    """
+    Returns a copy of the digest cache counters of the current process.
+    """
+    with _STATS_LOCK:
+        return _STATS + CacheStats()
+
+
+def record_cache_stats(stats: CacheStats) -> None:
+    """
+    Adds counters (e.g. returned by a worker process) to the current process'.
+
+    Args:
+        stats (CacheStats): The counters to add.
+    """
+    global _STATS
+
+    with _STATS_LOCK:
+        _STATS = _STATS + stats
+
+
+def log_cache_stats(log: logging.Logger) -> None:
+    """
+    Logs the digest cache counters of the current process.
+
+    Args:
+        log (logging.Logger): The logger to log to.
+    """
+    if _CACHE is None and not _READ_SIDECARS:
+        return
+
+    stats = get_cache_stats()
+    log.info(f"Digest cache: {stats}")
+    if stats.mismatches:
+        log.error(f"{stats.mismatches} files did not match their cached digests")
+
+
+def _get_buffer() -> memoryview:
+    # one buffer per thread, reused for all the files it hashes
+    view: Optional[memoryview] = getattr(_BUFFERS, "view", None)
+    if view is None or len(view) != _BUFFER_SIZE:
+        view = memoryview(bytearray(_BUFFER_SIZE))
+        _BUFFERS.view = view
+    return view
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return  # not supported on this platform
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError as e:
+        logger.debug(f"posix_fadvise({advice_name}) failed: {e}")
+
+
+def _read_hashes(file_path: Path, hash_types: Sequence[str]) -> Dict[str, str]:
+    hashers = [get_hasher(hash_type) for hash_type in hash_types]
+
+    view = _get_buffer()
+    bytes_read = 0
+    with open(file_path, "rb", buffering=0) as file:
+        _fadvise(file.fileno(), "POSIX_FADV_SEQUENTIAL")
+        while True:
+            size = file.readinto(view)
+            if not size:
+                break
+            throttle.throttle(nbytes=size)
+            chunk = view[:size]
+            for hasher in hashers:
+                hasher.update(chunk)
+            bytes_read += size
+
+        if _DROP_CACHE:
+            _fadvise(file.fileno(), "POSIX_FADV_DONTNEED")
+
+    with _STATS_LOCK:
+        _STATS.bytes_read += bytes_read
+
+    return {
+        hash_type: hasher.hexdigest() for hash_type, hasher in zip(hash_types, hashers)
+    }
+
+
+def get_cached_hashes(
+    file_stat: os.stat_result, hash_types: Sequence[str]
+) -> Dict[str, str]:
+    """
+    Returns the cached digests of a file, without reading it.
+
+    Args:
+        file_stat (os.stat_result): The stat of the file.
+        hash_types (Sequence[str]): The hash algorithms.
+
+    Returns:
+        Dict[str, str]: The cached digests, by algorithm (empty if the cache
+            is disabled).
+    """
+    cache = _CACHE
+    if cache is None:
+        return {}
+
+    hashes: Dict[str, str] = {}
+    for hash_type in hash_types:
+        cached_hash = cache.get(file_stat, hash_type)
+        if cached_hash is not None:
+            hashes[hash_type] = cached_hash
+
+    return hashes
+
+
+def cache_hashes(
+    file_path: Path, file_stat: os.stat_result, hashes: Dict[str, str]
+) -> None:
+    """
+    Caches digests computed elsewhere, e.g. while copying a file.
+
+    Args:
+        file_path (Path): The path to the file.
+        file_stat (os.stat_result): The stat of the file.
+        hashes (Dict[str, str]): The digests, by algorithm.
+    """
+    cache = _CACHE
+    if cache is None:
+        return
+
+    for hash_type, hash_str in hashes.items():
+        cache.put(file_path, file_stat, hash_type, hash_str)
+
+
+def compute_hashes(file_path: Path, hash_types: Sequence[str]) -> Dict[str, str]:
+    """
+    Computes several hash digests of a file, reading it once.
+
+    The file is only read if some digests are neither cached nor in a trusted
+    .checksum sidecar, or if it was modified since (or always, in verify mode).
+
+    Args:
+        file_path (Path): The path to the file.
+        hash_types (Sequence[str]): The hash algorithms to use.
+
+    Returns:
+        Dict[str, str]: The digests, by algorithm.
+    """
+    hash_types = list(dict.fromkeys(hash_types))
+
+    cache = _CACHE
+    if cache is None and not _READ_SIDECARS and not _WRITE_SIDECARS:
+        return _read_hashes(file_path, hash_types)
+
+    throttle.throttle()
+    file_stat = os.stat(file_path)
+    cached_hashes: Dict[str, Optional[str]] = {
+        hash_type: cache.get(file_stat, hash_type) if cache is not None else None
+        for hash_type in hash_types
+    }
+    hashes = {
+        hash_type: cached_hash
+        for hash_type, cached_hash in cached_hashes.items()
+        if cached_hash is not None
+    }
+
+    if _VERIFY:
+        read_types = hash_types
+    else:
+        read_types = [hash_type for hash_type in hash_types if hash_type not in hashes]
+
+    sidecar_hashes: Dict[str, str] = {}
+    if read_types and _READ_SIDECARS and not _VERIFY:
+        sidecar_hashes = checksum.get_sidecar_hashes(file_path, file_stat, read_types)
+        hashes.update(sidecar_hashes)
+        read_types = [
+            hash_type for hash_type in read_types if hash_type not in sidecar_hashes
+        ]
+        if cache is not None:
+            for hash_type, hash_str in sidecar_hashes.items():
+                cache.put(file_path, file_stat, hash_type, hash_str)
+
+    if not read_types:
+        with _STATS_LOCK:
+            _STATS.hits += len(hash_types) - len(sidecar_hashes)
+            _STATS.sidecar_hits += len(sidecar_hashes)
+        return hashes
+
+    read_hashes = _read_hashes(file_path, read_types)
+    hashes.update(read_hashes)
+
+    with _STATS_LOCK:
+        _STATS.hits += len(hash_types) - len(sidecar_hashes) - len(read_types)
+        _STATS.sidecar_hits += len(sidecar_hashes)
+        for hash_type, hash_str in read_hashes.items():
+            cached_hash = cached_hashes[hash_type]
+            if cached_hash is None:
+                _STATS.misses += 1
+            elif cached_hash == hash_str:
+                _STATS.verified += 1
+            else:
+                _STATS.mismatches += 1
+
+    for hash_type, hash_str in read_hashes.items():
+        cached_hash = cached_hashes[hash_type]
+        if cached_hash is not None and cached_hash != hash_str:
+            logger.error(
+                f"{file_path} does not match its cached {hash_type} digest "
+                f"({cached_hash}), but was not modified: {hash_str}"
+            )
+
+    # Do not keep digests of files modified while they were read
+    throttle.throttle()
+    if DigestCache.get_key(os.stat(file_path)) == DigestCache.get_key(file_stat):
+        if cache is not None:
+            for hash_type, hash_str in read_hashes.items():
+                cache.put(file_path, file_stat, hash_type, hash_str)
+        if _WRITE_SIDECARS:
+            checksum.write_sidecar_hashes(file_path, file_stat, read_hashes)
+
+    return hashes
 
 
 def compute_hash(file_path: Path, hash_type: str = "md5") -> str:
@@ -17,8 +401,128 @@ def compute_hash(file_path: Path, hash_type: str = "md5") -> str:
     Returns:
         str: The computed hash digest of the file.
     """
+    return compute_hashes(file_path=file_path, hash_types=[hash_type])[hash_type]
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the process-wide hashing thread pool with `max_workers` threads,
+    creating it on first use.
+    """
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="hash"
+            )
+            _EXECUTORS[max_workers] = executor
+
+    return executor
+
+
+def _get_inode_order(inodes: Sequence[int]) -> List[int]:
+    return sorted(range(len(inodes)), key=lambda idx: inodes[idx])
+
+
+def hash_files(
+    file_paths: Sequence[Path],
+    hash_types: Sequence[str],
+    max_workers: Optional[int] = None,
+    inodes: Optional[Sequence[int]] = None,
+) -> List[Dict[str, str]]:
+    """
+    Computes several hash digests of many files, on a thread pool shared by
+    the calls of the process.
+
+    If configured, and if their inode numbers are given, files are hashed in
+    inode order, which mostly follows their order on disk. The read throughput
+    of the batch is logged (at debug level).
+
+    Args:
+        file_paths (Sequence[Path]): The paths to the files.
+        hash_types (Sequence[str]): The hash algorithms to use.
+        max_workers (Optional[int], optional): The number of threads.
+            Defaults to the configured number of hashing threads.
+        inodes (Optional[Sequence[int]], optional): The inode numbers of the
+            files, from their stats. Defaults to None (hashed in order).
+
+    Returns:
+        List[Dict[str, str]]: The digests of each file, by algorithm (in the
+            order of `file_paths`).
+    """
+    if max_workers is None:
+        max_workers = _WORKERS
+
+    if _ORDER_BY_INODE and inodes is not None and len(file_paths) > 1:
+        order = _get_inode_order(inodes)
+    else:
+        order = list(range(len(file_paths)))
+    ordered_paths = [file_paths[idx] for idx in order]
+
+    bytes_read = get_cache_stats().bytes_read
+    start = time.perf_counter()
+
+    if len(ordered_paths) <= 1 or max_workers <= 1:
+        ordered_hashes = [
+            compute_hashes(file_path, hash_types) for file_path in ordered_paths
+        ]
+    else:
+        executor = _get_executor(max_workers)
+        ordered_hashes = list(
+            executor.map(
+                lambda file_path: compute_hashes(file_path, hash_types),
+                ordered_paths,
+            )
+        )
+
+    elapsed_s = time.perf_counter() - start
+    # includes the reads of other threads of this process, if any
+    bytes_read = get_cache_stats().bytes_read - bytes_read
+    if bytes_read:
+        mib_read = bytes_read / 1024**2
+        logger.debug(
+            f"Hashed {len(file_paths)} files: {mib_read:.1f} MiB read in "
+            f"{elapsed_s:.2f}s ({mib_read / max(elapsed_s, 1e-9):.1f} MiB/s, "
+            f"{_BUFFER_SIZE / 1024:.0f} KiB reads)"
+        )
+
+    hashes: List[Dict[str, str]] = [{} for _ in file_paths]
+    for idx, file_hashes in zip(order, ordered_hashes):
+        hashes[idx] = file_hashes
+
+    return hashes
+
+
+def compute_sample_hash(
+    file_path: Path, sample_size: int = SAMPLE_SIZE, hash_type: str = "md5"
+) -> str:
+    """
+    Computes a cheap digest of a file: the hash of its size, and of its first and
+    last `sample_size` bytes. Files with different sample hashes differ; files
+    with the same sample hash must still be compared with compute_hash.
+
+    Args:
+        file_path (Path): The path to the file.
+        sample_size (int, optional): The number of bytes read at each end.
+            Defaults to SAMPLE_SIZE.
+        hash_type (str, optional): The hash algorithm to use. Defaults to 'md5'.
+
+    Returns:
+        str: The sample hash of the file.
+    """
+    hasher = get_hasher(hash_type)
+
     with open(file_path, "rb") as file:
-        file_hash = hashlib.file_digest(file, hash_type)
-        hash_str = file_hash.hexdigest()
+        file_size = os.fstat(file.fileno()).st_size
+        hasher.update(str(file_size).encode("utf-8"))
+        head = file.read(sample_size)
+        throttle.throttle(nbytes=len(head))
+        hasher.update(head)
+
+        if file_size > sample_size:
+            file.seek(max(sample_size, file_size - sample_size))
+            tail = file.read(sample_size)
+            throttle.throttle(nbytes=len(tail))
+            hasher.update(tail)
 
-    return hash_str
+    return hasher.hexdigest()
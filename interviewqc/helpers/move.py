@@ -0,0 +1,134 @@
+"""
+Moves files, computing their digests on the way.
+
+Within a filesystem, a file is renamed: no data is copied, and its digests
+are computed as usual (usually from the digest cache, as renaming keeps the
+cache key). Across filesystems, the source is copied through a buffer that
+also feeds the hashers, so that every byte is read once and written once.
+
+Kernel-side copies (copy_file_range, sendfile) are not used: the data would
+not pass through the hashers, and would have to be read again.
+"""
+
+import errno
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Sequence
+
+from interviewqc.helpers import throttle
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.helpers.digest_cache import DigestCache
+
+logger = logging.getLogger(__name__)
+
+# Size of the reads and writes of cross-filesystem copies
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class CopyVerificationError(Exception):
+    """
+    Raised when a copy does not match its source. The source is kept.
+    """
+
+
+def _copy_with_hashes(
+    source: Path, destination: Path, hash_types: Sequence[str]
+) -> Dict[str, str]:
+    source_stat = os.stat(source)
+    hashers = {
+        hash_type: hash_helpers.get_hasher(hash_type) for hash_type in hash_types
+    }
+
+    partial = destination.with_name(f".{destination.name}.partial")
+    buffer = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buffer)
+    bytes_copied = 0
+
+    try:
+        with open(source, "rb") as source_file, open(partial, "wb") as partial_file:
+            while True:
+                size = source_file.readinto(buffer)
+                if not size:
+                    break
+                throttle.throttle(nbytes=2 * size, ops=2)  # read and write
+                chunk = view[:size]
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+                partial_file.write(chunk)
+                bytes_copied += size
+
+            partial_file.flush()
+            os.fsync(partial_file.fileno())
+
+        hashes = {
+            hash_type: hasher.hexdigest() for hash_type, hasher in hashers.items()
+        }
+
+        # The source must not have changed while it was copied...
+        if DigestCache.get_key(os.stat(source)) != DigestCache.get_key(source_stat):
+            raise CopyVerificationError(f"{source} was modified while it was copied")
+        if bytes_copied != source_stat.st_size:
+            raise CopyVerificationError(
+                f"Copied {bytes_copied} bytes of {source} ({source_stat.st_size} bytes)"
+            )
+
+        # ...and must match its known digests (e.g. computed by the importers)
+        for hash_type, cached_hash in hash_helpers.get_cached_hashes(
+            source_stat, hash_types
+        ).items():
+            if cached_hash != hashes[hash_type]:
+                raise CopyVerificationError(
+                    f"Copy of {source} does not match its {hash_type} digest: "
+                    f"{hashes[hash_type]} != {cached_hash}"
+                )
+
+        shutil.copystat(source, partial)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    hash_helpers.cache_hashes(destination, os.stat(destination), hashes)
+    source.unlink()
+
+    return hashes
+
+
+def move_file(
+    source: Path, destination: Path, hash_types: Sequence[str]
+) -> Dict[str, str]:
+    """
+    Moves a file, and returns the digests of its content.
+
+    The destination directory must exist. An existing destination is replaced.
+
+    Args:
+        source (Path): The path to the file.
+        destination (Path): The new path of the file.
+        hash_types (Sequence[str]): The hash algorithms to use.
+
+    Returns:
+        Dict[str, str]: The digests of the file, by algorithm.
+
+    Raises:
+        CopyVerificationError: If a cross-filesystem copy does not match its
+            source (the source is kept, and the copy removed).
+    """
+    source = Path(source)
+    destination = Path(destination)
+
+    throttle.throttle()
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    else:
+        return hash_helpers.compute_hashes(file_path=destination, hash_types=hash_types)
+
+    logger.debug(f"Copying {source} to {destination} (across filesystems)")
+    return _copy_with_hashes(
+        source=source, destination=destination, hash_types=hash_types
+    )
@@ -0,0 +1,393 @@
+"""
+Collects per-statement latency statistics for the database helpers.
+
+Statements are grouped by shape: literals are replaced by placeholders, so that
+e.g. all `SELECT ... WHERE md5 = '...'` lookups are counted together.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+# Upper bounds (in milliseconds) of the latency histogram buckets
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+DEFAULT_SLOW_QUERY_MS = 1000.0
+SUMMARY_TOP_N = 15
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_KEYWORD_LITERAL = re.compile(r"\b(?:NULL|TRUE|FALSE)\b", re.IGNORECASE)
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Returns the shape of a SQL query, with string, numeric and boolean/NULL
+    literals replaced by '?', and lists of literals collapsed to '(...)'.
+
+    e.g. "SELECT * FROM files WHERE md5 = 'abc' AND file_size > 10"
+        -> "SELECT * FROM files WHERE md5 = ? AND file_size > ?"
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        str: The normalized query.
+    """
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _KEYWORD_LITERAL.sub("?", query)
+    query = _PLACEHOLDER_LIST.sub("(...)", query)
+    query = _WHITESPACE.sub(" ", query).strip()
+
+    return query
+
+
+class StatementStats:
+    """
+    Latency statistics for one statement shape.
+
+    Attributes:
+        statement (str): The normalized statement.
+        count (int): The number of executions.
+        total_s (float): The total execution time, in seconds.
+        min_s (float): The fastest execution, in seconds.
+        max_s (float): The slowest execution, in seconds.
+        histogram (List[int]): Execution counts per HISTOGRAM_BUCKETS_MS bucket,
+            with a final bucket for slower executions.
+    """
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_s = 0.0
+        self.min_s = float("inf")
+        self.max_s = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float) -> None:
+        """
+        Records one execution.
+
+        Args:
+            seconds (float): The execution time, in seconds.
+        """
+        self.count += 1
+        self.total_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+
+        milliseconds = seconds * 1000
+        for idx, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if milliseconds <= bound:
+                self.histogram[idx] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def copy(self) -> "StatementStats":
+        """
+        Returns a copy of the statistics.
+        """
+        stats = StatementStats(self.statement)
+        stats.merge(self)
+        return stats
+
+    def merge(self, other: "StatementStats") -> None:
+        """
+        Adds the executions of other statistics of the same statement.
+
+        Args:
+            other (StatementStats): The statistics to add.
+        """
+        self.count += other.count
+        self.total_s += other.total_s
+        self.min_s = min(self.min_s, other.min_s)
+        self.max_s = max(self.max_s, other.max_s)
+        self.histogram = [
+            count + other_count
+            for count, other_count in zip(self.histogram, other.histogram)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the statistics as a JSON-serializable dictionary.
+        """
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS]
+        labels.append(f">{HISTOGRAM_BUCKETS_MS[-1]}ms")
+
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": self.total_s * 1000,
+            "mean_ms": self.total_s * 1000 / self.count if self.count else 0.0,
+            "min_ms": self.min_s * 1000 if self.count else 0.0,
+            "max_ms": self.max_s * 1000,
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class QueryStats:
+    """
+    Thread-safe collection of StatementStats, keyed by statement shape.
+    """
+
+    def __init__(self):
+        self.statements: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"statements": self.statements}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.statements = state["statements"]
+        self._lock = threading.Lock()
+
+    def __sub__(self, other: "QueryStats") -> "QueryStats":
+        """
+        Returns the executions recorded since `other` was copied (see copy).
+
+        The minimum and maximum times are those of all the executions, as they
+        cannot be subtracted.
+        """
+        delta = QueryStats()
+        for stats in self.copy().statements.values():
+            previous = other.statements.get(stats.statement)
+            if previous is not None:
+                if stats.count == previous.count:
+                    continue
+                stats.count -= previous.count
+                stats.total_s -= previous.total_s
+                stats.histogram = [
+                    count - previous_count
+                    for count, previous_count in zip(
+                        stats.histogram, previous.histogram
+                    )
+                ]
+            delta.statements[stats.statement] = stats
+
+        return delta
+
+    def copy(self) -> "QueryStats":
+        """
+        Returns a copy of the statistics.
+        """
+        stats = QueryStats()
+        stats.merge(self)
+        return stats
+
+    def merge(self, other: "QueryStats") -> None:
+        """
+        Adds other statistics (e.g. returned by a worker process).
+
+        Args:
+            other (QueryStats): The statistics to add.
+        """
+        other_statements = [stats.copy() for stats in other.top()]
+        with self._lock:
+            for other_stats in other_statements:
+                stats = self.statements.get(other_stats.statement)
+                if stats is None:
+                    self.statements[other_stats.statement] = other_stats
+                else:
+                    stats.merge(other_stats)
+
+    def record(self, query: str, seconds: float) -> None:
+        """
+        Records one execution of a query.
+
+        Args:
+            query (str): The SQL query, with literals.
+            seconds (float): The execution time, in seconds.
+        """
+        statement = normalize_query(query)
+        with self._lock:
+            stats = self.statements.get(statement)
+            if stats is None:
+                stats = StatementStats(statement)
+                self.statements[statement] = stats
+            stats.record(seconds)
+
+    def top(self, n: Optional[int] = None) -> List[StatementStats]:
+        """
+        Returns the statements with the highest total execution time.
+
+        Args:
+            n (Optional[int], optional): The number of statements. Defaults to all.
+
+        Returns:
+            List[StatementStats]: The statements, slowest first.
+        """
+        with self._lock:
+            statements = sorted(
+                self.statements.values(), key=lambda s: s.total_s, reverse=True
+            )
+
+        if n is None:
+            return statements
+        return statements[:n]
+
+
+_STATS = QueryStats()
+_ENABLED = False
+_SLOW_QUERY_MS = DEFAULT_SLOW_QUERY_MS
+_REPORT_FILE: Optional[Path] = None
+
+
+def is_enabled() -> bool:
+    """
+    Returns whether query timing is enabled.
+    """
+    return _ENABLED
+
+
+def get_stats() -> QueryStats:
+    """
+    Returns the statistics collected by the current process.
+    """
+    return _STATS
+
+
+def record_stats(stats: QueryStats) -> None:
+    """
+    Adds statistics (e.g. returned by a worker process) to the current process'.
+
+    Args:
+        stats (QueryStats): The statistics to add.
+    """
+    _STATS.merge(stats)
+
+
+def configure(
+    enabled: bool,
+    slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+    slow_query_log: Optional[Path] = None,
+    report_file: Optional[Path] = None,
+) -> None:
+    """
+    Enables or disables query timing.
+
+    When enabled, queries slower than `slow_query_ms` are logged to `slow_query_log`,
+    and a summary is printed and written to `report_file` (as JSON) at exit.
+
+    Args:
+        enabled (bool): Whether to time queries.
+        slow_query_ms (float, optional): The slow query threshold, in milliseconds.
+            Defaults to DEFAULT_SLOW_QUERY_MS.
+        slow_query_log (Optional[Path], optional): The slow query log file. Defaults to None.
+        report_file (Optional[Path], optional): The JSON report file. Defaults to None.
+    """
+    global _ENABLED, _SLOW_QUERY_MS, _REPORT_FILE
+
+    _ENABLED = enabled
+    _SLOW_QUERY_MS = slow_query_ms
+    _REPORT_FILE = report_file
+
+    if enabled and slow_query_log is not None:
+        file_handler = logging.FileHandler(slow_query_log, mode="a")
+        file_handler.setLevel(logging.WARNING)
+        file_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(process)d - %(message)s")
+        )
+        slow_query_logger.addHandler(file_handler)
+
+
+@contextmanager
+def timed(query: str) -> Iterator[None]:
+    """
+    Times the statement executed within the `with` block, if query timing is enabled.
+
+    Args:
+        query (str): The SQL query being executed.
+    """
+    if not _ENABLED:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _STATS.record(query, seconds)
+
+        if seconds * 1000 >= _SLOW_QUERY_MS:
+            slow_query_logger.warning(
+                f"Slow query ({seconds * 1000:.1f} ms): {_WHITESPACE.sub(' ', query).strip()}"
+            )
+
+
+def print_summary(console: Console, n: int = SUMMARY_TOP_N) -> None:
+    """
+    Prints a table of the statements with the highest total execution time.
+
+    Args:
+        console (Console): The console to print to.
+        n (int, optional): The number of statements. Defaults to SUMMARY_TOP_N.
+    """
+    table = Table(title="Top SQL statements by total time")
+    table.add_column("Statement", overflow="fold")
+    table.add_column("Count", justify="right")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Mean (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+
+    for stats in _STATS.top(n):
+        table.add_row(
+            stats.statement[:200],
+            str(stats.count),
+            f"{stats.total_s:.2f}",
+            f"{stats.total_s * 1000 / stats.count:.1f}",
+            f"{stats.max_s * 1000:.1f}",
+        )
+
+    console.print(table)
+
+
+def write_report(report_file: Path) -> None:
+    """
+    Writes the collected statistics as JSON.
+
+    Args:
+        report_file (Path): The path to the JSON file.
+    """
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "pid": os.getpid(),
+        "slow_query_ms": _SLOW_QUERY_MS,
+        "statements": [stats.to_dict() for stats in _STATS.top()],
+    }
+
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    logger.info(f"Wrote query statistics to {report_file}")
+
+
+def _report_at_exit() -> None:
+    if not _ENABLED or not _STATS.statements:
+        return
+
+    print_summary(Console(color_system="standard"))
+    if _REPORT_FILE is not None:
+        write_report(_REPORT_FILE)
+
+
+atexit.register(_report_at_exit)
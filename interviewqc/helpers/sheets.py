@@ -11,7 +11,7 @@ from functools import lru_cache
 import gspread
 import pandas as pd
 
-from interviewqc.helpers.config import config
+from interviewqc.helpers.config import get_settings
 
 # Silence gspread logging
 logging.getLogger("googleapiclient.discovery_cache").setLevel(logging.ERROR)
@@ -58,12 +58,12 @@ def get_spreadsheet(config_file: Path) -> gspread.Spreadsheet:
         gspread.Spreadsheet: A Google Sheet object.
     """
 
-    config_params = config(config_file, "sheets")
-    service_account_file = config_params["service_account_file"]
-    sheet_id = config_params["sheet_id"]
+    sheets_settings = get_settings(config_file).sheets
 
-    service_account_key = gspread.service_account(filename=Path(service_account_file))
-    sheet = service_account_key.open_by_key(sheet_id)
+    service_account_key = gspread.service_account(
+        filename=sheets_settings.service_account_file
+    )
+    sheet = service_account_key.open_by_key(sheets_settings.sheet_id)
 
     return sheet
 
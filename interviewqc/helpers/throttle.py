@@ -0,0 +1,248 @@
+"""
+Token-bucket throttle of the filesystem I/O of the runners.
+
+The hashing, copying and scanning code paths call `throttle` before each read,
+write, stat or directory listing. Once `configure` is called with limits set in
+the [io] section of the configuration file, `throttle` sleeps as needed to keep
+the process under the bytes-per-second and operations-per-second limits, during
+the configured hours only (e.g. full speed at night).
+
+Limits apply per process: runners with worker processes pass their number of
+processes to `configure`, which splits the limits between them.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+from datetime import time as dtime
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from interviewqc.helpers.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ThrottleStats:
+    """
+    Counters of the throttled I/O.
+
+    Attributes:
+        bytes (int): Bytes read and written.
+        ops (int): Operations (reads, writes, stats and directory listings).
+        waits (int): Operations delayed by the throttle.
+        wait_s (float): Seconds spent waiting for the throttle.
+    """
+
+    bytes: int = 0
+    ops: int = 0
+    waits: int = 0
+    wait_s: float = 0.0
+
+    def __add__(self, other: "ThrottleStats") -> "ThrottleStats":
+        return ThrottleStats(
+            **{
+                field.name: getattr(self, field.name) + getattr(other, field.name)
+                for field in fields(self)
+            }
+        )
+
+    def __sub__(self, other: "ThrottleStats") -> "ThrottleStats":
+        return ThrottleStats(
+            **{
+                field.name: getattr(self, field.name) - getattr(other, field.name)
+                for field in fields(self)
+            }
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.bytes / 1024**2:.1f} MiB and {self.ops} operations, "
+            f"{self.waits} delayed, {self.wait_s:.1f}s waiting"
+        )
+
+
+class TokenBucket:
+    """
+    A token bucket: tokens are added at `rate` per second, up to `capacity`.
+
+    Taking more tokens than available puts the bucket in debt, and returns the
+    time until the debt is paid back; callers sleep for that long.
+
+    Attributes:
+        rate (float): The tokens added per second.
+        capacity (float): The maximum number of tokens (the burst size).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, amount: float) -> float:
+        """
+        Takes tokens from the bucket.
+
+        Args:
+            amount (float): The number of tokens.
+
+        Returns:
+            float: The seconds to wait before using the tokens.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+_BYTES_BUCKET: Optional[TokenBucket] = None
+_OPS_BUCKET: Optional[TokenBucket] = None
+_THROTTLE_HOURS: Tuple[Tuple[dtime, dtime], ...] = ()
+_STATS = ThrottleStats()
+_STATS_LOCK = threading.Lock()
+
+
+def is_in_hours(now: dtime, hours: Sequence[Tuple[dtime, dtime]]) -> bool:
+    """
+    Returns whether a time of day is within any of the time windows.
+
+    Args:
+        now (dtime): The time of day.
+        hours (Sequence[Tuple[dtime, dtime]]): The (start, end) of the windows.
+            A window with end <= start spans midnight.
+
+    Returns:
+        bool: True if the time is within a window.
+    """
+    for start, end in hours:
+        if start < end:
+            if start <= now < end:
+                return True
+        elif now >= start or now < end:
+            return True
+
+    return False
+
+
+def configure(config_file: Path, processes: int = 1) -> None:
+    """
+    Configures the I/O limits, as set in the [io] section of the configuration file.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+        processes (int, optional): The number of processes doing I/O at once
+            (e.g. forked from this one), which share the limits. Defaults to 1.
+    """
+    global _BYTES_BUCKET, _OPS_BUCKET, _THROTTLE_HOURS
+
+    io_settings = get_settings(config_file).io
+    processes = max(processes, 1)
+
+    _BYTES_BUCKET = None
+    if io_settings.max_mib_per_s > 0:
+        bytes_per_s = io_settings.max_mib_per_s * 1024**2 / processes
+        _BYTES_BUCKET = TokenBucket(
+            rate=bytes_per_s, capacity=bytes_per_s * io_settings.burst_s
+        )
+
+    _OPS_BUCKET = None
+    if io_settings.max_ops_per_s > 0:
+        ops_per_s = io_settings.max_ops_per_s / processes
+        _OPS_BUCKET = TokenBucket(
+            rate=ops_per_s, capacity=ops_per_s * io_settings.burst_s
+        )
+
+    _THROTTLE_HOURS = io_settings.throttle_hours
+
+    if _BYTES_BUCKET is None and _OPS_BUCKET is None:
+        logger.info("I/O throttle disabled")
+        return
+
+    hours = (
+        ", ".join(f"{start:%H:%M}-{end:%H:%M}" for start, end in _THROTTLE_HOURS)
+        or "always"
+    )
+    logger.info(
+        f"I/O throttle: {io_settings.max_mib_per_s or 'unlimited'} MiB/s, "
+        f"{io_settings.max_ops_per_s or 'unlimited'} ops/s "
+        f"(shared by {processes} processes), {hours}"
+    )
+
+
+def throttle(nbytes: int = 0, ops: int = 1) -> None:
+    """
+    Accounts for I/O about to be done, and sleeps if it exceeds the limits.
+
+    Does nothing if no limits are configured.
+
+    Args:
+        nbytes (int, optional): The number of bytes read or written. Defaults to 0.
+        ops (int, optional): The number of operations. Defaults to 1.
+    """
+    bytes_bucket = _BYTES_BUCKET
+    ops_bucket = _OPS_BUCKET
+    if bytes_bucket is None and ops_bucket is None:
+        return
+
+    wait_s = 0.0
+    if not _THROTTLE_HOURS or is_in_hours(datetime.now().time(), _THROTTLE_HOURS):
+        if bytes_bucket is not None and nbytes:
+            wait_s = bytes_bucket.take(nbytes)
+        if ops_bucket is not None and ops:
+            wait_s = max(wait_s, ops_bucket.take(ops))
+
+    if wait_s > 0:
+        time.sleep(wait_s)
+
+    with _STATS_LOCK:
+        _STATS.bytes += nbytes
+        _STATS.ops += ops
+        if wait_s > 0:
+            _STATS.waits += 1
+            _STATS.wait_s += wait_s
+
+
+def get_stats() -> ThrottleStats:
+    """
+    Returns a copy of the throttle counters of the current process.
+    """
+    with _STATS_LOCK:
+        return _STATS + ThrottleStats()
+
+
+def record_stats(stats: ThrottleStats) -> None:
+    """
+    Adds counters (e.g. returned by a worker process) to the current process'.
+
+    Args:
+        stats (ThrottleStats): The counters to add.
+    """
+    global _STATS
+
+    with _STATS_LOCK:
+        _STATS = _STATS + stats
+
+
+def log_stats(log: logging.Logger) -> None:
+    """
+    Logs the throttle counters of the current process, if throttling is enabled.
+
+    Args:
+        log (logging.Logger): The logger to log to.
+    """
+    if _BYTES_BUCKET is None and _OPS_BUCKET is None:
+        return
+
+    log.info(f"I/O throttle: {get_stats()}")
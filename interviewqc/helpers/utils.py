@@ -19,8 +19,8 @@ from rich.progress import (
 )
 import pandas as pd
 
-from interviewqc.helpers import cli
-from interviewqc.helpers.config import config
+from interviewqc.helpers import cli, query_stats
+from interviewqc.helpers.config import get_settings
 
 _console = Console(color_system="standard")
 
@@ -162,8 +162,8 @@ def configure_logging(config_file: Path, module_name: str, logger: logging.Logge
     Returns:
         None
     """
-    log_params = config(config_file, "logging")
-    log_file = log_params[module_name]
+    log_settings = get_settings(config_file).logging
+    log_file = log_settings.get_log_file(module_name)
 
     file_handler = logging.FileHandler(log_file, mode="a")
     file_handler.setLevel(logging.DEBUG)
@@ -177,6 +177,17 @@ def configure_logging(config_file: Path, module_name: str, logger: logging.Logge
 
     logger.info(f"Logging to {log_file}")
 
+    # Optional SQL statement timing, reported next to the log file
+    if log_settings.query_timing:
+        slow_query_ms = log_settings.slow_query_ms
+        query_stats.configure(
+            enabled=True,
+            slow_query_ms=slow_query_ms,
+            slow_query_log=log_file.with_suffix(".slow_queries.log"),
+            report_file=log_file.with_suffix(".queries.json"),
+        )
+        logger.info(f"Timing SQL queries (slow query threshold: {slow_query_ms} ms)")
+
 
 def get_config_file_path() -> Path:
     """
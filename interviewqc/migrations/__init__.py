@@ -0,0 +1,220 @@
+"""
+Versioned schema migrations.
+
+Each migration is a module in this package named vNNNN_<description>.py, defining:
+- VERSION (int): the schema version after the migration is applied
+- DESCRIPTION (str): a short description of the change
+- QUERIES (List[str]): the SQL statements that apply the change
+
+Migrations are applied in place, in order, each in its own transaction together
+with its row in the schema_version table. Applied migrations must never be edited:
+schema changes go into a new module, appended to MIGRATIONS.
+"""
+
+import logging
+from pathlib import Path
+from types import ModuleType
+from typing import List, Optional
+
+from rich.console import Console
+
+from interviewqc.helpers import db, query_stats
+from interviewqc.helpers.config import get_settings
+from interviewqc.migrations import (
+    v0001_baseline,
+    v0002_indexes,
+    v0003_directories,
+    v0004_surrogate_keys,
+    v0005_digest_algorithm,
+    v0006_moved_file_size,
+    v0007_subject_watermarks,
+    v0008_interview_naming,
+    v0009_query_batch_progress,
+    v0010_subject_watermark_consent,
+)
+from interviewqc.models.root import Root
+
+MIGRATIONS: List[ModuleType] = [
+    v0001_baseline,
+    v0002_indexes,
+    v0003_directories,
+    v0004_surrogate_keys,
+    v0005_digest_algorithm,
+    v0006_moved_file_size,
+    v0007_subject_watermarks,
+    v0008_interview_naming,
+    v0009_query_batch_progress,
+    v0010_subject_watermark_consent,
+]
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# Key of the advisory lock serializing concurrent upgrades
+MIGRATION_LOCK_ID = 738_201
+
+logger = logging.getLogger(__name__)
+
+
+def init_version_table_query() -> str:
+    """
+    Returns the SQL query to create the schema_version table.
+    """
+    sql_query = f"""
+    CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT now()
+    );
+    """
+
+    return sql_query
+
+
+def drop_version_table_query() -> str:
+    """
+    Returns the SQL query to drop the schema_version table.
+    """
+    sql_query = f"""
+    DROP TABLE IF EXISTS {SCHEMA_VERSION_TABLE};
+    """
+
+    return sql_query
+
+
+def get_latest_version() -> int:
+    """
+    Returns the schema version after all migrations are applied.
+    """
+    return MIGRATIONS[-1].VERSION
+
+
+def get_current_version(config_file: Path) -> int:
+    """
+    Returns the schema version of the database.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        int: The highest applied version, or 0 if no migration was applied.
+    """
+    query = f"""
+    SELECT COALESCE(MAX(version), 0)
+    FROM {SCHEMA_VERSION_TABLE};
+    """
+
+    with db.get_connection(config_file) as conn:
+        with conn.cursor() as cur:
+            cur.execute(init_version_table_query())
+            cur.execute(query)
+            version = cur.fetchone()[0]
+        conn.commit()
+
+    return version
+
+
+def get_root_paths(config_file: Path) -> List[Path]:
+    """
+    Returns the roots configured in the configuration file: data_root, and
+    backup_root if the [move] section is present.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        List[Path]: The root paths.
+    """
+    settings = get_settings(config_file)
+
+    root_paths = [settings.general.data_root]
+    if "move" in settings.sections:
+        root_paths.append(settings.move.backup_root)
+
+    return root_paths
+
+
+def register_roots(config_file: Path) -> None:
+    """
+    Registers the configured roots in the roots table, if it exists.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+    """
+    with db.get_connection(config_file) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('roots');")
+            if cur.fetchone()[0] is None:
+                conn.rollback()
+                return
+
+            cur.execute(f"SELECT pg_advisory_xact_lock({MIGRATION_LOCK_ID});")
+            for root_path in get_root_paths(config_file):
+                cur.execute(Root(root_path=root_path).to_sql())
+        conn.commit()
+
+
+def upgrade(config_file: Path, target: Optional[int] = None) -> int:
+    """
+    Applies all pending migrations up to `target`.
+
+    Concurrent upgrades are serialized with an advisory lock, and the schema version
+    is re-read under the lock, so each migration is applied exactly once.
+    The configured roots are registered before each migration, and after the last.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+        target (Optional[int], optional): The version to upgrade to. Defaults to
+            the latest version.
+
+    Returns:
+        int: The schema version after the upgrade.
+
+    Raises:
+        ValueError: If the target version does not exist.
+    """
+    console = Console(color_system="standard")
+
+    if target is None:
+        target = get_latest_version()
+    if target not in [migration.VERSION for migration in MIGRATIONS]:
+        raise ValueError(f"Unknown schema version: {target}")
+
+    version = get_current_version(config_file)
+    logger.info(f"Schema version: {version} (target: {target})")
+
+    for migration in MIGRATIONS:
+        if migration.VERSION <= version or migration.VERSION > target:
+            continue
+
+        register_roots(config_file)
+
+        with db.get_connection(config_file) as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT pg_advisory_xact_lock({MIGRATION_LOCK_ID});")
+                cur.execute(
+                    f"SELECT 1 FROM {SCHEMA_VERSION_TABLE} WHERE version = %s;",
+                    (migration.VERSION,),
+                )
+                if cur.fetchone() is not None:
+                    conn.rollback()
+                    continue
+
+                console.log(
+                    f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}"
+                )
+                for query in migration.QUERIES:
+                    with query_stats.timed(query):
+                        cur.execute(query)
+
+                cur.execute(
+                    f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) "
+                    "VALUES (%s, %s);",
+                    (migration.VERSION, migration.DESCRIPTION),
+                )
+            conn.commit()
+
+        logger.info(f"Applied migration {migration.VERSION}: {migration.DESCRIPTION}")
+
+    register_roots(config_file)
+
+    return max(version, target)
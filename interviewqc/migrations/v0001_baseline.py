@@ -0,0 +1,103 @@
+"""
+Baseline schema: the tables created by `init_db` before migrations were introduced.
+
+The statements are frozen copies of the models' `init_table_query`, with
+IF NOT EXISTS so that the baseline can be recorded on existing databases.
+Do not edit this file: schema changes go into a new migration.
+"""
+
+from typing import List
+
+VERSION = 1
+DESCRIPTION = "baseline schema"
+
+QUERIES: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS moved_files (
+        source_file_path TEXT NOT NULL,
+        destination_file_path TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        md5 TEXT NOT NULL,
+        PRIMARY KEY (source_file_path, destination_file_path)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        file_name TEXT NOT NULL,
+        file_type TEXT NOT NULL,
+        file_size FLOAT NOT NULL,
+        file_path TEXT PRIMARY KEY,
+        m_time TIMESTAMP NOT NULL,
+        md5 TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sites (
+        site_id TEXT PRIMARY KEY,
+        site_name TEXT NOT NULL,
+        country TEXT NOT NULL,
+        network TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS subjects (
+        subject_id TEXT PRIMARY KEY,
+        site_id TEXT NOT NULL,
+        consent_date TIMESTAMP NOT NULL,
+        FOREIGN KEY (site_id) REFERENCES sites (site_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS interviews (
+        subject_id TEXT NOT NULL REFERENCES subjects (subject_id),
+        days_since_consent INTEGER,
+        interview_path TEXT PRIMARY KEY,
+        interview_name TEXT NOT NULL UNIQUE,
+        interview_type TEXT NOT NULL,
+        interview_date TIMESTAMP,
+        has_additional_files BOOLEAN DEFAULT FALSE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS oosop_interviews (
+        subject_id TEXT NOT NULL REFERENCES subjects (subject_id),
+        days_since_consent INTEGER,
+        interview_path TEXT PRIMARY KEY,
+        interview_name TEXT NOT NULL,
+        interview_type TEXT NOT NULL,
+        interview_date TIMESTAMP,
+        note TEXT,
+        has_additional_files BOOLEAN DEFAULT FALSE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS interview_raw (
+        interview_name TEXT NOT NULL,
+        file_path TEXT NOT NULL PRIMARY KEY,
+        FOREIGN KEY (interview_name) REFERENCES interviews (interview_name),
+        FOREIGN KEY (file_path) REFERENCES files (file_path)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        transcript_path TEXT NOT NULL REFERENCES files (file_path),
+        interview_name TEXT NOT NULL REFERENCES interviews (interview_name),
+        PRIMARY KEY (transcript_path, interview_name)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS transcription_status (
+        subject_id TEXT NOT NULL,
+        study_id TEXT NOT NULL,
+        interview_type TEXT NOT NULL,
+        interview_name TEXT NOT NULL,
+        session INTEGER,
+        pipeline_status TEXT NOT NULL,
+        transcript_file_status TEXT NOT NULL,
+        qc_status TEXT NOT NULL,
+        interview_length_minutes REAL,
+        PRIMARY KEY (interview_name),
+        UNIQUE (subject_id, study_id, interview_type, session)
+    );
+    """,
+]
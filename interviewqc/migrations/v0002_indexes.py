@@ -0,0 +1,32 @@
+"""
+Secondary indexes for the hot lookups of the importers and the move scripts:
+
+- interviews by (subject_id, interview_type, days_since_consent), used to match
+  transcripts to interviews in `4_import_transcripts.get_interview_name`
+- moved_files by md5, used to find copies in `02_remove_duplicates`
+- interview_raw by interview_name, used to find interviews without imported
+  files in `3_import_interview_files.get_all_interview_paths`
+"""
+
+from typing import List
+
+VERSION = 2
+DESCRIPTION = "indexes for interview, moved file and raw file lookups"
+
+QUERIES: List[str] = [
+    """
+    CREATE INDEX IF NOT EXISTS interviews_subject_type_day_idx
+        ON interviews (subject_id, interview_type, days_since_consent);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS moved_files_md5_idx
+        ON moved_files (md5);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS interview_raw_interview_name_idx
+        ON interview_raw (interview_name);
+    """,
+    "ANALYZE interviews;",
+    "ANALYZE moved_files;",
+    "ANALYZE interview_raw;",
+]
@@ -0,0 +1,153 @@
+"""
+Normalized directory paths.
+
+Directories are stored once, as a path relative to the longest matching root
+(data_root, backup_root, or '' for any other absolute path), so that a path
+is always `root_path || relative_path`. Roots are registered from the
+configuration file by `migrations.upgrade`; registering a root moves the
+existing directories under it, so each directory is stored exactly once.
+
+SQL functions:
+- interviewqc_dirname(path), interviewqc_basename(path)
+- interviewqc_directory_id(directory_path): get or create a directory
+- interviewqc_path(directory_id, name): the absolute path of an entry
+- interviewqc_register_root(root_path): register a root
+"""
+
+from typing import List
+
+VERSION = 3
+DESCRIPTION = "roots and directories tables"
+
+QUERIES: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS roots (
+        root_id SERIAL PRIMARY KEY,
+        root_path TEXT NOT NULL UNIQUE
+    );
+    """,
+    """
+    INSERT INTO roots (root_path) VALUES ('')
+    ON CONFLICT (root_path) DO NOTHING;
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS directories (
+        directory_id SERIAL PRIMARY KEY,
+        root_id INTEGER NOT NULL REFERENCES roots (root_id),
+        relative_path TEXT NOT NULL,
+        UNIQUE (root_id, relative_path)
+    );
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_dirname(target_path TEXT)
+    RETURNS TEXT AS $$
+        SELECT regexp_replace(target_path, '/[^/]*$', '');
+    $$ LANGUAGE SQL IMMUTABLE STRICT;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_basename(target_path TEXT)
+    RETURNS TEXT AS $$
+        SELECT regexp_replace(target_path, '^.*/', '');
+    $$ LANGUAGE SQL IMMUTABLE STRICT;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_split_directory(directory_path TEXT)
+    RETURNS TABLE (root_id INTEGER, relative_path TEXT) AS $$
+        SELECT roots.root_id, substr(directory_path, length(roots.root_path) + 1)
+        FROM roots
+        WHERE directory_path = roots.root_path
+            OR left(directory_path, length(roots.root_path) + 1) = roots.root_path || '/'
+        ORDER BY length(roots.root_path) DESC
+        LIMIT 1;
+    $$ LANGUAGE SQL STABLE STRICT;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_directory_id(directory_path TEXT)
+    RETURNS INTEGER AS $$
+    DECLARE
+        dir_root_id INTEGER;
+        dir_relative_path TEXT;
+        dir_id INTEGER;
+    BEGIN
+        SELECT split.root_id, split.relative_path
+        INTO dir_root_id, dir_relative_path
+        FROM interviewqc_split_directory(directory_path) AS split;
+
+        IF dir_root_id IS NULL THEN
+            RAISE EXCEPTION 'Not an absolute path: %', directory_path;
+        END IF;
+
+        SELECT directories.directory_id INTO dir_id
+        FROM directories
+        WHERE directories.root_id = dir_root_id
+            AND directories.relative_path = dir_relative_path;
+
+        IF dir_id IS NULL THEN
+            INSERT INTO directories (root_id, relative_path)
+            VALUES (dir_root_id, dir_relative_path)
+            ON CONFLICT (root_id, relative_path) DO NOTHING
+            RETURNING directories.directory_id INTO dir_id;
+        END IF;
+
+        -- inserted by a concurrent transaction
+        IF dir_id IS NULL THEN
+            SELECT directories.directory_id INTO dir_id
+            FROM directories
+            WHERE directories.root_id = dir_root_id
+                AND directories.relative_path = dir_relative_path;
+        END IF;
+
+        RETURN dir_id;
+    END;
+    $$ LANGUAGE plpgsql VOLATILE STRICT;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_path(dir_id INTEGER, entry_name TEXT)
+    RETURNS TEXT AS $$
+        SELECT roots.root_path || directories.relative_path
+            || COALESCE('/' || NULLIF(entry_name, ''), '')
+        FROM directories
+        JOIN roots ON roots.root_id = directories.root_id
+        WHERE directories.directory_id = dir_id;
+    $$ LANGUAGE SQL STABLE;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_register_root(new_root_path TEXT)
+    RETURNS INTEGER AS $$
+    DECLARE
+        new_root_id INTEGER;
+    BEGIN
+        SELECT roots.root_id INTO new_root_id
+        FROM roots
+        WHERE roots.root_path = new_root_path;
+
+        IF new_root_id IS NOT NULL THEN
+            RETURN new_root_id;
+        END IF;
+
+        INSERT INTO roots (root_path) VALUES (new_root_path)
+        RETURNING roots.root_id INTO new_root_id;
+
+        -- move the directories below the new root from their shorter root
+        UPDATE directories
+        SET root_id = new_root_id,
+            relative_path = substr(
+                roots.root_path || directories.relative_path,
+                length(new_root_path) + 1
+            )
+        FROM roots
+        WHERE roots.root_id = directories.root_id
+            AND length(roots.root_path) < length(new_root_path)
+            AND (
+                roots.root_path || directories.relative_path = new_root_path
+                OR left(
+                    roots.root_path || directories.relative_path,
+                    length(new_root_path) + 1
+                ) = new_root_path || '/'
+            );
+
+        RETURN new_root_id;
+    END;
+    $$ LANGUAGE plpgsql VOLATILE STRICT;
+    """,
+]
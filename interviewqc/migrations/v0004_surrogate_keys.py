@@ -0,0 +1,180 @@
+"""
+Integer surrogate keys for files, interviews, interview_raw, transcripts and moved_files.
+
+Absolute paths are replaced by a directory_id (see v0003_directories) and the
+entry's name, and the tables referencing files and interviews join on integer ids:
+
+- files: file_id, UNIQUE (directory_id, file_name)
+- interviews: interview_id, UNIQUE (directory_id, path_name)
+- interview_raw: (interview_id, file_id)
+- transcripts: (file_id, interview_id)
+- moved_files: moved_file_id, source and destination (directory_id, name)
+
+Existing rows are converted in place. Dropped columns only release their space
+once the tables are rewritten, e.g. with VACUUM FULL.
+"""
+
+from typing import List
+
+VERSION = 4
+DESCRIPTION = "integer surrogate keys instead of path keys"
+
+QUERIES: List[str] = [
+    # files
+    """
+    ALTER TABLE files
+        ADD COLUMN file_id SERIAL,
+        ADD COLUMN directory_id INTEGER REFERENCES directories (directory_id);
+    """,
+    """
+    UPDATE files
+    SET directory_id = interviewqc_directory_id(interviewqc_dirname(file_path)),
+        file_name = interviewqc_basename(file_path);
+    """,
+    # interviews
+    """
+    ALTER TABLE interviews
+        ADD COLUMN interview_id SERIAL,
+        ADD COLUMN directory_id INTEGER REFERENCES directories (directory_id),
+        ADD COLUMN path_name TEXT;
+    """,
+    """
+    UPDATE interviews
+    SET directory_id = interviewqc_directory_id(interviewqc_dirname(interview_path)),
+        path_name = interviewqc_basename(interview_path);
+    """,
+    # interview_raw
+    """
+    ALTER TABLE interview_raw
+        ADD COLUMN interview_id INTEGER,
+        ADD COLUMN file_id INTEGER;
+    """,
+    """
+    UPDATE interview_raw
+    SET interview_id = interviews.interview_id,
+        file_id = files.file_id
+    FROM interviews, files
+    WHERE interviews.interview_name = interview_raw.interview_name
+        AND files.file_path = interview_raw.file_path;
+    """,
+    # transcripts
+    """
+    ALTER TABLE transcripts
+        ADD COLUMN file_id INTEGER,
+        ADD COLUMN interview_id INTEGER;
+    """,
+    """
+    UPDATE transcripts
+    SET file_id = files.file_id,
+        interview_id = interviews.interview_id
+    FROM files, interviews
+    WHERE files.file_path = transcripts.transcript_path
+        AND interviews.interview_name = transcripts.interview_name;
+    """,
+    # moved_files
+    """
+    ALTER TABLE moved_files
+        ADD COLUMN moved_file_id SERIAL,
+        ADD COLUMN source_directory_id INTEGER REFERENCES directories (directory_id),
+        ADD COLUMN source_name TEXT,
+        ADD COLUMN destination_directory_id INTEGER REFERENCES directories (directory_id),
+        ADD COLUMN destination_name TEXT;
+    """,
+    """
+    UPDATE moved_files
+    SET source_directory_id = interviewqc_directory_id(
+            interviewqc_dirname(source_file_path)
+        ),
+        source_name = interviewqc_basename(source_file_path),
+        destination_directory_id = interviewqc_directory_id(
+            interviewqc_dirname(destination_file_path)
+        ),
+        destination_name = interviewqc_basename(destination_file_path);
+    """,
+    # drop the path keys (and the constraints and indexes on them)
+    """
+    ALTER TABLE interview_raw
+        DROP COLUMN interview_name,
+        DROP COLUMN file_path;
+    """,
+    """
+    ALTER TABLE transcripts
+        DROP COLUMN transcript_path,
+        DROP COLUMN interview_name;
+    """,
+    "ALTER TABLE files DROP COLUMN file_path;",
+    "ALTER TABLE interviews DROP COLUMN interview_path;",
+    """
+    ALTER TABLE moved_files
+        DROP COLUMN source_file_path,
+        DROP COLUMN destination_file_path;
+    """,
+    # integer keys
+    """
+    ALTER TABLE files
+        ALTER COLUMN directory_id SET NOT NULL,
+        ADD PRIMARY KEY (file_id),
+        ADD UNIQUE (directory_id, file_name);
+    """,
+    """
+    ALTER TABLE interviews
+        ALTER COLUMN directory_id SET NOT NULL,
+        ALTER COLUMN path_name SET NOT NULL,
+        ADD PRIMARY KEY (interview_id),
+        ADD UNIQUE (directory_id, path_name);
+    """,
+    """
+    ALTER TABLE interview_raw
+        ALTER COLUMN interview_id SET NOT NULL,
+        ALTER COLUMN file_id SET NOT NULL,
+        ADD PRIMARY KEY (file_id),
+        ADD FOREIGN KEY (interview_id) REFERENCES interviews (interview_id),
+        ADD FOREIGN KEY (file_id) REFERENCES files (file_id);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS interview_raw_interview_id_idx
+        ON interview_raw (interview_id);
+    """,
+    """
+    ALTER TABLE transcripts
+        ALTER COLUMN file_id SET NOT NULL,
+        ALTER COLUMN interview_id SET NOT NULL,
+        ADD PRIMARY KEY (file_id, interview_id),
+        ADD FOREIGN KEY (file_id) REFERENCES files (file_id),
+        ADD FOREIGN KEY (interview_id) REFERENCES interviews (interview_id);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS transcripts_interview_id_idx
+        ON transcripts (interview_id);
+    """,
+    """
+    ALTER TABLE moved_files
+        ALTER COLUMN source_directory_id SET NOT NULL,
+        ALTER COLUMN source_name SET NOT NULL,
+        ALTER COLUMN destination_directory_id SET NOT NULL,
+        ALTER COLUMN destination_name SET NOT NULL,
+        ADD PRIMARY KEY (moved_file_id),
+        ADD UNIQUE (
+            source_directory_id, source_name,
+            destination_directory_id, destination_name
+        );
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_file_id(target_path TEXT)
+    RETURNS INTEGER AS $$
+        SELECT files.file_id
+        FROM interviewqc_split_directory(interviewqc_dirname(target_path)) AS split
+        JOIN directories
+            ON directories.root_id = split.root_id
+            AND directories.relative_path = split.relative_path
+        JOIN files
+            ON files.directory_id = directories.directory_id
+        WHERE files.file_name = interviewqc_basename(target_path);
+    $$ LANGUAGE SQL STABLE STRICT;
+    """,
+    "ANALYZE files;",
+    "ANALYZE interviews;",
+    "ANALYZE interview_raw;",
+    "ANALYZE transcripts;",
+    "ANALYZE moved_files;",
+]
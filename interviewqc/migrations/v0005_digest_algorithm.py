@@ -0,0 +1,37 @@
+"""
+Digests of files and moved files, with the name of their algorithm.
+
+files and moved_files keep their md5 column, and gain a digest computed with
+the configured algorithm ([hash] digest_algorithm, e.g. blake3 or xxh3_128),
+stored with its name in digest_algorithm. Existing rows get their MD5 hash.
+"""
+
+from typing import List
+
+VERSION = 5
+DESCRIPTION = "digest and digest_algorithm columns on files and moved_files"
+
+QUERIES: List[str] = [
+    """
+    ALTER TABLE files
+        ADD COLUMN digest TEXT,
+        ADD COLUMN digest_algorithm TEXT;
+    """,
+    "UPDATE files SET digest = md5, digest_algorithm = 'md5';",
+    """
+    ALTER TABLE files
+        ALTER COLUMN digest SET NOT NULL,
+        ALTER COLUMN digest_algorithm SET NOT NULL;
+    """,
+    """
+    ALTER TABLE moved_files
+        ADD COLUMN digest TEXT,
+        ADD COLUMN digest_algorithm TEXT;
+    """,
+    "UPDATE moved_files SET digest = md5, digest_algorithm = 'md5';",
+    """
+    ALTER TABLE moved_files
+        ALTER COLUMN digest SET NOT NULL,
+        ALTER COLUMN digest_algorithm SET NOT NULL;
+    """,
+]
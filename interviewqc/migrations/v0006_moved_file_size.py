@@ -0,0 +1,15 @@
+"""
+Size of moved files, used by `02_remove_duplicates` to only hash the files
+whose size matches a moved file.
+
+Existing rows keep a NULL size: the duplicate finder stats their destination.
+"""
+
+from typing import List
+
+VERSION = 6
+DESCRIPTION = "file_size column on moved_files"
+
+QUERIES: List[str] = [
+    "ALTER TABLE moved_files ADD COLUMN file_size BIGINT;",
+]
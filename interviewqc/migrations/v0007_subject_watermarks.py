@@ -0,0 +1,20 @@
+"""
+Watermarks of subject directories, used by `2_import_interviews --incremental`
+to skip the subjects whose directories did not change since the last import.
+"""
+
+from typing import List
+
+VERSION = 7
+DESCRIPTION = "subject_watermarks table"
+
+QUERIES: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS subject_watermarks (
+        subject_path TEXT PRIMARY KEY,
+        subject_id TEXT NOT NULL,
+        m_time_ns BIGINT NOT NULL,
+        updated_at TIMESTAMP NOT NULL DEFAULT now()
+    );
+    """,
+]
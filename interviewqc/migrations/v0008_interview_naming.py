@@ -0,0 +1,52 @@
+"""
+Interview naming in SQL, used to name staged interviews set-based
+(see Interview.from_scan_staging_query) instead of one interview at a time.
+
+The functions match their Python counterparts:
+- interviewqc_days_since_consent(consent_date, event_date):
+    data.compute_days_since_consent (consent day is day 1)
+- interviewqc_dpdash_timepoint(consent_date, event_date):
+    dpdash.get_dpdash_timepoint (e.g. day0032)
+- interviewqc_interview_name(subject_id, interview_type, timepoint):
+    dpdash.get_dpdash_name of an interview (e.g. YA-YA00001-interview_open-day0032)
+"""
+
+from typing import List
+
+VERSION = 8
+DESCRIPTION = "interview naming functions"
+
+QUERIES: List[str] = [
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_days_since_consent(
+        consent_date TIMESTAMP, event_date TIMESTAMP
+    )
+    RETURNS INTEGER AS $$
+        SELECT floor(extract(epoch FROM event_date - consent_date) / 86400)::INTEGER + 1;
+    $$ LANGUAGE SQL IMMUTABLE STRICT;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_dpdash_timepoint(
+        consent_date TIMESTAMP, event_date TIMESTAMP
+    )
+    RETURNS TEXT AS $$
+        SELECT CASE
+            WHEN consent_date = event_date THEN 'day0001'
+            ELSE 'day' || lpad(days::TEXT, greatest(4, length(days::TEXT)), '0')
+        END
+        FROM (
+            SELECT abs(floor(extract(epoch FROM consent_date - event_date) / 86400))::BIGINT
+                AS days
+        ) AS elapsed;
+    $$ LANGUAGE SQL IMMUTABLE STRICT;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION interviewqc_interview_name(
+        subject_id TEXT, interview_type TEXT, timepoint TEXT
+    )
+    RETURNS TEXT AS $$
+        SELECT left(subject_id, 2) || '-' || subject_id || '-interview'
+            || COALESCE('_' || NULLIF(interview_type, ''), '') || '-' || timepoint;
+    $$ LANGUAGE SQL IMMUTABLE STRICT;
+    """,
+]
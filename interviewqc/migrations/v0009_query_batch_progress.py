@@ -0,0 +1,26 @@
+"""
+Progress of the query batches executed in chunks by `db.execute_queries`
+(with chunk_size), so that an interrupted batch resumes after its committed
+chunks, and retries the queries that failed in them.
+"""
+
+from typing import List
+
+VERSION = 9
+DESCRIPTION = "query_batch_progress table"
+
+QUERIES: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS query_batch_progress (
+        batch_id TEXT PRIMARY KEY,
+        chunk_size INTEGER NOT NULL,
+        chunks_committed INTEGER NOT NULL,
+        queries_count INTEGER NOT NULL,
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+    """,
+    """
+    ALTER TABLE query_batch_progress
+    ADD COLUMN IF NOT EXISTS failed_queries INTEGER[] NOT NULL DEFAULT '{}';
+    """,
+]
@@ -0,0 +1,20 @@
+"""
+Consent dates of the subjects in their watermarks, so that the subjects whose
+consent date changed since their interviews were last imported (and named) are
+not skipped by `2_import_interviews --incremental`.
+
+Watermarks recorded before have no consent date: their subjects are scanned
+once more.
+"""
+
+from typing import List
+
+VERSION = 10
+DESCRIPTION = "consent date of subject watermarks"
+
+QUERIES: List[str] = [
+    """
+    ALTER TABLE subject_watermarks
+    ADD COLUMN IF NOT EXISTS consent_date TIMESTAMP;
+    """,
+]
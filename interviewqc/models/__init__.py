@@ -22,44 +22,49 @@ from typing import List
 
 
 from interviewqc.helpers import db
+from interviewqc import migrations
+from interviewqc.models.directory import Directory
 from interviewqc.models.file import File
 from interviewqc.models.moved_file import MovedFile
 from interviewqc.models.site import Site
 from interviewqc.models.subject import Subject
+from interviewqc.models.subject_watermark import SubjectWatermark
 from interviewqc.models.interview import Interview
 from interviewqc.models.interview_raw import InterviewRaw
 from interviewqc.models.oosop_interviews import OutOfSopInterview
+from interviewqc.models.root import Root
 from interviewqc.models.transcripts import Transcript
 from interviewqc.models.transcription_status import TranscriptionStatus
 
 
 def init_db(config_file: Path):
+    """
+    Drops all tables, and recreates them at the latest schema version.
+
+    Use `migrations.upgrade` to update the schema of an existing database
+    without losing data.
+
+    Args:
+        config_file (Path): The path to the configuration file.
+    """
     drop_queries: List[str] = [
         Transcript.drop_table_query(),
         InterviewRaw.drop_table_query(),
         OutOfSopInterview.drop_table_query(),
         Interview.drop_table_query(),
+        SubjectWatermark.drop_table_query(),
         Subject.drop_table_query(),
         Site.drop_table_query(),
         File.drop_table_query(),
         MovedFile.drop_table_query(),
 
         TranscriptionStatus.drop_table_query(),
+        Directory.drop_table_query(),
+        Root.drop_table_query(),
+        db.drop_batch_progress_table_query(),
+        migrations.drop_version_table_query(),
     ]
 
-    init_quries = [
-        MovedFile.init_table_query(),
-        File.init_table_query(),
-        Site.init_table_query(),
-        Subject.init_table_query(),
-        Interview.init_table_query(),
-        OutOfSopInterview.init_table_query(),
-        InterviewRaw.init_table_query(),
-        Transcript.init_table_query(),
-
-        TranscriptionStatus.init_table_query(),
-    ]
-
-    sql_queries = drop_queries + init_quries
+    db.execute_queries(config_file=config_file, queries=drop_queries)
 
-    db.execute_queries(config_file=config_file, queries=sql_queries)
+    migrations.upgrade(config_file=config_file)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import sys
+from pathlib import Path
+
+file = Path(__file__).resolve()
+parent = file.parent
+root = None
+for parent in file.parents:
+    if parent.name == "ampscz-interview-qc":
+        root = parent
+sys.path.append(str(root))
+
+# remove current directory from path
+try:
+    sys.path.remove(str(parent))
+except ValueError:
+    pass
+
+from typing import List
+
+
+class Directory:
+    """
+    Represents a directory, stored once as a path relative to its root.
+
+    Tables referencing files by path store the directory_id of the parent
+    directory and the name of the entry instead of the absolute path.
+    Use the SQL function interviewqc_path(directory_id, name) to get the
+    absolute path back.
+    """
+
+    @staticmethod
+    def init_table_query() -> str:
+        """
+        Get the SQL query to create the 'directories' table.
+
+        Returns:
+            str: The SQL query to create the 'directories' table.
+        """
+        sql_query = """
+        CREATE TABLE directories (
+            directory_id SERIAL PRIMARY KEY,
+            root_id INTEGER NOT NULL REFERENCES roots (root_id),
+            relative_path TEXT NOT NULL,
+            UNIQUE (root_id, relative_path)
+        );
+        """
+
+        return sql_query
+
+    @staticmethod
+    def drop_table_query() -> str:
+        """
+        Get the SQL query to drop the 'directories' table.
+
+        Returns:
+            str: The SQL query to drop the 'directories' table.
+        """
+        sql_query = """
+        DROP TABLE IF EXISTS directories;
+        """
+
+        return sql_query
+
+    @staticmethod
+    def staged_directories_query(staging_table: str, path_columns: List[str]) -> str:
+        """
+        Get the SQL query resolving the directory_id of the parent directory of every
+        path in a staging table, creating the missing directories.
+
+        The directory is looked up once per distinct parent directory, instead of
+        once per row. Join the result on
+        `directory_path = interviewqc_dirname(<path column>)`.
+
+        Args:
+            staging_table (str): The name of the staging table.
+            path_columns (List[str]): The columns of the staging table holding paths.
+
+        Returns:
+            str: A query returning the (directory_path, directory_id) pairs.
+        """
+        staged_paths = "\n                UNION ALL\n                ".join(
+            f"SELECT interviewqc_dirname({path_column}) AS directory_path "
+            f"FROM {staging_table}"
+            for path_column in path_columns
+        )
+
+        sql_query = f"""
+        SELECT directory_path, interviewqc_directory_id(directory_path) AS directory_id
+        FROM (
+            SELECT DISTINCT directory_path
+            FROM (
+                {staged_paths}
+            ) AS staged_paths
+        ) AS staged_directories
+        """
+
+        return sql_query
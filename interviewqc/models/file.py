@@ -17,16 +17,25 @@ try:
 except ValueError:
     pass
 
+import os
 from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from interviewqc.helpers import db
-from interviewqc.helpers.hash import compute_hash
+import numpy as np
+from rich.console import Console
+
+from interviewqc.helpers import db, throttle
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.models.directory import Directory
 
 
 class File:
     """
     Represents a file.
 
+    The digests of a file are computed on first access of `md5` or `digest`,
+    unless passed in (e.g. computed for many files at once, see FileBatch).
+
     Attributes:
         file_name (str): The name of the file.
         file_type (str): The type of the file.
@@ -34,8 +43,20 @@ class File:
         file_path (Path): The path to the file.
         m_time (datetime): The modification time of the file.
         md5 (str): The MD5 hash of the file.
+        digest (str): The digest of the file, computed with digest_algorithm.
+        digest_algorithm (str): The configured digest algorithm (see hash.configure).
     """
 
+    __slots__ = (
+        "file_name",
+        "file_type",
+        "file_size",
+        "file_path",
+        "m_time",
+        "digest_algorithm",
+        "_digests",
+    )
+
     def __init__(
         self,
         file_name: str,
@@ -43,6 +64,7 @@ class File:
         file_size: float,
         file_path: Path,
         m_time: datetime,
+        digests: Optional[Dict[str, str]] = None,
     ):
         """
         Initialize a File object.
@@ -53,13 +75,43 @@ class File:
             file_size (float): The size of the file in bytes.
             file_path (Path): The path to the file.
             m_time (datetime): The modification time of the file.
+            digests (Optional[Dict[str, str]], optional): The digests of the file by
+                algorithm, e.g. from hash.hash_files. Defaults to None (computed
+                on first access).
         """
         self.file_name = file_name
         self.file_type = file_type
         self.file_size = file_size
         self.file_path = file_path
         self.m_time = m_time
-        self.md5 = compute_hash(file_path=file_path, hash_type="md5")
+
+        self.digest_algorithm = hash_helpers.get_digest_algorithm()
+        self._digests = digests
+
+    @property
+    def digests(self) -> Dict[str, str]:
+        """
+        Return the digests of the file by algorithm, computing them if needed.
+        """
+        if self._digests is None:
+            self._digests = hash_helpers.compute_hashes(
+                file_path=self.file_path, hash_types=File.hash_types()
+            )
+        return self._digests
+
+    @property
+    def md5(self) -> str:
+        """
+        Return the MD5 hash of the file.
+        """
+        return self.digests["md5"]
+
+    @property
+    def digest(self) -> str:
+        """
+        Return the digest of the file, computed with digest_algorithm.
+        """
+        return self.digests[self.digest_algorithm]
 
     def __str__(self):
         """
@@ -74,6 +126,13 @@ class File:
         """
         return self.__str__()
 
+    @staticmethod
+    def hash_types() -> List[str]:
+        """
+        Return the hash algorithms of the digests stored for each file.
+        """
+        return ["md5", hash_helpers.get_digest_algorithm()]
+
     @staticmethod
     def init_table_query() -> str:
         """
@@ -81,12 +140,16 @@ class File:
         """
         sql_query = """
         CREATE TABLE files (
+            file_id SERIAL PRIMARY KEY,
+            directory_id INTEGER NOT NULL REFERENCES directories (directory_id),
             file_name TEXT NOT NULL,
             file_type TEXT NOT NULL,
             file_size FLOAT NOT NULL,
-            file_path TEXT PRIMARY KEY,
             m_time TIMESTAMP NOT NULL,
-            md5 TEXT NOT NULL
+            md5 TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            digest_algorithm TEXT NOT NULL,
+            UNIQUE (directory_id, file_name)
         );
         """
 
@@ -107,34 +170,405 @@ class File:
         """
         Return the SQL query to insert the File object into the 'files' table.
         """
-        f_name = db.santize_string(self.file_name)
-        f_path = db.santize_string(str(self.file_path))
+        f_dir = db.santize_string(str(self.file_path.parent))
+        f_name = db.santize_string(self.file_path.name)
 
         sql_query = f"""
-        INSERT INTO files (file_name, file_type, file_size,
-            file_path, m_time, md5)
-        VALUES ('{f_name}', '{self.file_type}', '{self.file_size}',
-            '{f_path}', '{self.m_time}', '{self.md5}');
+        INSERT INTO files (directory_id, file_name, file_type, file_size,
+            m_time, md5, digest, digest_algorithm)
+        VALUES (interviewqc_directory_id('{f_dir}'), '{f_name}', '{self.file_type}',
+            '{self.file_size}', '{self.m_time}', '{self.md5}',
+            '{self.digest}', '{self.digest_algorithm}');
         """
 
         return sql_query
 
     @staticmethod
-    def from_path(file_path: Path) -> "File":
-        file_path = file_path
-        file_name = file_path.name
-        file_type = file_path.suffix.lower()
-        file_size = file_path.stat().st_size
-        file_size_mb = file_size / 1024 / 1024
-
-        m_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-
-        file = File(
-            file_name=file_name,
-            file_type=file_type,
-            file_size=file_size_mb,
+    def copy_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table used by db.copy_models.
+        """
+        return {
+            "file_path": "TEXT",
+            "file_type": "TEXT",
+            "file_size": "FLOAT",
+            "m_time": "TIMESTAMP",
+            "md5": "TEXT",
+            "digest": "TEXT",
+            "digest_algorithm": "TEXT",
+        }
+
+    @staticmethod
+    def upsert_clause() -> str:
+        """
+        Return the ON CONFLICT clause updating a file imported before (with the
+        same path), if it was modified since.
+        """
+        sql_query = """
+        ON CONFLICT (directory_id, file_name) DO UPDATE
+        SET file_type = EXCLUDED.file_type,
+            file_size = EXCLUDED.file_size,
+            m_time = EXCLUDED.m_time,
+            md5 = EXCLUDED.md5,
+            digest = EXCLUDED.digest,
+            digest_algorithm = EXCLUDED.digest_algorithm
+        WHERE (files.file_type, files.file_size, files.m_time, files.md5,
+            files.digest, files.digest_algorithm)
+            IS DISTINCT FROM (EXCLUDED.file_type, EXCLUDED.file_size,
+                EXCLUDED.m_time, EXCLUDED.md5, EXCLUDED.digest,
+                EXCLUDED.digest_algorithm)
+        """
+
+        return sql_query
+
+    @staticmethod
+    def from_staging_query(staging_table: str, upsert: bool = False) -> str:
+        """
+        Return the SQL query to move staged File rows into the 'files' table.
+
+        Files imported before are skipped, or updated if `upsert` is set (see
+        File.upsert_clause).
+        """
+        conflict_clause = (
+            File.upsert_clause()
+            if upsert
+            else "ON CONFLICT (directory_id, file_name) DO NOTHING"
+        )
+        staged_directories = Directory.staged_directories_query(
+            staging_table=staging_table, path_columns=["file_path"]
+        )
+
+        sql_query = f"""
+        WITH staged_directories AS ({staged_directories})
+        INSERT INTO files (directory_id, file_name, file_type, file_size,
+            m_time, md5, digest, digest_algorithm)
+        SELECT staged_directories.directory_id, interviewqc_basename(staged.file_path),
+            staged.file_type, staged.file_size, staged.m_time, staged.md5,
+            staged.digest, staged.digest_algorithm
+        FROM {staging_table} AS staged
+        JOIN staged_directories
+            ON staged_directories.directory_path = interviewqc_dirname(staged.file_path)
+        {conflict_clause};
+        """
+
+        return sql_query
+
+    @staticmethod
+    def delete_copy_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table of the files to
+        delete (see File.delete_staged_query).
+        """
+        return {"file_path": "TEXT"}
+
+    @staticmethod
+    def delete_staged_query(staging_table: str) -> str:
+        """
+        Return the SQL query to delete the staged files (e.g. removed from the
+        filesystem) from the 'files' table, with their interview_raw and
+        transcripts rows.
+        """
+        sql_query = f"""
+        WITH removed_files AS (
+            SELECT interviewqc_file_id(staged.file_path) AS file_id
+            FROM {staging_table} AS staged
+        ), removed_interview_raw AS (
+            DELETE FROM interview_raw
+            WHERE file_id IN (SELECT file_id FROM removed_files)
+        ), removed_transcripts AS (
+            DELETE FROM transcripts
+            WHERE file_id IN (SELECT file_id FROM removed_files)
+        )
+        DELETE FROM files
+        WHERE file_id IN (SELECT file_id FROM removed_files);
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        """
+        Return the File object as a row of the staging table.
+        """
+        return (
+            str(self.file_path),
+            self.file_type,
+            self.file_size,
+            self.m_time,
+            self.md5,
+            self.digest,
+            self.digest_algorithm,
+        )
+
+    @staticmethod
+    def from_stat(
+        file_path: Path,
+        file_stat: os.stat_result,
+        digests: Optional[Dict[str, str]] = None,
+    ) -> "File":
+        """
+        Return a File object from the stat of the file, without reading it.
+
+        Args:
+            file_path (Path): The path to the file.
+            file_stat (os.stat_result): The stat of the file.
+            digests (Optional[Dict[str, str]], optional): The digests of the file
+                by algorithm. Defaults to None (computed on first access).
+
+        Returns:
+            File: The File object.
+        """
+        file_path = Path(file_path)
+
+        return File(
+            file_name=file_path.name,
+            file_type=file_path.suffix.lower(),
+            file_size=file_stat.st_size / 1024 / 1024,
             file_path=file_path,
-            m_time=m_time,
+            m_time=datetime.fromtimestamp(file_stat.st_mtime),
+            digests=digests,
+        )
+
+    @staticmethod
+    def from_path(
+        file_path: Path, digests: Optional[Dict[str, str]] = None
+    ) -> "File":
+        """
+        Return a File object from the path to the file (stat'ed once).
+
+        Args:
+            file_path (Path): The path to the file.
+            digests (Optional[Dict[str, str]], optional): The digests of the file
+                by algorithm. Defaults to None (computed on first access).
+
+        Returns:
+            File: The File object.
+        """
+        return File.from_stat(
+            file_path=file_path, file_stat=os.stat(file_path), digests=digests
         )
 
-        return file
+
+class FileBatch:
+    """
+    Many files, stored column-wise in arrays instead of as File objects.
+
+    Digests are computed for the whole batch at once, on the hashing thread
+    pool (see hash.hash_files), and the batch is loaded into the 'files' table
+    without creating a File object per file.
+
+    Attributes:
+        file_paths (np.ndarray): The paths to the files (str).
+        file_sizes (np.ndarray): The sizes of the files in bytes (int64).
+        m_times_ns (np.ndarray): The modification times of the files in ns (int64).
+        inodes (Optional[np.ndarray]): The inode numbers of the files (uint64), used
+            to hash them in inode order (see hash.hash_files), if known.
+        md5s (np.ndarray): The MD5 hashes of the files (str, None if not computed).
+        digests (np.ndarray): The digests of the files, computed with
+            digest_algorithm (str, None if not computed).
+        digest_algorithm (str): The configured digest algorithm (see hash.configure).
+    """
+
+    __slots__ = (
+        "file_paths",
+        "file_sizes",
+        "m_times_ns",
+        "inodes",
+        "md5s",
+        "digests",
+        "digest_algorithm",
+    )
+
+    def __init__(
+        self,
+        file_paths: Sequence[Union[str, Path]],
+        file_sizes: Sequence[int],
+        m_times_ns: Sequence[int],
+        inodes: Optional[Sequence[int]] = None,
+    ):
+        """
+        Initialize a FileBatch object, without digests.
+
+        Args:
+            file_paths (Sequence[Union[str, Path]]): The paths to the files.
+            file_sizes (Sequence[int]): The sizes of the files in bytes.
+            m_times_ns (Sequence[int]): The modification times of the files in ns.
+            inodes (Optional[Sequence[int]], optional): The inode numbers of the
+                files. Defaults to None.
+        """
+        count = len(file_paths)
+        self.file_paths = np.empty(count, dtype=object)
+        self.file_paths[:] = [str(file_path) for file_path in file_paths]
+        self.file_sizes = np.asarray(file_sizes, dtype=np.int64)
+        self.m_times_ns = np.asarray(m_times_ns, dtype=np.int64)
+        self.inodes = None if inodes is None else np.asarray(inodes, dtype=np.uint64)
+        self.md5s = np.full(count, None, dtype=object)
+        self.digests = np.full(count, None, dtype=object)
+        self.digest_algorithm = hash_helpers.get_digest_algorithm()
+
+    def __len__(self) -> int:
+        return len(self.file_paths)
+
+    @staticmethod
+    def from_stats(
+        file_paths: Sequence[Path], file_stats: Sequence[os.stat_result]
+    ) -> "FileBatch":
+        """
+        Return a FileBatch from the stats of the files.
+
+        Args:
+            file_paths (Sequence[Path]): The paths to the files.
+            file_stats (Sequence[os.stat_result]): The stats of the files.
+
+        Returns:
+            FileBatch: The files.
+        """
+        return FileBatch(
+            file_paths=file_paths,
+            file_sizes=[file_stat.st_size for file_stat in file_stats],
+            m_times_ns=[file_stat.st_mtime_ns for file_stat in file_stats],
+            inodes=[file_stat.st_ino for file_stat in file_stats],
+        )
+
+    @staticmethod
+    def from_paths(file_paths: Sequence[Path]) -> "FileBatch":
+        """
+        Return a FileBatch from the paths to the files (each stat'ed once).
+
+        Args:
+            file_paths (Sequence[Path]): The paths to the files.
+
+        Returns:
+            FileBatch: The files.
+        """
+        file_stats: List[os.stat_result] = []
+        for file_path in file_paths:
+            throttle.throttle()
+            file_stats.append(os.stat(file_path))
+
+        return FileBatch.from_stats(file_paths=file_paths, file_stats=file_stats)
+
+    @staticmethod
+    def from_dir_entries(entries: Sequence[os.DirEntry]) -> "FileBatch":
+        """
+        Return a FileBatch from os.scandir entries (each stat'ed once).
+
+        Args:
+            entries (Sequence[os.DirEntry]): The directory entries of the files.
+
+        Returns:
+            FileBatch: The files.
+        """
+        file_stats: List[os.stat_result] = []
+        for entry in entries:
+            throttle.throttle()
+            file_stats.append(entry.stat())
+
+        return FileBatch.from_stats(
+            file_paths=[entry.path for entry in entries], file_stats=file_stats
+        )
+
+    def total_size(self) -> int:
+        """
+        Return the total size of the files in bytes.
+        """
+        return int(self.file_sizes.sum())
+
+    def compute_digests(self, max_workers: Optional[int] = None) -> None:
+        """
+        Compute the digests of the files that do not have them yet, on the
+        hashing thread pool.
+
+        Args:
+            max_workers (Optional[int], optional): The number of threads.
+                Defaults to the configured number of hashing threads.
+        """
+        missing = np.flatnonzero([md5 is None for md5 in self.md5s])
+        if len(missing) == 0:
+            return
+
+        files_digests = hash_helpers.hash_files(
+            file_paths=self.file_paths[missing].tolist(),
+            hash_types=File.hash_types(),
+            max_workers=max_workers,
+            inodes=None if self.inodes is None else self.inodes[missing].tolist(),
+        )
+        self.md5s[missing] = [digests["md5"] for digests in files_digests]
+        self.digests[missing] = [
+            digests[self.digest_algorithm] for digests in files_digests
+        ]
+
+    def _get_digests(self, idx: int) -> Optional[Dict[str, str]]:
+        md5 = self.md5s[idx]
+        if md5 is None:
+            return None
+        return {"md5": md5, self.digest_algorithm: self.digests[idx]}
+
+    def to_files(self) -> List[File]:
+        """
+        Return the files as File objects (with their digests, if computed).
+        """
+        files: List[File] = []
+        for idx, file_path in enumerate(self.file_paths):
+            file_path = Path(file_path)
+            files.append(
+                File(
+                    file_name=file_path.name,
+                    file_type=file_path.suffix.lower(),
+                    file_size=int(self.file_sizes[idx]) / 1024 / 1024,
+                    file_path=file_path,
+                    m_time=datetime.fromtimestamp(int(self.m_times_ns[idx]) / 1e9),
+                    digests=self._get_digests(idx),
+                )
+            )
+
+        return files
+
+    def to_copy_rows(self) -> Iterator[Tuple]:
+        """
+        Return the files as rows of the File staging table (see File.to_copy_row).
+
+        Digests are computed first, if needed.
+        """
+        self.compute_digests()
+
+        file_sizes_mb = self.file_sizes / 1024 / 1024
+        for idx, file_path in enumerate(self.file_paths):
+            yield (
+                file_path,
+                os.path.splitext(file_path)[1].lower(),
+                float(file_sizes_mb[idx]),
+                datetime.fromtimestamp(int(self.m_times_ns[idx]) / 1e9),
+                self.md5s[idx],
+                self.digests[idx],
+                self.digest_algorithm,
+            )
+
+    def copy(self, config_file: Path, silent: bool = False) -> int:
+        """
+        Bulk loads the files into the 'files' table with COPY (see db.copy_models).
+
+        Args:
+            config_file (Path): The path to the configuration file.
+            silent (bool, optional): Whether to suppress output. Defaults to False.
+
+        Returns:
+            int: The number of rows inserted in the 'files' table.
+        """
+        if len(self) == 0:
+            return 0
+
+        staging_table = "file_staging"
+        copied, inserted = db.copy_rows(
+            config_file=config_file,
+            staging_table=staging_table,
+            columns=File.copy_columns(),
+            rows=self.to_copy_rows(),
+            from_staging_query=File.from_staging_query(staging_table),
+        )
+
+        if not silent:
+            Console(color_system="standard").log(
+                f"Copied {copied} File row(s), inserted {inserted}."
+            )
+
+        return inserted
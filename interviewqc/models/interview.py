@@ -18,9 +18,15 @@ except ValueError:
     pass
 
 from datetime import datetime
-from typing import Optional
+from typing import Collection, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
 
 from interviewqc.helpers import db
+from interviewqc.models.directory import Directory
+from interviewqc.models.oosop_interviews import OutOfSopInterview
 
 
 class Interview:
@@ -67,13 +73,16 @@ class Interview:
     def init_table_query() -> str:
         sql_query = """
         CREATE TABLE interviews (
+            interview_id SERIAL PRIMARY KEY,
             subject_id TEXT NOT NULL REFERENCES subjects (subject_id),
             days_since_consent INTEGER,
-            interview_path TEXT PRIMARY KEY,
+            directory_id INTEGER NOT NULL REFERENCES directories (directory_id),
+            path_name TEXT NOT NULL,
             interview_name TEXT NOT NULL UNIQUE,
             interview_type TEXT NOT NULL,
             interview_date TIMESTAMP,
-            has_additional_files BOOLEAN DEFAULT FALSE
+            has_additional_files BOOLEAN DEFAULT FALSE,
+            UNIQUE (directory_id, path_name)
         );
         """
 
@@ -88,7 +97,8 @@ class Interview:
         return sql_query
 
     def to_sql(self) -> str:
-        i_path = db.santize_string(str(self.interview_path))
+        i_dir = db.santize_string(str(self.interview_path.parent))
+        i_path_name = db.santize_string(self.interview_path.name)
         i_name = db.santize_string(self.interview_name)
 
         if self.interview_date is None:
@@ -103,12 +113,748 @@ class Interview:
             self.has_additional_files = False
 
         sql_query = f"""
-        INSERT INTO interviews (interview_path, interview_name, interview_type, \
+        INSERT INTO interviews (directory_id, path_name, interview_name, interview_type, \
             interview_date, subject_id, days_since_consent, has_additional_files)
-        VALUES ('{i_path}', '{i_name}', '{self.interview_type}', \
-            '{i_date}', '{self.subject_id}', {self.days_since_consent}, {self.has_additional_files});
+        VALUES (interviewqc_directory_id('{i_dir}'), '{i_path_name}', '{i_name}', \
+            '{self.interview_type}', '{i_date}', '{self.subject_id}', \
+            {self.days_since_consent}, {self.has_additional_files})
+        {Interview.upsert_clause()};
         """
 
         sql_query = db.handle_null(sql_query)
 
         return sql_query
+
+    @staticmethod
+    def upsert_clause() -> str:
+        """
+        Returns the ON CONFLICT clause updating an interview imported before
+        (with the same path), if any of its columns changed.
+        """
+        sql_query = """
+        ON CONFLICT (directory_id, path_name) DO UPDATE
+        SET interview_name = EXCLUDED.interview_name,
+            interview_type = EXCLUDED.interview_type,
+            interview_date = EXCLUDED.interview_date,
+            subject_id = EXCLUDED.subject_id,
+            days_since_consent = EXCLUDED.days_since_consent,
+            has_additional_files = EXCLUDED.has_additional_files
+        WHERE (interviews.interview_name, interviews.interview_type,
+            interviews.interview_date, interviews.subject_id,
+            interviews.days_since_consent, interviews.has_additional_files)
+            IS DISTINCT FROM (EXCLUDED.interview_name, EXCLUDED.interview_type,
+            EXCLUDED.interview_date, EXCLUDED.subject_id,
+            EXCLUDED.days_since_consent, EXCLUDED.has_additional_files)
+        """
+
+        return sql_query
+
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        """
+        Returns the columns of the staging table of interviews (see
+        from_staging_query). A note marks Out-of-SOP interviews.
+        """
+        return {
+            "interview_path": "TEXT",
+            "interview_name": "TEXT",
+            "interview_type": "TEXT",
+            "interview_date": "TIMESTAMP",
+            "subject_id": "TEXT",
+            "days_since_consent": "INTEGER",
+            "has_additional_files": "BOOLEAN",
+            "note": "TEXT",
+        }
+
+    @staticmethod
+    def duplicate_condition(
+        staging_table: str, subjects_table: Optional[str] = None
+    ) -> str:
+        """
+        Returns the SQL condition of the staged interviews (aliased 'staged')
+        whose name is used by another interview staged along, or imported
+        before for a subject that is not staged again (see from_staging_query).
+
+        The interviews imported before for the subjects of `subjects_table` are
+        replaced by the staged ones, so only the names of the staged interviews
+        count for these subjects, not the stored ones.
+
+        Args:
+            staging_table (str): The name of the staging table.
+            subjects_table (Optional[str], optional): The name of the table of
+                the subject IDs whose interviews are all staged. Defaults to None.
+        """
+        if subjects_table is None:
+            replaced_condition = "FALSE"
+        else:
+            replaced_condition = f"""existing.subject_id IN (
+                        SELECT subject_id FROM {subjects_table}
+                    )"""
+
+        sql_condition = f"""(
+            EXISTS (
+                SELECT 1 FROM {staging_table} AS other
+                WHERE other.interview_name = staged.interview_name
+                    AND other.interview_path <> staged.interview_path
+                    AND other.note IS NULL
+            )
+            OR EXISTS (
+                SELECT 1 FROM interviews AS existing
+                WHERE existing.interview_name = staged.interview_name
+                    AND interviewqc_path(existing.directory_id, existing.path_name) \
+                        <> staged.interview_path
+                    AND NOT {replaced_condition}
+            )
+        )"""
+
+        return sql_condition
+
+    @staticmethod
+    def subjects_table(staging_table: str) -> str:
+        """
+        Returns the name of the temporary table of the subject IDs whose
+        interviews are all in a staging table of interviews (see
+        from_staging_query).
+        """
+        return f"{staging_table}_subjects"
+
+    @staticmethod
+    def create_subjects_table_query(staging_table: str) -> str:
+        """
+        Returns the SQL query creating the temporary table of the subject IDs
+        whose interviews are all staged (see subjects_table), dropped on commit.
+        Execute it with the subject IDs as the parameter.
+        """
+        sql_query = f"""
+        CREATE TEMP TABLE {Interview.subjects_table(staging_table)} ON COMMIT DROP AS
+        SELECT DISTINCT unnest(%s::TEXT[]) AS subject_id;
+        """
+
+        return sql_query
+
+    @staticmethod
+    def from_staging_query(
+        staging_table: str, subjects_table: Optional[str] = None
+    ) -> str:
+        """
+        Returns the SQL query moving staged interviews into the 'interviews' and
+        'oosop_interviews' tables.
+
+        Interviews imported before (with the same path) are updated. Interviews
+        whose name is already used (see duplicate_condition) get the note
+        'Duplicate Interview Name', and interviews with a note are moved into
+        'oosop_interviews' instead.
+
+        With `subjects_table`, the staged interviews replace all the interviews
+        of its subjects: the interviews (with their interview_raw and
+        transcripts rows) and Out-of-SOP interviews of these subjects that were
+        not staged, or are now routed to the other table, are deleted first.
+
+        Args:
+            staging_table (str): The name of the staging table (see copy_columns).
+            subjects_table (Optional[str], optional): The name of the table of
+                the subject IDs whose interviews are all staged (see
+                create_subjects_table_query). Defaults to None.
+        """
+        staged_directories = Directory.staged_directories_query(
+            staging_table=staging_table, path_columns=["interview_path"]
+        )
+
+        is_duplicate = Interview.duplicate_condition(staging_table, subjects_table)
+
+        sql_query = f"""
+        UPDATE {staging_table} AS staged
+        SET note = 'Duplicate Interview Name'
+        WHERE staged.note IS NULL AND {is_duplicate};
+        """
+
+        if subjects_table is not None:
+            replaced_table = f"{staging_table}_replaced"
+            sql_query += f"""
+        CREATE TEMP TABLE {replaced_table} ON COMMIT DROP AS
+        SELECT interviews.interview_id,
+            interviewqc_path(interviews.directory_id, interviews.path_name) \
+                AS interview_path,
+            interviews.interview_name
+        FROM interviews
+        WHERE interviews.subject_id IN (SELECT subject_id FROM {subjects_table});
+
+        WITH removed_interviews AS (
+            SELECT replaced.interview_id
+            FROM {replaced_table} AS replaced
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {staging_table} AS staged
+                WHERE staged.interview_path = replaced.interview_path
+                    AND staged.note IS NULL
+            )
+        ), removed_interview_raw AS (
+            DELETE FROM interview_raw
+            WHERE interview_id IN (SELECT interview_id FROM removed_interviews)
+        ), removed_transcripts AS (
+            DELETE FROM transcripts
+            WHERE interview_id IN (SELECT interview_id FROM removed_interviews)
+        )
+        DELETE FROM interviews
+        WHERE interview_id IN (SELECT interview_id FROM removed_interviews);
+
+        DELETE FROM oosop_interviews
+        WHERE oosop_interviews.subject_id IN (SELECT subject_id FROM {subjects_table})
+            AND NOT EXISTS (
+                SELECT 1 FROM {staging_table} AS staged
+                WHERE staged.interview_path = oosop_interviews.interview_path
+                    AND staged.note IS NOT NULL
+            );
+
+        -- renamed interviews release their names first, as the new names may
+        -- still be held by other interviews of the subjects (e.g. after a
+        -- consent date change)
+        UPDATE interviews
+        SET interview_name = '~' || interviews.interview_id
+        FROM {replaced_table} AS replaced
+        JOIN {staging_table} AS staged
+            ON staged.interview_path = replaced.interview_path
+                AND staged.note IS NULL
+        WHERE interviews.interview_id = replaced.interview_id
+            AND interviews.interview_name <> staged.interview_name;
+        """
+
+        sql_query += f"""
+        INSERT INTO oosop_interviews (interview_path, interview_name, interview_type, \
+            interview_date, subject_id, note, \
+            days_since_consent, has_additional_files)
+        SELECT staged.interview_path, staged.interview_name, staged.interview_type, \
+            staged.interview_date, staged.subject_id, staged.note, \
+            staged.days_since_consent, COALESCE(staged.has_additional_files, FALSE)
+        FROM {staging_table} AS staged
+        WHERE staged.note IS NOT NULL
+        {OutOfSopInterview.upsert_clause()};
+
+        WITH staged_directories AS ({staged_directories})
+        INSERT INTO interviews (directory_id, path_name, interview_name, interview_type, \
+            interview_date, subject_id, days_since_consent, has_additional_files)
+        SELECT staged_directories.directory_id, interviewqc_basename(staged.interview_path), \
+            staged.interview_name, staged.interview_type, staged.interview_date, \
+            staged.subject_id, staged.days_since_consent, \
+            COALESCE(staged.has_additional_files, FALSE)
+        FROM {staging_table} AS staged
+        JOIN staged_directories
+            ON staged_directories.directory_path = interviewqc_dirname(staged.interview_path)
+        WHERE staged.note IS NULL
+        {Interview.upsert_clause()};
+        """
+
+        return sql_query
+
+    @staticmethod
+    def scan_copy_columns() -> Dict[str, str]:
+        """
+        Returns the columns of the staging table of interviews that are not named
+        yet (see from_scan_staging_query). A note marks Out-of-SOP interviews.
+        """
+        return {
+            "interview_path": "TEXT",
+            "interview_type": "TEXT",
+            "interview_date": "TIMESTAMP",
+            "subject_id": "TEXT",
+            "has_additional_files": "BOOLEAN",
+            "note": "TEXT",
+        }
+
+    @staticmethod
+    def named_staging_table(staging_table: str) -> str:
+        """
+        Returns the name of the temporary table of the named interviews of a
+        staging table of interviews that are not named yet (see
+        from_scan_staging_query).
+        """
+        return f"{staging_table}_named"
+
+    @staticmethod
+    def from_scan_staging_query(
+        staging_table: str, subjects_table: Optional[str] = None
+    ) -> str:
+        """
+        Returns the SQL query naming staged interviews, and moving them into the
+        'interviews' and 'oosop_interviews' tables.
+
+        The days since consent, the timepoint and the name of all the staged
+        interviews are computed at once, joined against 'subjects' (see
+        migrations.v0008_interview_naming), into a temporary table (see
+        named_staging_table) that is dropped on commit, and moved as by
+        from_staging_query, which routes the duplicates.
+
+        Args:
+            staging_table (str): The name of the staging table (see
+                scan_copy_columns).
+            subjects_table (Optional[str], optional): The name of the table of
+                the subject IDs whose interviews are all staged (see
+                from_staging_query). Defaults to None.
+        """
+        named_table = Interview.named_staging_table(staging_table)
+
+        sql_query = f"""
+        DO $$
+        DECLARE
+            missing_subject_id TEXT;
+        BEGIN
+            SELECT staged.subject_id INTO missing_subject_id
+            FROM {staging_table} AS staged
+            LEFT JOIN subjects ON subjects.subject_id = staged.subject_id
+            WHERE staged.interview_date IS NOT NULL
+                AND subjects.consent_date IS NULL
+            LIMIT 1;
+
+            IF missing_subject_id IS NOT NULL THEN
+                RAISE EXCEPTION 'Subject % has no consent date', missing_subject_id;
+            END IF;
+        END;
+        $$;
+
+        CREATE TEMP TABLE {named_table} ON COMMIT DROP AS
+        SELECT staged.interview_path,
+            interviewqc_interview_name(
+                staged.subject_id, staged.interview_type,
+                COALESCE(
+                    interviewqc_dpdash_timepoint(
+                        subjects.consent_date, staged.interview_date
+                    ),
+                    'day0'
+                )
+            ) AS interview_name,
+            staged.interview_type, staged.interview_date, staged.subject_id,
+            interviewqc_days_since_consent(
+                subjects.consent_date, staged.interview_date
+            ) AS days_since_consent,
+            staged.has_additional_files, staged.note
+        FROM {staging_table} AS staged
+        LEFT JOIN subjects ON subjects.subject_id = staged.subject_id;
+
+        {Interview.from_staging_query(named_table, subjects_table)}
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        return (
+            str(self.interview_path),
+            self.interview_name,
+            self.interview_type,
+            self.interview_date,
+            self.subject_id,
+            self.days_since_consent,
+            self.has_additional_files,
+            None,
+        )
+
+
+class InterviewTable:
+    """
+    Many interviews and Out-of-SOP interviews, stored column-wise in arrays
+    instead of as Interview and OutOfSopInterview objects.
+
+    Interviews with a note are Out-of-SOP interviews. Duplicates are detected and
+    reclassified for the whole table at once, and the table is loaded into the
+    'interviews' and 'oosop_interviews' tables without creating an object per
+    interview.
+
+    Attributes:
+        interview_paths (np.ndarray): The paths to the interviews (str).
+        interview_names (np.ndarray): The names of the interviews (str).
+        interview_types (np.ndarray): The types of the interviews (str).
+        subject_ids (np.ndarray): The IDs of the subjects (str).
+        interview_dates (np.ndarray): The dates of the interviews
+            (datetime64[ns], NaT if unknown).
+        days_since_consent (np.ndarray): The days since consent of the interviews
+            (float64, NaN if unknown).
+        has_additional_files (np.ndarray): Whether the interviews have additional
+            files (bool).
+        notes (np.ndarray): The reason an interview is Out-of-SOP (str), or None
+            for (in-SOP) interviews.
+    """
+
+    __slots__ = (
+        "interview_paths",
+        "interview_names",
+        "interview_types",
+        "subject_ids",
+        "interview_dates",
+        "days_since_consent",
+        "has_additional_files",
+        "notes",
+    )
+
+    def __init__(
+        self,
+        interview_paths: Sequence[Union[str, Path]],
+        interview_names: Sequence[str],
+        interview_types: Sequence[str],
+        subject_ids: Sequence[str],
+        interview_dates: Sequence[Optional[datetime]],
+        days_since_consent: Sequence[Optional[int]],
+        has_additional_files: Sequence[bool],
+        notes: Sequence[Optional[str]],
+    ):
+        """
+        Initialize an InterviewTable object.
+
+        Args:
+            interview_paths (Sequence[Union[str, Path]]): The paths to the interviews.
+            interview_names (Sequence[str]): The names of the interviews.
+            interview_types (Sequence[str]): The types of the interviews.
+            subject_ids (Sequence[str]): The IDs of the subjects.
+            interview_dates (Sequence[Optional[datetime]]): The dates of the interviews.
+            days_since_consent (Sequence[Optional[int]]): The days since consent.
+            has_additional_files (Sequence[bool]): Whether the interviews have
+                additional files.
+            notes (Sequence[Optional[str]]): The reason each interview is
+                Out-of-SOP, or None.
+        """
+        self.interview_paths = InterviewTable._to_object_array(
+            [str(interview_path) for interview_path in interview_paths]
+        )
+        self.interview_names = InterviewTable._to_object_array(interview_names)
+        self.interview_types = InterviewTable._to_object_array(interview_types)
+        self.subject_ids = InterviewTable._to_object_array(subject_ids)
+        self.interview_dates = pd.to_datetime(
+            pd.Series(interview_dates, dtype=object)
+        ).to_numpy(dtype="datetime64[ns]")
+        self.days_since_consent = np.array(
+            [np.nan if days is None else days for days in days_since_consent],
+            dtype=np.float64,
+        )
+        self.has_additional_files = np.asarray(has_additional_files, dtype=bool)
+        self.notes = InterviewTable._to_object_array(notes)
+
+    @staticmethod
+    def _to_object_array(values: Sequence) -> np.ndarray:
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+        return array
+
+    def __len__(self) -> int:
+        return len(self.interview_paths)
+
+    def __str__(self) -> str:
+        return (
+            f"InterviewTable({self.count_interviews()} interviews, "
+            f"{len(self) - self.count_interviews()} Out-of-SOP interviews)"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @staticmethod
+    def _from_arrays(**arrays: np.ndarray) -> "InterviewTable":
+        table = InterviewTable.__new__(InterviewTable)
+        for name in InterviewTable.__slots__:
+            setattr(table, name, arrays[name])
+        return table
+
+    @staticmethod
+    def concat(tables: Sequence["InterviewTable"]) -> "InterviewTable":
+        """
+        Return the interviews of many tables, in order.
+
+        Args:
+            tables (Sequence[InterviewTable]): The tables.
+
+        Returns:
+            InterviewTable: The interviews.
+        """
+        if len(tables) == 0:
+            return InterviewTableBuilder().build()
+
+        return InterviewTable._from_arrays(
+            **{
+                name: np.concatenate([getattr(table, name) for table in tables])
+                for name in InterviewTable.__slots__
+            }
+        )
+
+    def take(self, indices: np.ndarray) -> "InterviewTable":
+        """
+        Return the interviews at the given positions (or where a mask is True).
+
+        Args:
+            indices (np.ndarray): The positions, or a boolean mask.
+
+        Returns:
+            InterviewTable: The interviews.
+        """
+        return InterviewTable._from_arrays(
+            **{name: getattr(self, name)[indices] for name in InterviewTable.__slots__}
+        )
+
+    def get_interviews_mask(self) -> np.ndarray:
+        """
+        Return a boolean mask of the (in-SOP) interviews, i.e. without a note.
+        """
+        return np.equal(self.notes, None)
+
+    def count_interviews(self) -> int:
+        """
+        Return the number of (in-SOP) interviews.
+        """
+        return int(self.get_interviews_mask().sum())
+
+    def get_duplicates_mask(self) -> np.ndarray:
+        """
+        Return a boolean mask of the (in-SOP) interviews whose name is shared
+        with another (in-SOP) interview of the table.
+        """
+        interviews_mask = self.get_interviews_mask()
+        names = pd.Series(self.interview_names).where(interviews_mask)
+
+        return interviews_mask & names.duplicated(keep=False).to_numpy()
+
+    def route_duplicates(self, note: str = "Duplicate Interview Name") -> int:
+        """
+        Reclassify the interviews with duplicate names as Out-of-SOP interviews.
+
+        Args:
+            note (str, optional): The note of the duplicates.
+                Defaults to 'Duplicate Interview Name'.
+
+        Returns:
+            int: The number of duplicates.
+        """
+        duplicates_mask = self.get_duplicates_mask()
+        self.notes[duplicates_mask] = note
+
+        return int(duplicates_mask.sum())
+
+    def _get_days_since_consent(self) -> List[Optional[int]]:
+        return [
+            None if np.isnan(days) else int(days)
+            for days in self.days_since_consent.tolist()
+        ]
+
+    def _get_interview_dates(self) -> List[Optional[datetime]]:
+        # datetime64[us] converts to datetime objects (and NaT to None)
+        return self.interview_dates.astype("datetime64[us]").tolist()
+
+    def to_copy_rows(self) -> Iterator[Tuple]:
+        """
+        Return the interviews and Out-of-SOP interviews as rows of the Interview
+        staging table (see Interview.copy_columns).
+        """
+        return zip(
+            self.interview_paths.tolist(),
+            self.interview_names.tolist(),
+            self.interview_types.tolist(),
+            self._get_interview_dates(),
+            self.subject_ids.tolist(),
+            self._get_days_since_consent(),
+            self.has_additional_files.tolist(),
+            self.notes.tolist(),
+        )
+
+    def _get_subject_ids(
+        self, subject_ids: Optional[Collection[str]]
+    ) -> List[str]:
+        if subject_ids is None:
+            return pd.unique(self.subject_ids).tolist()
+        return list(subject_ids)
+
+    def copy(
+        self,
+        config_file: Path,
+        subject_ids: Optional[Collection[str]] = None,
+        silent: bool = False,
+    ) -> int:
+        """
+        Bulk loads the interviews into the 'interviews' table, and the Out-of-SOP
+        interviews into the 'oosop_interviews' table, with COPY (see db.copy_rows),
+        in one transaction.
+
+        The table holds all the interviews of its subjects: the interviews and
+        Out-of-SOP interviews of these subjects imported before that are not in
+        the table, or are now routed to the other table, are deleted (see
+        Interview.from_staging_query).
+
+        Args:
+            config_file (Path): The path to the configuration file.
+            subject_ids (Optional[Collection[str]], optional): The IDs of the
+                subjects scanned for the table, including those without any
+                interview. Defaults to None (the subjects of the table).
+            silent (bool, optional): Whether to suppress output. Defaults to False.
+
+        Returns:
+            int: The number of rows inserted (or updated) in the 'interviews' table.
+        """
+        subject_ids = self._get_subject_ids(subject_ids)
+        if len(self) == 0 and len(subject_ids) == 0:
+            return 0
+
+        staging_table = "interview_staging"
+        # the staging tables are dropped on commit
+        with db.get_connection(config_file) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    Interview.create_subjects_table_query(staging_table),
+                    (subject_ids,),
+                )
+                copied, upserted = db.copy_rows_with_cursor(
+                    cur=cur,
+                    staging_table=staging_table,
+                    columns=Interview.copy_columns(),
+                    rows=self.to_copy_rows(),
+                    from_staging_query=Interview.from_staging_query(
+                        staging_table, Interview.subjects_table(staging_table)
+                    ),
+                )
+            conn.commit()
+
+        if not silent:
+            Console(color_system="standard").log(
+                f"Copied {copied} interview row(s) of {len(subject_ids)} "
+                f"subject(s), inserted {upserted} interviews."
+            )
+
+        return upserted
+
+    def to_scan_copy_rows(self) -> Iterator[Tuple]:
+        """
+        Return the interviews and Out-of-SOP interviews as rows of the staging
+        table of interviews that are not named yet (see Interview.scan_copy_columns).
+        """
+        return zip(
+            self.interview_paths.tolist(),
+            self.interview_types.tolist(),
+            self._get_interview_dates(),
+            self.subject_ids.tolist(),
+            self.has_additional_files.tolist(),
+            self.notes.tolist(),
+        )
+
+    def copy_unnamed(
+        self,
+        config_file: Path,
+        subject_ids: Optional[Collection[str]] = None,
+        silent: bool = False,
+    ) -> Tuple[int, int]:
+        """
+        Bulk loads interviews that are not named yet, and names them in the
+        database (see Interview.from_scan_staging_query), which also routes the
+        duplicates. The names and days since consent of the table are ignored.
+
+        As with copy, the interviews of the subjects that are not in the table
+        (anymore) are deleted.
+
+        Args:
+            config_file (Path): The path to the configuration file.
+            subject_ids (Optional[Collection[str]], optional): The IDs of the
+                subjects scanned for the table, including those without any
+                interview. Defaults to None (the subjects of the table).
+            silent (bool, optional): Whether to suppress output. Defaults to False.
+
+        Returns:
+            Tuple[int, int]: The number of rows inserted (or updated) in the
+                'interviews' table, and the number of interviews routed to
+                'oosop_interviews' as duplicates.
+        """
+        subject_ids = self._get_subject_ids(subject_ids)
+        if len(self) == 0 and len(subject_ids) == 0:
+            return 0, 0
+
+        staging_table = "interview_scan_staging"
+        named_table = Interview.named_staging_table(staging_table)
+        # the staging tables are dropped on commit
+        with db.get_connection(config_file) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    Interview.create_subjects_table_query(staging_table),
+                    (subject_ids,),
+                )
+                copied, upserted = db.copy_rows_with_cursor(
+                    cur=cur,
+                    staging_table=staging_table,
+                    columns=Interview.scan_copy_columns(),
+                    rows=self.to_scan_copy_rows(),
+                    from_staging_query=Interview.from_scan_staging_query(
+                        staging_table, Interview.subjects_table(staging_table)
+                    ),
+                )
+                cur.execute(
+                    f"""
+                    SELECT count(*) FROM {named_table}
+                    WHERE note = 'Duplicate Interview Name';
+                    """
+                )
+                duplicates = cur.fetchone()[0]
+            conn.commit()
+
+        if not silent:
+            Console(color_system="standard").log(
+                f"Copied {copied} interview row(s), inserted {upserted} interviews, "
+                f"routed {duplicates} duplicates to Out-of-SOP."
+            )
+
+        return upserted, duplicates
+
+
+class InterviewTableBuilder:
+    """
+    Collects interviews column by column, to build an InterviewTable.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty InterviewTableBuilder object.
+        """
+        self._columns: Dict[str, list] = {
+            "interview_paths": [],
+            "interview_names": [],
+            "interview_types": [],
+            "subject_ids": [],
+            "interview_dates": [],
+            "days_since_consent": [],
+            "has_additional_files": [],
+            "notes": [],
+        }
+
+    def __len__(self) -> int:
+        return len(self._columns["interview_paths"])
+
+    def add(
+        self,
+        interview_path: Path,
+        interview_name: str,
+        interview_type: str,
+        subject_id: str,
+        interview_date: Optional[datetime] = None,
+        days_since_consent: Optional[int] = None,
+        has_additional_files: bool = False,
+        note: Optional[str] = None,
+    ) -> None:
+        """
+        Add an interview (or an Out-of-SOP interview, if it has a note).
+
+        Args:
+            interview_path (Path): The path to the interview.
+            interview_name (str): The name of the interview.
+            interview_type (str): The type of the interview (open, psychs, etc.)
+            subject_id (str): The ID of the subject.
+            interview_date (Optional[datetime], optional): The date of the
+                interview. Defaults to None.
+            days_since_consent (Optional[int], optional): The days since consent.
+                Defaults to None.
+            has_additional_files (bool, optional): Indicates if the interview has
+                additional files. Defaults to False.
+            note (Optional[str], optional): The reason the interview is
+                Out-of-SOP. Defaults to None (an in-SOP interview).
+        """
+        self._columns["interview_paths"].append(interview_path)
+        self._columns["interview_names"].append(interview_name)
+        self._columns["interview_types"].append(interview_type)
+        self._columns["subject_ids"].append(subject_id)
+        self._columns["interview_dates"].append(interview_date)
+        self._columns["days_since_consent"].append(days_since_consent)
+        self._columns["has_additional_files"].append(has_additional_files)
+        self._columns["notes"].append(note)
+
+    def build(self) -> InterviewTable:
+        """
+        Return the interviews added so far as an InterviewTable.
+        """
+        return InterviewTable(**self._columns)
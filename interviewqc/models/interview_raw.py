@@ -17,6 +17,8 @@ try:
 except ValueError:
     pass
 
+from typing import Dict, Tuple
+
 from interviewqc.helpers import db
 
 
@@ -68,10 +70,8 @@ class InterviewRaw:
         """
         sql_query = """
         CREATE TABLE interview_raw (
-            interview_name TEXT NOT NULL,
-            file_path TEXT NOT NULL PRIMARY KEY,
-            FOREIGN KEY (interview_name) REFERENCES interviews (interview_name),
-            FOREIGN KEY (file_path) REFERENCES files (file_path)
+            interview_id INTEGER NOT NULL REFERENCES interviews (interview_id),
+            file_id INTEGER NOT NULL PRIMARY KEY REFERENCES files (file_id)
         );
         """
 
@@ -98,11 +98,57 @@ class InterviewRaw:
         Returns:
             str: The SQL query for inserting the InterviewRaw object into the interview_raw table.
         """
+        i_name = db.santize_string(self.interview_name)
         f_path = db.santize_string(str(self.file_path))
 
         sql_query = f"""
-        INSERT INTO interview_raw (interview_name, file_path)
-        VALUES ('{self.interview_name}', '{f_path}')
+        INSERT INTO interview_raw (interview_id, file_id)
+        VALUES (
+            (SELECT interview_id FROM interviews WHERE interview_name = '{i_name}'),
+            interviewqc_file_id('{f_path}')
+        )
         """
 
         return sql_query
+
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        """
+        Returns the columns (and their types) of the staging table used by db.copy_models.
+
+        Returns:
+            Dict[str, str]: The staging table columns, mapped to their SQL types.
+        """
+        return {"interview_name": "TEXT", "file_path": "TEXT"}
+
+    @staticmethod
+    def from_staging_query(staging_table: str) -> str:
+        """
+        Returns the SQL query for moving staged InterviewRaw rows into the interview_raw table.
+
+        The interviews and files must already be in the database.
+
+        Args:
+            staging_table (str): The name of the staging table.
+
+        Returns:
+            str: The SQL query for moving staged rows into the interview_raw table.
+        """
+        sql_query = f"""
+        INSERT INTO interview_raw (interview_id, file_id)
+        SELECT interviews.interview_id, interviewqc_file_id(staged.file_path)
+        FROM {staging_table} AS staged
+        LEFT JOIN interviews ON interviews.interview_name = staged.interview_name
+        ON CONFLICT (file_id) DO NOTHING;
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        """
+        Returns the InterviewRaw object as a row of the staging table.
+
+        Returns:
+            Tuple: The row, in the order of copy_columns().
+        """
+        return (self.interview_name, str(self.file_path))
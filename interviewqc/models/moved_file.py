@@ -18,9 +18,11 @@ except ValueError:
     pass
 
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 from interviewqc.helpers import db
-from interviewqc.helpers.hash import compute_hash
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.models.directory import Directory
 
 
 class MovedFile:
@@ -34,19 +36,37 @@ class MovedFile:
         file_path (Path): The path to the file.
         m_time (datetime): The modification time of the file.
         md5 (str): The MD5 hash of the file.
+        digest (str): The digest of the file, computed with digest_algorithm.
+        digest_algorithm (str): The configured digest algorithm (see hash.configure).
+        file_size (int): The size of the file in bytes.
     """
 
-    def __init__(self, source_file_path: Path, destination_file_path: Path):
+    def __init__(
+        self,
+        source_file_path: Path,
+        destination_file_path: Path,
+        digests: Optional[Dict[str, str]] = None,
+    ):
         """
         Initialize a MovedFile object.
 
         Args:
             source_file_path (Path): The path to the source file.
             destination_file_path (Path): The path to the destination file.
+            digests (Optional[Dict[str, str]], optional): The digests of the file by
+                algorithm, e.g. from move.move_file. Defaults to None (computed).
         """
         self.source_file_path = source_file_path
         self.destination_file_path = destination_file_path
-        self.md5 = compute_hash(self.destination_file_path)
+        self.digest_algorithm = hash_helpers.get_digest_algorithm()
+        if digests is None:
+            digests = hash_helpers.compute_hashes(
+                file_path=self.destination_file_path,
+                hash_types=MovedFile.hash_types(),
+            )
+        self.md5 = digests["md5"]
+        self.digest = digests[self.digest_algorithm]
+        self.file_size = Path(self.destination_file_path).stat().st_size
         self.timestamp = datetime.now()
 
     def __str__(self):
@@ -61,6 +81,13 @@ class MovedFile:
         """
         return self.__str__()
 
+    @staticmethod
+    def hash_types() -> List[str]:
+        """
+        Return the hash algorithms of the digests stored for each moved file.
+        """
+        return ["md5", hash_helpers.get_digest_algorithm()]
+
     @staticmethod
     def init_table_query() -> str:
         """
@@ -68,11 +95,17 @@ class MovedFile:
         """
         sql_query = """
         CREATE TABLE moved_files (
-            source_file_path TEXT NOT NULL,
-            destination_file_path TEXT NOT NULL,
+            moved_file_id SERIAL PRIMARY KEY,
+            source_directory_id INTEGER NOT NULL REFERENCES directories (directory_id),
+            source_name TEXT NOT NULL,
+            destination_directory_id INTEGER NOT NULL REFERENCES directories (directory_id),
+            destination_name TEXT NOT NULL,
             timestamp TEXT NOT NULL,
             md5 TEXT NOT NULL,
-            PRIMARY KEY (source_file_path, destination_file_path)
+            digest TEXT NOT NULL,
+            digest_algorithm TEXT NOT NULL,
+            file_size BIGINT,
+            UNIQUE (source_directory_id, source_name, destination_directory_id, destination_name)
         );
         """
 
@@ -93,12 +126,112 @@ class MovedFile:
         """
         Return the SQL query to insert the File object into the 'moved_files' table.
         """
-        sf_path = db.santize_string(str(self.source_file_path))
-        df_path = db.santize_string(str(self.destination_file_path))
+        source_file_path = Path(self.source_file_path)
+        destination_file_path = Path(self.destination_file_path)
+
+        sf_dir = db.santize_string(str(source_file_path.parent))
+        sf_name = db.santize_string(source_file_path.name)
+        df_dir = db.santize_string(str(destination_file_path.parent))
+        df_name = db.santize_string(destination_file_path.name)
 
         sql_query = f"""
-        INSERT INTO moved_files (source_file_path, destination_file_path, timestamp, md5)
-        VALUES ('{sf_path}', '{df_path}', '{self.timestamp}', '{self.md5}');
+        INSERT INTO moved_files (source_directory_id, source_name,
+            destination_directory_id, destination_name, timestamp, md5,
+            digest, digest_algorithm, file_size)
+        VALUES (interviewqc_directory_id('{sf_dir}'), '{sf_name}',
+            interviewqc_directory_id('{df_dir}'), '{df_name}',
+            '{self.timestamp}', '{self.md5}',
+            '{self.digest}', '{self.digest_algorithm}', {self.file_size});
         """
 
         return sql_query
+
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table used by db.copy_models.
+        """
+        return {
+            "source_file_path": "TEXT",
+            "destination_file_path": "TEXT",
+            "timestamp": "TEXT",
+            "md5": "TEXT",
+            "digest": "TEXT",
+            "digest_algorithm": "TEXT",
+            "file_size": "BIGINT",
+        }
+
+    @staticmethod
+    def from_staging_query(staging_table: str) -> str:
+        """
+        Return the SQL query to move staged MovedFile rows into the 'moved_files' table.
+        """
+        staged_directories = Directory.staged_directories_query(
+            staging_table=staging_table,
+            path_columns=["source_file_path", "destination_file_path"],
+        )
+
+        sql_query = f"""
+        WITH staged_directories AS ({staged_directories})
+        INSERT INTO moved_files (source_directory_id, source_name,
+            destination_directory_id, destination_name, timestamp, md5,
+            digest, digest_algorithm, file_size)
+        SELECT source_directories.directory_id,
+            interviewqc_basename(staged.source_file_path),
+            destination_directories.directory_id,
+            interviewqc_basename(staged.destination_file_path),
+            staged.timestamp, staged.md5, staged.digest, staged.digest_algorithm,
+            staged.file_size
+        FROM {staging_table} AS staged
+        JOIN staged_directories AS source_directories
+            ON source_directories.directory_path
+                = interviewqc_dirname(staged.source_file_path)
+        JOIN staged_directories AS destination_directories
+            ON destination_directories.directory_path
+                = interviewqc_dirname(staged.destination_file_path)
+        ON CONFLICT (source_directory_id, source_name,
+            destination_directory_id, destination_name) DO NOTHING;
+        """
+
+        return sql_query
+
+    @staticmethod
+    def size_backfill_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table used to backfill
+        the size of moved files recorded without one.
+        """
+        return {
+            "moved_file_id": "INTEGER",
+            "file_size": "BIGINT",
+        }
+
+    @staticmethod
+    def size_backfill_query(staging_table: str) -> str:
+        """
+        Return the SQL query to set the staged sizes of moved files recorded
+        without a size.
+        """
+        sql_query = f"""
+        UPDATE moved_files
+        SET file_size = staged.file_size
+        FROM {staging_table} AS staged
+        WHERE moved_files.moved_file_id = staged.moved_file_id
+            AND moved_files.file_size IS NULL;
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        """
+        Return the MovedFile object as a row of the staging table.
+        """
+        return (
+            str(self.source_file_path),
+            str(self.destination_file_path),
+            str(self.timestamp),
+            self.md5,
+            self.digest,
+            self.digest_algorithm,
+            self.file_size,
+        )
@@ -18,7 +18,7 @@ except ValueError:
     pass
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from interviewqc.helpers import db
 
@@ -114,9 +114,76 @@ class OutOfSopInterview:
             days_since_consent, has_additional_files) \
         VALUES ('{i_path}', '{i_name}', '{self.interview_type}', \
             '{i_date}', '{self.subject_id}', '{self.note}', \
-            {self.days_since_consent}, {self.has_additional_files});
+            {self.days_since_consent}, {self.has_additional_files})
+        {OutOfSopInterview.upsert_clause()};
         """
 
         sql_query = db.handle_null(sql_query)
 
         return sql_query
+
+    @staticmethod
+    def upsert_clause() -> str:
+        """
+        Returns the ON CONFLICT clause updating an Out-of-SOP interview imported
+        before (with the same path), if any of its columns changed.
+        """
+        sql_query = """
+        ON CONFLICT (interview_path) DO UPDATE
+        SET interview_name = EXCLUDED.interview_name,
+            interview_type = EXCLUDED.interview_type,
+            interview_date = EXCLUDED.interview_date,
+            subject_id = EXCLUDED.subject_id,
+            note = EXCLUDED.note,
+            days_since_consent = EXCLUDED.days_since_consent,
+            has_additional_files = EXCLUDED.has_additional_files
+        WHERE (oosop_interviews.interview_name, oosop_interviews.interview_type,
+            oosop_interviews.interview_date, oosop_interviews.subject_id,
+            oosop_interviews.note, oosop_interviews.days_since_consent,
+            oosop_interviews.has_additional_files)
+            IS DISTINCT FROM (EXCLUDED.interview_name, EXCLUDED.interview_type,
+            EXCLUDED.interview_date, EXCLUDED.subject_id, EXCLUDED.note,
+            EXCLUDED.days_since_consent, EXCLUDED.has_additional_files)
+        """
+
+        return sql_query
+
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        return {
+            "interview_path": "TEXT",
+            "interview_name": "TEXT",
+            "interview_type": "TEXT",
+            "interview_date": "TIMESTAMP",
+            "subject_id": "TEXT",
+            "note": "TEXT",
+            "days_since_consent": "INTEGER",
+            "has_additional_files": "BOOLEAN",
+        }
+
+    @staticmethod
+    def from_staging_query(staging_table: str) -> str:
+        sql_query = f"""
+        INSERT INTO oosop_interviews (interview_path, interview_name, interview_type, \
+            interview_date, subject_id, note, \
+            days_since_consent, has_additional_files)
+        SELECT interview_path, interview_name, interview_type, \
+            interview_date, subject_id, note, \
+            days_since_consent, COALESCE(has_additional_files, FALSE)
+        FROM {staging_table}
+        {OutOfSopInterview.upsert_clause()};
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        return (
+            str(self.interview_path),
+            self.interview_name,
+            self.interview_type,
+            self.interview_date,
+            self.subject_id,
+            self.note,
+            self.days_since_consent,
+            self.has_additional_files,
+        )
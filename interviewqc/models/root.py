@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+import sys
+from pathlib import Path
+
+file = Path(__file__).resolve()
+parent = file.parent
+root = None
+for parent in file.parents:
+    if parent.name == "ampscz-interview-qc":
+        root = parent
+sys.path.append(str(root))
+
+# remove current directory from path
+try:
+    sys.path.remove(str(parent))
+except ValueError:
+    pass
+
+from interviewqc.helpers import db
+
+
+class Root:
+    """
+    Represents a root directory (e.g. data_root or backup_root), relative to
+    which the paths in the 'directories' table are stored.
+
+    Attributes:
+        root_path (Path): The path to the root directory.
+    """
+
+    def __init__(self, root_path: Path):
+        """
+        Initialize a Root object.
+
+        Args:
+            root_path (Path): The path to the root directory.
+        """
+        self.root_path = root_path
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the Root object.
+
+        Returns:
+            str: A string representation of the Root object.
+        """
+        return f"Root({self.root_path})"
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Root object.
+
+        Returns:
+            str: A string representation of the Root object.
+        """
+        return self.__str__()
+
+    @staticmethod
+    def init_table_query() -> str:
+        """
+        Get the SQL query to create the 'roots' table.
+
+        The root '' holds all the paths that are not below another root.
+
+        Returns:
+            str: The SQL query to create the 'roots' table.
+        """
+        sql_query = """
+        CREATE TABLE roots (
+            root_id SERIAL PRIMARY KEY,
+            root_path TEXT NOT NULL UNIQUE
+        );
+        """
+
+        return sql_query
+
+    @staticmethod
+    def drop_table_query() -> str:
+        """
+        Get the SQL query to drop the 'roots' table.
+
+        Returns:
+            str: The SQL query to drop the 'roots' table.
+        """
+        sql_query = """
+        DROP TABLE IF EXISTS roots;
+        """
+
+        return sql_query
+
+    def to_sql(self) -> str:
+        """
+        Get the SQL query to register the root, moving the existing directories
+        below it from their current root.
+
+        Returns:
+            str: The SQL query to register the root.
+        """
+        r_path = db.santize_string(str(self.root_path).rstrip("/"))
+
+        sql_query = f"""
+        SELECT interviewqc_register_root('{r_path}');
+        """
+
+        return sql_query
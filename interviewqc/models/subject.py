@@ -80,7 +80,8 @@ class Subject:
 
     def to_sql(self) -> str:
         """
-        Get the SQL query to insert the Subject object into the subjects table.
+        Get the SQL query to insert the Subject object into the subjects table,
+        or update the consent date of a known subject if it changed.
 
         Returns:
             str: The SQL query to insert the Subject object into the subjects table.
@@ -88,7 +89,8 @@ class Subject:
         sql_query = f"""
         INSERT INTO subjects (subject_id, site_id, consent_date)
         VALUES ('{self.subject_id}', '{self.site_id}', '{self.consent_date.strftime("%Y-%m-%d %H:%M:%S")}')
-        ON CONFLICT (subject_id) DO NOTHING;
+        ON CONFLICT (subject_id) DO UPDATE SET consent_date = EXCLUDED.consent_date
+        WHERE subjects.consent_date IS DISTINCT FROM EXCLUDED.consent_date;
         """
 
         return sql_query
@@ -0,0 +1,126 @@
+from typing import Dict, Tuple
+
+
+class SubjectWatermark:
+    """
+    Represents the modification time of a subject directory when its interviews
+    were last imported, to skip unchanged subjects on the next run.
+
+    The consent date of the subject (from the 'subjects' table) is recorded
+    with it, as the interviews are named after it: a watermark only holds
+    while the consent date is unchanged.
+
+    Attributes:
+        subject_path (str): The path to the subject directory.
+        subject_id (str): The ID of the subject.
+        m_time_ns (int): The latest modification time (in ns) of the subject
+            directory and its interview type directories.
+    """
+
+    def __init__(self, subject_path: str, subject_id: str, m_time_ns: int) -> None:
+        """
+        Initialize a SubjectWatermark object.
+
+        Args:
+            subject_path (str): The path to the subject directory.
+            subject_id (str): The ID of the subject.
+            m_time_ns (int): The latest modification time (in ns) of the subject
+                directory and its interview type directories.
+
+        Returns:
+            None
+        """
+        self.subject_path = subject_path
+        self.subject_id = subject_id
+        self.m_time_ns = m_time_ns
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the SubjectWatermark object.
+
+        Returns:
+            str: The string representation of the SubjectWatermark object.
+        """
+        return f"SubjectWatermark({self.subject_id}, {self.m_time_ns})"
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the SubjectWatermark object.
+
+        Returns:
+            str: The string representation of the SubjectWatermark object.
+        """
+        return self.__str__()
+
+    @staticmethod
+    def drop_table_query() -> str:
+        """
+        Get the SQL query to drop the subject_watermarks table.
+
+        Returns:
+            str: The SQL query to drop the subject_watermarks table.
+        """
+        sql_query = """
+        DROP TABLE IF EXISTS subject_watermarks;
+        """
+
+        return sql_query
+
+    @staticmethod
+    def get_watermarks_query() -> str:
+        """
+        Get the SQL query to retrieve the watermarks of the subject directories
+        whose consent date did not change since they were recorded.
+
+        Returns:
+            str: The SQL query returning subject_path and m_time_ns.
+        """
+        sql_query = """
+        SELECT subject_watermarks.subject_path, subject_watermarks.m_time_ns
+        FROM subject_watermarks
+        JOIN subjects ON subjects.subject_id = subject_watermarks.subject_id
+        WHERE subjects.consent_date
+            IS NOT DISTINCT FROM subject_watermarks.consent_date;
+        """
+
+        return sql_query
+
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table used by db.copy_models.
+        """
+        return {
+            "subject_path": "TEXT",
+            "subject_id": "TEXT",
+            "m_time_ns": "BIGINT",
+        }
+
+    @staticmethod
+    def from_staging_query(staging_table: str) -> str:
+        """
+        Return the SQL query to move staged SubjectWatermark rows into the
+        'subject_watermarks' table, updating the existing ones, with the current
+        consent dates of the subjects.
+        """
+        sql_query = f"""
+        INSERT INTO subject_watermarks (subject_path, subject_id, m_time_ns,
+            consent_date)
+        SELECT staged.subject_path, staged.subject_id, staged.m_time_ns,
+            subjects.consent_date
+        FROM {staging_table} AS staged
+        LEFT JOIN subjects ON subjects.subject_id = staged.subject_id
+        ON CONFLICT (subject_path) DO UPDATE
+        SET subject_id = EXCLUDED.subject_id,
+            m_time_ns = EXCLUDED.m_time_ns,
+            consent_date = EXCLUDED.consent_date,
+            updated_at = now();
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        """
+        Return the row of the SubjectWatermark object, in the order of copy_columns.
+        """
+        return (self.subject_path, self.subject_id, self.m_time_ns)
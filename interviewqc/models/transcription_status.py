@@ -20,7 +20,7 @@ try:
 except ValueError:
     pass
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from interviewqc.helpers import db, utils
 
@@ -127,6 +127,64 @@ class TranscriptionStatus:
 
         return sql_query
 
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table used by db.copy_models.
+        """
+        return {
+            "subject_id": "TEXT",
+            "study_id": "TEXT",
+            "interview_type": "TEXT",
+            "interview_name": "TEXT",
+            "session": "INTEGER",
+            "pipeline_status": "TEXT",
+            "transcript_file_status": "TEXT",
+            "qc_status": "TEXT",
+            "interview_length_minutes": "REAL",
+        }
+
+    @staticmethod
+    def from_staging_query(staging_table: str) -> str:
+        """
+        Return the SQL query to move staged TranscriptionStatus rows into the
+        'transcription_status' table.
+
+        As with to_sql, rows conflicting on (subject_id, study_id, interview_type,
+        session) are skipped, and duplicate interview names raise.
+        """
+        sql_query = f"""
+        INSERT INTO transcription_status (
+            subject_id, study_id, interview_type, interview_name,
+            session, pipeline_status, transcript_file_status,
+            qc_status, interview_length_minutes
+        )
+        SELECT
+            subject_id, study_id, interview_type, interview_name,
+            session, pipeline_status, transcript_file_status,
+            qc_status, interview_length_minutes
+        FROM {staging_table}
+        ON CONFLICT (subject_id, study_id, interview_type, session) DO NOTHING;
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        """
+        Return the TranscriptionStatus object as a row of the staging table.
+        """
+        return (
+            self.subject_id,
+            self.study_id,
+            self.interview_type,
+            self.interview_name,
+            self.session,
+            self.pipeline_status,
+            self.transcript_file_status,
+            self.qc_status,
+            self.interview_length_minutes,
+        )
+
 if __name__ == "__main__":
     config_file = utils.get_config_file_path()
 
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
 from interviewqc.helpers import db
 from interviewqc.models.file import File
@@ -27,9 +27,9 @@ class Transcript:
         """
         sql_query = """
         CREATE TABLE transcripts (
-            transcript_path TEXT NOT NULL REFERENCES files (file_path),
-            interview_name TEXT NOT NULL REFERENCES interviews (interview_name),
-            PRIMARY KEY (transcript_path, interview_name)
+            file_id INTEGER NOT NULL REFERENCES files (file_id),
+            interview_id INTEGER NOT NULL REFERENCES interviews (interview_id),
+            PRIMARY KEY (file_id, interview_id)
         );
         """
 
@@ -52,14 +52,48 @@ class Transcript:
         """
         sql_queries: List[str] = []
         t_path = db.santize_string(str(self.transcript_path))
+        i_name = db.santize_string(self.interview_name)
 
         file = File.from_path(self.transcript_path)
         sql_queries.append(file.to_sql())
 
         sql_query = f"""
-        INSERT INTO transcripts (transcript_path, interview_name)
-        VALUES ('{t_path}', '{self.interview_name}');
+        INSERT INTO transcripts (file_id, interview_id)
+        VALUES (
+            interviewqc_file_id('{t_path}'),
+            (SELECT interview_id FROM interviews WHERE interview_name = '{i_name}')
+        );
         """
         sql_queries.append(sql_query)
 
         return sql_queries
+
+    @staticmethod
+    def copy_columns() -> Dict[str, str]:
+        """
+        Return the columns (and their types) of the staging table used by db.copy_models.
+
+        Note: The transcript files and interviews must already be in the database.
+        """
+        return {"transcript_path": "TEXT", "interview_name": "TEXT"}
+
+    @staticmethod
+    def from_staging_query(staging_table: str) -> str:
+        """
+        Return the SQL query to move staged Transcript rows into the 'transcripts' table.
+        """
+        sql_query = f"""
+        INSERT INTO transcripts (file_id, interview_id)
+        SELECT interviewqc_file_id(staged.transcript_path), interviews.interview_id
+        FROM {staging_table} AS staged
+        LEFT JOIN interviews ON interviews.interview_name = staged.interview_name
+        ON CONFLICT (file_id, interview_id) DO NOTHING;
+        """
+
+        return sql_query
+
+    def to_copy_row(self) -> Tuple:
+        """
+        Return the Transcript object as a row of the staging table.
+        """
+        return (str(self.transcript_path), self.interview_name)
@@ -26,12 +26,17 @@ from rich.logging import RichHandler
 import pandas as pd
 
 from interviewqc.helpers import utils, db
-from interviewqc.helpers.config import config
+from interviewqc.helpers.config import get_settings
+from interviewqc.fs import walker
 from interviewqc.models.subject import Subject
+from interviewqc import data
 
 
 MODULE_NAME = "interviewqc_import_subjects"
 
+# Number of subjects committed per transaction
+CHUNK_SIZE = 1000
+
 console = utils.get_console()
 
 logger = logging.getLogger(MODULE_NAME)
@@ -88,10 +93,11 @@ def get_all_subjects(config_file: Path, data_root: Path):
     sites_path = data_root / "GENERAL"
     subjects: List[Subject] = []
 
-    for site_path in sites_path.iterdir():
-        if not site_path.is_dir():
+    for site_entry in walker.scandir(sites_path) or []:
+        if not site_entry.is_dir(follow_symlinks=False):
             continue
 
+        site_path = Path(site_entry.path)
         site_name = site_path.name
 
         metadata_file = site_path / f"{site_name}_metadata.csv"
@@ -110,8 +116,12 @@ def get_all_subjects(config_file: Path, data_root: Path):
         sql_queries.append(query)
 
     db.execute_queries(
-        config_file=config_file, queries=sql_queries, show_commands=False
+        config_file=config_file,
+        queries=sql_queries,
+        show_commands=False,
+        chunk_size=CHUNK_SIZE,
     )
+    data.invalidate_consent_index(config_file=config_file)
 
 
 if __name__ == "__main__":
@@ -124,8 +134,7 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
-    config_params = config(config_file, "general")
-    data_root = Path(config_params["data_root"])
+    data_root = get_settings(config_file).general.data_root
     logger.info(f"Data root: {data_root}")
 
     logger.info("Getting all subjects")
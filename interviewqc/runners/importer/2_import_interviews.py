@@ -19,20 +19,53 @@ except ValueError:
 
 
 import logging
-from typing import List, Tuple, Set
+import os
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import (
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 from rich.logging import RichHandler
 
-from interviewqc.helpers import utils, db, dpdash
-from interviewqc.helpers.config import config
-from interviewqc.models.interview import Interview
-from interviewqc.models.oosop_interviews import OutOfSopInterview
+from interviewqc.helpers import utils, db, dpdash, throttle
+from interviewqc.helpers.config import get_settings
+from interviewqc.fs import manifest, walker
+from interviewqc.models.interview import InterviewTable, InterviewTableBuilder
+from interviewqc.models.subject_watermark import SubjectWatermark
 from interviewqc import data
 
 
 MODULE_NAME = "interviewqc_import_interviews"
 
+# Parallel scanning settings: subjects (or whole sites, if not SPLIT_SUBJECTS) are
+# scanned by NUM_WORKERS threads, as scanning mostly waits on filesystem metadata.
+# Splitting by subject bounds the interviews held by the scans in flight.
+PARALLEL = True
+NUM_WORKERS = 8
+SPLIT_SUBJECTS = True
+
+# Interviews are written to the database in batches of BATCH_SIZE
+BATCH_SIZE = 1000
+
+# Name the interviews (days since consent, timepoint and name) of a batch in the
+# database, instead of in Python (see name_interviews)
+NAME_IN_DB = False
+
 console = utils.get_console()
 
 logger = logging.getLogger(MODULE_NAME)
@@ -45,41 +78,139 @@ logargs = {
 logging.basicConfig(**logargs)
 
 
-INVALID_INTERVIEW_NAMES_COUNT = 0
-ADDITIONAL_FILES_COUNT = 0
+@dataclass
+class ScanStats:
+    """
+    Counters of the interviews scanned (of a site, or of all sites).
+
+    Attributes:
+        invalid_interview_names (int): Interviews with Out-of-SOP names.
+        additional_files (int): Interviews with additional files.
+        skipped_subjects (int): Subjects skipped as unchanged since the last
+            import (see get_subject_m_time_ns).
+    """
+
+    invalid_interview_names: int = 0
+    additional_files: int = 0
+    skipped_subjects: int = 0
+
+    def __add__(self, other: "ScanStats") -> "ScanStats":
+        return ScanStats(
+            **{
+                field.name: getattr(self, field.name) + getattr(other, field.name)
+                for field in fields(self)
+            }
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.invalid_interview_names} invalid interview names, "
+            f"{self.additional_files} with additional files, "
+            f"{self.skipped_subjects} unchanged subjects skipped"
+        )
+
+
+class SubjectsScan(NamedTuple):
+    """
+    The interviews found by scanning subjects (of a site, or a single subject).
+
+    Attributes:
+        interviews (InterviewTable): The interviews and Out-of-SOP interviews.
+        stats (ScanStats): The counters of the scan.
+        subject_ids (List[str]): The IDs of the scanned subjects (not skipped),
+            whose interviews not found by the scan are deleted on import.
+        watermarks (List[SubjectWatermark]): The watermarks of the scanned
+            subjects, to record once their interviews are imported.
+    """
+
+    interviews: InterviewTable
+    stats: ScanStats
+    subject_ids: List[str]
+    watermarks: List[SubjectWatermark]
+
+
+def name_interviews(interviews: InterviewTable, config_file: Path) -> None:
+    """
+    Computes the DPDash names and the days since consent of all the interviews
+    of a table at once, from the consent dates of their subjects (see
+    data.ConsentIndex). Interviews without a date are named as of 'day0'.
+
+    With NAME_IN_DB, both are computed by the database instead (see
+    InterviewTable.copy_unnamed), and the table is left unnamed.
+
+    Args:
+        interviews (InterviewTable): The interviews to name, in place.
+        config_file (Path): The path to the configuration file.
+
+    Raises:
+        ValueError: If the subject of a dated interview has no consent date.
+    """
+    if NAME_IN_DB or len(interviews) == 0:
+        return
+
+    dated = ~np.isnat(interviews.interview_dates)
+    timepoints = np.full(len(interviews), "day0", dtype=object)
+    days_since_consent = np.full(len(interviews), np.nan)
+    if dated.any():
+        consent_index = data.get_consent_index(config_file=config_file)
+        subject_ids = interviews.subject_ids[dated]
+        interview_dates = interviews.interview_dates[dated]
+        days_since_consent[dated] = consent_index.days_since_consent(
+            subject_ids, interview_dates
+        )
+        timepoints[dated] = consent_index.dpdash_timepoint(
+            subject_ids, interview_dates
+        )
+
+    subject_ids = pd.Series(interviews.subject_ids, dtype=object)
+    interview_names = dpdash.get_dpdash_names(
+        pd.DataFrame(
+            {
+                "study": subject_ids.str[:2],
+                "subject": subject_ids,
+                "data_type": "interview",
+                "category": interviews.interview_types,
+                "time_range": timepoints,
+            }
+        )
+    )
+
+    interviews.interview_names = interview_names.to_numpy(dtype=object)
+    interviews.days_since_consent = days_since_consent
 
 
 def get_interviews_from_file(
-    interviews_file: Path, subject_id: str, interview_type: str
-) -> Tuple[List[Interview], List[OutOfSopInterview]]:
+    interviews_file: Path,
+    subject_id: str,
+    interview_type: str,
+    stats: ScanStats,
+    interviews: InterviewTableBuilder,
+) -> None:
     """
-    Retrieves a list of Interview objects from the specified file.
+    Retrieves the interview of the specified file.
 
     Args:
         interviews_file (Path): The file containing the interviews.
         subject_id (str): The ID of the subject.
         interview_type (str): The type of the interview.
+        stats (ScanStats): The counters to update.
+        interviews (InterviewTableBuilder): The interviews to add the interview to.
 
     Returns:
-        List[Interview]: A list of Interview objects.
-
+        None
     """
-    interviews: List[Interview] = []
-    out_of_sop_interviews: List[OutOfSopInterview] = []
-    global INVALID_INTERVIEW_NAMES_COUNT
-
     file_name = interviews_file.name
     if interviews_file.suffix != ".wav" and interviews_file.suffix != ".WAV":
         logger.warning(
             f"Interview '{file_name}' has invalid extension: {interviews_file.suffix}"
         )
-        return interviews, out_of_sop_interviews
+        return
     if file_name.startswith("."):
-        return interviews, out_of_sop_interviews
+        return
 
     if len(interviews_file.stem) != 14:
         valid_name = False
-        INVALID_INTERVIEW_NAMES_COUNT += 1
+        stats.invalid_interview_names += 1
         logger.warning(f"Interview '{interviews_file}' has Out-of-SOP name")
     else:
         valid_name = True
@@ -87,86 +218,52 @@ def get_interviews_from_file(
     interview_datetime_str = file_name[:14]
     interview_datetime = datetime.strptime(interview_datetime_str, "%Y%m%d%H%M%S")
 
-    days_since_consent = data.compute_days_since_consent(
-        config_file=config_file,
-        event_date=interview_datetime,
+    # named for the whole batch (see name_interviews)
+    interviews.add(
+        interview_path=interviews_file,
+        interview_name=None,
+        interview_type=interview_type,
         subject_id=subject_id,
+        interview_date=interview_datetime,
+        note=None if valid_name else "Invalid Interview Name",
     )
 
-    consent_date = data.get_consent_data(config_file=config_file, subject_id=subject_id)
-
-    if consent_date is None:
-        raise ValueError(f"Subject {subject_id} has no consent date")
-    timepoint = dpdash.get_dpdash_timepoint(
-        consent_date=consent_date, event_date=interview_datetime
-    )
-
-    interview_name = dpdash.get_dpdash_name(
-        study=subject_id[:2],
-        subject=subject_id,
-        data_type="interview",
-        category=interview_type,
-        optional_tag=None,
-        time_range=timepoint,
-    )
-
-    if valid_name:
-        interview = Interview(
-            interview_path=interviews_file,
-            days_since_consent=days_since_consent,
-            interview_name=interview_name,
-            interview_type=interview_type,
-            subject_id=subject_id,
-            interview_date=interview_datetime,
-        )
-
-        interviews.append(interview)
-    else:
-        oo_sop_interview = OutOfSopInterview(
-            interview_path=interviews_file,
-            days_since_consent=days_since_consent,
-            interview_name=interview_name,
-            interview_type=interview_type,
-            subject_id=subject_id,
-            interview_date=interview_datetime,
-            note="Invalid Interview Name",
-        )
-
-        out_of_sop_interviews.append(oo_sop_interview)
-
-    return interviews, out_of_sop_interviews
-
 
 def get_interviews_from_dir(
-    interviews_dir: Path, subject_id: str, interview_type: str
-) -> Tuple[List[Interview], List[OutOfSopInterview]]:
+    interviews_dir_entries: List[os.DirEntry],
+    subject_id: str,
+    interview_type: str,
+    stats: ScanStats,
+    interviews: InterviewTableBuilder,
+) -> None:
     """
-    Retrieves a list of Interview objects from the specified directory.
+    Retrieves the interviews of the specified directory.
 
     Args:
-        interviews_dir (Path): The directory containing the interviews.
+        interviews_dir_entries (List[os.DirEntry]): The entries of the directory
+            containing the interviews (see walker.scandir).
         subject_id (str): The ID of the subject.
         interview_type (str): The type of the interview.
+        stats (ScanStats): The counters to update.
+        interviews (InterviewTableBuilder): The interviews to add the interviews to.
 
     Returns:
-        List[Interview]: A list of Interview objects.
-
+        None
     """
-    interviews: List[Interview] = []
-    out_of_sop_interviews: List[OutOfSopInterview] = []
-    global INVALID_INTERVIEW_NAMES_COUNT
-    global ADDITIONAL_FILES_COUNT
-
-    for interview_dir in interviews_dir.iterdir():
-        if not interview_dir.is_dir():
-            file_interviews, file_oosop_interviews = get_interviews_from_file(
+    for entry in interviews_dir_entries:
+        interview_dir = Path(entry.path)
+        if entry.is_symlink() and entry.is_dir():
+            # Directory symlinks are not followed, as in walker.walk
+            logger.warning(f"Skipping symlinked interview directory '{interview_dir}'")
+            continue
+        if not entry.is_dir(follow_symlinks=False):
+            get_interviews_from_file(
                 interviews_file=interview_dir,
                 subject_id=subject_id,
                 interview_type=interview_type,
+                stats=stats,
+                interviews=interviews,
             )
-
-            interviews.extend(file_interviews)
-            out_of_sop_interviews.extend(file_oosop_interviews)
             continue
 
         interview_file_name = interview_dir.name
@@ -182,254 +279,421 @@ def get_interviews_from_dir(
                 logger.warning(f"Interview '{interview_dir}' has Out-of-SOP name")
                 interview_date = None
                 valid_name = False
-                INVALID_INTERVIEW_NAMES_COUNT += 1
+                stats.invalid_interview_names += 1
             else:
                 continue
 
-        if interview_date is None:
-            days_sice_consent = None
-        else:
-            days_sice_consent = data.compute_days_since_consent(
-                config_file=config_file,
-                event_date=interview_date,
-                subject_id=subject_id,
-            )
-
-        consent_date = data.get_consent_data(
-            config_file=config_file, subject_id=subject_id
-        )
-
-        if interview_date is not None:
-            if consent_date is None:
-                raise ValueError(f"Subject {subject_id} has no consent date")
-            timepoint = dpdash.get_dpdash_timepoint(
-                consent_date=consent_date, event_date=interview_date
-            )
-        else:
-            timepoint = "day0"
-
-        interview_name = dpdash.get_dpdash_name(
-            study=subject_id[:2],
-            subject=subject_id,
-            data_type="interview",
-            category=interview_type,
-            optional_tag=None,
-            time_range=timepoint,
-        )
-
         additional_files_dir = interview_dir / "Additional interview files"
         if additional_files_dir.exists():
             has_additional_files = True
-            ADDITIONAL_FILES_COUNT += 1
+            stats.additional_files += 1
             logger.warning(f"Interview '{interview_dir}' has additional files.")
         else:
             has_additional_files = False
 
-        if valid_name:
-            interview = Interview(
-                interview_path=interview_dir,
-                days_since_consent=days_sice_consent,
-                interview_name=interview_name,
-                interview_type=interview_type,
-                subject_id=subject_id,
-                interview_date=interview_date,
-                has_additional_files=has_additional_files,
-            )
+        # named for the whole batch (see name_interviews)
+        interviews.add(
+            interview_path=interview_dir,
+            interview_name=None,
+            interview_type=interview_type,
+            subject_id=subject_id,
+            interview_date=interview_date,
+            has_additional_files=has_additional_files,
+            note=None if valid_name else "Invalid Interview Name",
+        )
 
-            interviews.append(interview)
-        else:
-            out_of_sop_interview = OutOfSopInterview(
-                interview_path=interview_dir,
-                days_since_consent=days_sice_consent,
-                interview_name=interview_name,
-                interview_type=interview_type,
-                subject_id=subject_id,
-                interview_date=interview_date,
-                note="Invalid Interview Name",
-                has_additional_files=has_additional_files,
-            )
 
-            out_of_sop_interviews.append(out_of_sop_interview)
+def get_interviews_from_subject(
+    subject_path: os.DirEntry,
+    stats: ScanStats,
+    interviews: InterviewTableBuilder,
+    interview_types: Optional[List[Tuple[str, str, List[os.DirEntry]]]] = None,
+) -> None:
+    """
+    Retrieves the interviews of the specified subject path.
+
+    Args:
+        subject_path (os.DirEntry): The subject directory.
+        stats (ScanStats): The counters to update.
+        interviews (InterviewTableBuilder): The interviews to add the interviews to.
+        interview_types (Optional[List[Tuple[str, str, List[os.DirEntry]]]], optional):
+            The interview type directories of the subject, if already listed
+            (see walker.iter_interview_types). Defaults to None (listed).
+
+    Returns:
+        None
+    """
+    subject_id = subject_path.name
+
+    if interview_types is None:
+        interview_types = list(walker.iter_interview_types(subject_path))
 
-    return interviews, out_of_sop_interviews
+    for interview_type, _, interview_type_entries in interview_types:
+        get_interviews_from_dir(
+            interview_type_entries, subject_id, interview_type, stats, interviews
+        )
 
 
-def get_interviews_from_subject(
-    subject_path: Path,
-) -> Tuple[List[Interview], List[OutOfSopInterview]]:
+def get_subject_m_time_ns(
+    subject_path: os.DirEntry,
+    interview_types: List[Tuple[str, str, List[os.DirEntry]]],
+) -> int:
     """
-    Retrieves a list of interviews from the specified subject path.
+    Returns the latest modification time of a subject directory, of its
+    interview type directories, and of its interview directories.
+
+    Interviews are added to (or removed from) the interview type directories,
+    and 'Additional interview files' directories to the interview directories,
+    which does not change the modification time of the subject directory.
 
     Args:
-        subject_path (Path): The path to the subject directory.
+        subject_path (os.DirEntry): The subject directory.
+        interview_types (List[Tuple[str, str, List[os.DirEntry]]]): The interview
+            type directories of the subject (see walker.iter_interview_types).
 
     Returns:
-        List[Interview]: A list of Interview objects.
+        int: The latest modification time, in ns.
+    """
+    throttle.throttle()
+    m_time_ns = subject_path.stat().st_mtime_ns
+
+    for _, interview_type_dir, entries in interview_types:
+        throttle.throttle()
+        try:
+            m_time_ns = max(m_time_ns, os.stat(interview_type_dir).st_mtime_ns)
+        except FileNotFoundError:
+            continue
+
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            throttle.throttle()
+            try:
+                m_time_ns = max(
+                    m_time_ns, entry.stat(follow_symlinks=False).st_mtime_ns
+                )
+            except FileNotFoundError:
+                continue  # removed while scanning
+
+    return m_time_ns
+
 
+def get_interviews_from_subjects(
+    subject_paths: Collection[os.DirEntry],
+    watermarks: Optional[Dict[str, int]] = None,
+) -> SubjectsScan:
     """
-    interview_path = subject_path / "interviews"
-    subject_id = subject_path.name
+    Retrieves a list of interviews from the specified subject paths.
 
-    interviews: List[Interview] = []
-    out_of_sop_interviews: List[OutOfSopInterview] = []
+    Runs in a worker thread: the counters are returned rather than shared.
 
-    interview_types = ["open", "psychs"]
+    Args:
+        subject_paths (Collection[os.DirEntry]): The subject directories.
+        watermarks (Optional[Dict[str, int]], optional): The modification times
+            of the subject directories when last imported, by path. Subjects
+            that did not change since are skipped. Defaults to None (no subject
+            is skipped, and no watermark is returned).
 
-    for interview_type in interview_types:
-        interview_type_path = interview_path / interview_type
-        if not interview_type_path.exists():
-            continue
+    Returns:
+        SubjectsScan: The interviews, Out-of-SOP interviews, counters and
+            watermarks of the subjects.
+    """
+    interviews = InterviewTableBuilder()
+    stats = ScanStats()
+    subject_ids: List[str] = []
+    subject_watermarks: List[SubjectWatermark] = []
+
+    for subject_path in subject_paths:
+        interview_types = list(walker.iter_interview_types(subject_path))
+
+        if watermarks is not None:
+            # read before scanning, so that changes made meanwhile are not missed
+            m_time_ns = get_subject_m_time_ns(subject_path, interview_types)
+            if watermarks.get(subject_path.path) == m_time_ns:
+                stats.skipped_subjects += 1
+                continue
+
+            subject_watermarks.append(
+                SubjectWatermark(
+                    subject_path=subject_path.path,
+                    subject_id=subject_path.name,
+                    m_time_ns=m_time_ns,
+                )
+            )
 
-        subject_interviews, subject_oosop_interviews = get_interviews_from_dir(
-            interview_type_path, subject_id, interview_type
+        subject_ids.append(subject_path.name)
+        get_interviews_from_subject(
+            subject_path, stats, interviews, interview_types=interview_types
         )
-        interviews.extend(subject_interviews)
-        out_of_sop_interviews.extend(subject_oosop_interviews)
 
-    return interviews, out_of_sop_interviews
+    return SubjectsScan(
+        interviews=interviews.build(),
+        stats=stats,
+        subject_ids=subject_ids,
+        watermarks=subject_watermarks,
+    )
 
 
 def get_interviews_from_site(
-    site_path: Path,
-) -> Tuple[List[Interview], List[OutOfSopInterview]]:
+    site_path: os.DirEntry,
+    subjects: Optional[Collection[str]] = None,
+    watermarks: Optional[Dict[str, int]] = None,
+) -> SubjectsScan:
     """
     Retrieves a list of interviews from the specified site path.
 
+    Sites without raw data are logged, and skipped.
+
     Args:
-        site_path (Path): The path to the site directory.
+        site_path (os.DirEntry): The site directory.
+        subjects (Optional[Collection[str]], optional): The subject IDs to get
+            interviews from. Defaults to None (all subjects).
+        watermarks (Optional[Dict[str, int]], optional): The modification times
+            of the subject directories when last imported, by path (see
+            get_interviews_from_subjects). Defaults to None.
 
     Returns:
-        List[Interview]: A list of Interview objects.
-
-    Raises:
-        FileNotFoundError: If the subjects path does not exist.
+        SubjectsScan: The interviews, Out-of-SOP interviews, counters and
+            watermarks of the site.
     """
-    subjects_path = site_path / "raw"
-    interviews: List[Interview] = []
-    out_of_sop_interviews: List[OutOfSopInterview] = []
+    return get_interviews_from_subjects(
+        list(walker.iter_subjects(site_path, data_type="raw", subjects=subjects)),
+        watermarks=watermarks,
+    )
 
-    if not subjects_path.exists():
-        raise FileNotFoundError(f"Subjects path {subjects_path} does not exist")
 
-    for subject_path in subjects_path.iterdir():
-        if not subject_path.is_dir():
-            continue
+def iter_scans(
+    data_root: Path,
+    subjects: Optional[Collection[str]] = None,
+    watermarks: Optional[Dict[str, int]] = None,
+) -> Iterator[Tuple[str, SubjectsScan]]:
+    """
+    Scans the sites (or subjects, if SPLIT_SUBJECTS) for interviews.
 
-        subject_interviews, subject_out_of_sop_interviews = get_interviews_from_subject(
-            subject_path
-        )
-        interviews.extend(subject_interviews)
-        out_of_sop_interviews.extend(subject_out_of_sop_interviews)
+    Sites (or subjects) are scanned concurrently, with at most twice as many
+    scans in flight as workers, and yielded in the order of the sites and
+    subjects, as when scanning sequentially.
 
-    return interviews, out_of_sop_interviews
+    Args:
+        data_root (Path): The root directory containing the interview data.
+        subjects (Optional[Collection[str]], optional): The subject IDs to scan.
+            Defaults to None (all subjects).
+        watermarks (Optional[Dict[str, int]], optional): The modification times
+            of the subject directories when last imported, by path (see
+            get_interviews_from_subjects). Defaults to None.
+
+    Yields:
+        Tuple[str, SubjectsScan]: The site name, and the scan.
+    """
+    max_workers = NUM_WORKERS if PARALLEL else 1
+
+    def iter_tasks() -> Iterator[Tuple[str, Callable, Tuple]]:
+        for site_path in walker.iter_sites(data_root):
+            if not SPLIT_SUBJECTS:
+                yield site_path.name, get_interviews_from_site, (
+                    site_path,
+                    subjects,
+                    watermarks,
+                )
+                continue
 
+            for subject_path in walker.iter_subjects(
+                site_path, data_type="raw", subjects=subjects
+            ):
+                yield site_path.name, get_interviews_from_subjects, (
+                    [subject_path],
+                    watermarks,
+                )
+
+    pending: Deque[Tuple[str, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for site, function, args in iter_tasks():
+            pending.append((site, executor.submit(function, *args)))
+            if len(pending) < 2 * max_workers:
+                continue
 
-def get_duplicate_interviews(interviews: List[Interview]) -> Set[str]:
-    duplicate_interview_names: Set[str] = set()
-    interviews_names: Set[str] = set()
+            site, future = pending.popleft()
+            yield site, future.result()
 
-    for interview in interviews:
-        if interview.interview_name in interviews_names:
-            duplicate_interview_names.add(interview.interview_name)
+        while pending:
+            site, future = pending.popleft()
+            yield site, future.result()
 
-        interviews_names.add(interview.interview_name)
 
-    return duplicate_interview_names
+def route_duplicate_interviews(interviews: InterviewTable) -> int:
+    """
+    Moves the named interviews with duplicate names to the Out-of-SOP
+    interviews, with the note 'Duplicate Interview Name'.
 
+    Interview names include the subject ID, and scans cover whole subjects, so
+    duplicates are found within a batch of scans. Duplicates of interviews of
+    other subjects are routed by the database (see Interview.from_staging_query).
 
-def cast_interviews_to_oosop_interviews(
-    interviews: List[Interview], note: str
-) -> List[OutOfSopInterview]:
-    duplicate_oosop_interviews: List[OutOfSopInterview] = []
-    for interview in interviews:
-        oosop_interview = OutOfSopInterview(
-            interview_path=interview.interview_path,
-            days_since_consent=interview.days_since_consent,  # type: ignore
-            interview_name=interview.interview_name,
-            interview_type=interview.interview_type,
-            subject_id=interview.subject_id,
-            interview_date=interview.interview_date,
-            note=note,
-        )
+    Args:
+        interviews (InterviewTable): The interviews of a batch of scans.
 
-        duplicate_oosop_interviews.append(oosop_interview)
+    Returns:
+        int: The number of duplicates.
+    """
+    duplicates_count = interviews.route_duplicates(note="Duplicate Interview Name")
+    if duplicates_count:
+        logger.debug(f"Routed {duplicates_count} duplicate interviews to Out-of-SOP")
 
-    return duplicate_oosop_interviews
+    return duplicates_count
 
 
-def get_all_interviews(config_file: Path, data_root: Path) -> None:
+def get_watermarks(config_file: Path) -> Dict[str, int]:
     """
-    Retrieves all interviews from the specified data root directory and imports them into a database.
+    Retrieves the modification times of the subject directories when their
+    interviews were last imported, except for the subjects whose consent date
+    changed since.
 
     Args:
         config_file (Path): The path to the configuration file.
-        data_root (Path): The root directory containing the interview data.
 
     Returns:
-        None
+        Dict[str, int]: The modification times (in ns), by subject directory path.
     """
-    sites_path = data_root / "PROTECTED"
-    interviews: List[Interview] = []
-    out_of_sop_interviews: List[OutOfSopInterview] = []
-    global INVALID_INTERVIEW_NAMES_COUNT
-    global ADDITIONAL_FILES_COUNT
-
-    for site_path in sites_path.iterdir():
-        if not site_path.is_dir():
-            continue
+    df = db.execute_sql(
+        config_file=config_file, query=SubjectWatermark.get_watermarks_query()
+    )
 
-        site_name = site_path.name
-        if site_name == "box_transfer":
-            continue
+    return dict(zip(df["subject_path"], df["m_time_ns"].astype(int)))
 
-        try:
-            site_interviews, site_out_of_sop_interviews = get_interviews_from_site(
-                site_path
-            )
-            interviews.extend(site_interviews)
-            out_of_sop_interviews.extend(site_out_of_sop_interviews)
-        except FileNotFoundError:
-            logger.warning(f"Site {site_name} has no raw data")
 
-    logger.info(f"Got {len(interviews)} interviews")
-    logger.warning(f"Invalid interviews count: {INVALID_INTERVIEW_NAMES_COUNT}")
+def get_all_interviews(
+    config_file: Path,
+    data_root: Path,
+    subjects: Optional[Collection[str]] = None,
+    batch_size: int = BATCH_SIZE,
+    incremental: bool = False,
+) -> None:
+    """
+    Retrieves all interviews from the specified data root directory and imports them into a database.
 
-    duplicate_interview_names = get_duplicate_interviews(interviews)
-    sql_queries: List[str] = []
-    duplicate_interviews: List[Interview] = []
+    Interviews are streamed from the scans to the database in batches, so
+    memory use is bounded by the batch and the scans in flight (at most twice
+    as many subjects as workers, see iter_scans; whole sites if SPLIT_SUBJECTS
+    is off). Interviews imported before are updated, and those of the scanned
+    subjects that were not found again are deleted (see InterviewTable.copy).
+    The interviews are named (and their duplicates routed) batch by batch, in
+    one vectorized pass (see name_interviews), or by the database with
+    NAME_IN_DB.
 
-    for interview in interviews:
-        if interview.interview_name in duplicate_interview_names:
-            duplicate_interviews.append(interview)
-            continue
-        query = interview.to_sql()
-        sql_queries.append(query)
-
-    for interview in out_of_sop_interviews:
-        query = interview.to_sql()
-        sql_queries.append(query)
+    Args:
+        config_file (Path): The path to the configuration file.
+        data_root (Path): The root directory containing the interview data.
+        subjects (Optional[Collection[str]], optional): The subject IDs to import
+            interviews of. Defaults to None (all subjects).
+        batch_size (int, optional): The number of interviews to write at once.
+            Defaults to BATCH_SIZE.
+        incremental (bool, optional): Skip the subjects whose directories (and
+            consent date) did not change since their interviews were last
+            imported (see get_subject_m_time_ns), and record the watermarks of
+            the others.
+            Defaults to False.
 
-    duplicate_oosop_interviews: List[
-        OutOfSopInterview
-    ] = cast_interviews_to_oosop_interviews(
-        duplicate_interviews, note="Duplicate Interview Name"
+    Returns:
+        None
+    """
+    interviews_batch: List[InterviewTable] = []
+    interviews_batch_count = 0
+    subject_ids_batch: List[str] = []
+    watermarks_batch: List[SubjectWatermark] = []
+    interviews_count = 0
+    out_of_sop_interviews_count = 0
+    upserted_count = 0
+    # counted once the batches are named (with NAME_IN_DB, by the database)
+    routed_duplicates_count = 0
+    site_stats: Dict[str, ScanStats] = {}
+    stats = ScanStats()
+
+    watermarks: Optional[Dict[str, int]] = None
+    if incremental:
+        watermarks = get_watermarks(config_file=config_file)
+        logger.info(f"Got watermarks of {len(watermarks)} subjects")
+
+    def write_batch() -> None:
+        nonlocal upserted_count, interviews_batch_count, routed_duplicates_count
+
+        interviews = InterviewTable.concat(interviews_batch)
+        if NAME_IN_DB:
+            upserted, routed_duplicates = interviews.copy_unnamed(
+                config_file=config_file, subject_ids=subject_ids_batch, silent=True
+            )
+            upserted_count += upserted
+            routed_duplicates_count += routed_duplicates
+        else:
+            name_interviews(interviews, config_file=config_file)
+            routed_duplicates_count += route_duplicate_interviews(interviews)
+            upserted_count += interviews.copy(
+                config_file=config_file, subject_ids=subject_ids_batch, silent=True
+            )
+        # only once the interviews of the subjects are written
+        db.copy_models(config_file=config_file, models=watermarks_batch, silent=True)
+        interviews_batch.clear()
+        subject_ids_batch.clear()
+        watermarks_batch.clear()
+        interviews_batch_count = 0
+
+    for site, scan in iter_scans(
+        data_root=data_root, subjects=subjects, watermarks=watermarks
+    ):
+        site_stats[site] = site_stats.get(site, ScanStats()) + scan.stats
+        stats += scan.stats
+
+        scan_interviews_count = scan.interviews.count_interviews()
+        interviews_batch.append(scan.interviews)
+        subject_ids_batch.extend(scan.subject_ids)
+        watermarks_batch.extend(scan.watermarks)
+        interviews_batch_count += len(scan.interviews)
+        interviews_count += scan_interviews_count
+        out_of_sop_interviews_count += len(scan.interviews) - scan_interviews_count
+
+        if interviews_batch_count >= batch_size:
+            write_batch()
+
+    write_batch()
+
+    # duplicates are Out-of-SOP interviews, but were counted as interviews
+    interviews_count -= routed_duplicates_count
+    out_of_sop_interviews_count += routed_duplicates_count
+
+    for site, site_scan_stats in site_stats.items():
+        logger.debug(f"Site {site}: {site_scan_stats}")
+
+    if incremental:
+        logger.info(f"Skipped {stats.skipped_subjects} unchanged subjects")
+    logger.info(
+        f"Got {interviews_count} interviews, inserted or updated {upserted_count}"
     )
-
-    logger.info(f"Got {len(duplicate_oosop_interviews)} duplicate interviews")
-    logger.info(f"Got {len(out_of_sop_interviews)} out-of-sop interviews")
+    logger.warning(f"Invalid interviews count: {stats.invalid_interview_names}")
+    logger.info(f"Got {out_of_sop_interviews_count} out-of-sop interviews")
     logger.info("Note: Duplicates are counted as Out-Of-SOP")
-    logger.warning(f"Additional files count: {ADDITIONAL_FILES_COUNT}")
+    logger.warning(f"Additional files count: {stats.additional_files}")
 
-    for interview in duplicate_oosop_interviews:
-        query = interview.to_sql()
-        sql_queries.append(query)
 
-    db.execute_queries(
-        config_file=config_file, queries=sql_queries, show_commands=False
+if __name__ == "__main__":
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--since-manifest",
+        dest="since_manifest",
+        type=Path,
+        nargs="?",
+        const=manifest.get_default_manifest_file(MODULE_NAME),
+        default=None,
+        help="Only import the subjects with changes since the manifest of the \
+previous run (default: data/manifests/<module>.manifest), and update it.",
     )
+    arg_parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help="Skip the subjects whose directory, interview type and interview \
+directories, and consent date, did not change since their interviews were last imported.",
+    )
+    args = arg_parser.parse_args()
 
-
-if __name__ == "__main__":
     console.rule(f"[bold red]{MODULE_NAME}")
 
     config_file = utils.get_config_file_path()
@@ -439,11 +703,26 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
-    config_params = config(config_file, "general")
-    data_root = Path(config_params["data_root"])
+    data_root = get_settings(config_file).general.data_root
     logger.info(f"Data root: {data_root}")
 
+    subjects: Optional[Set[str]] = None
+    if args.since_manifest is not None:
+        current_manifest = manifest.Manifest.scan(data_root=data_root, data_type="raw")
+        changes = manifest.get_changes(args.since_manifest, current_manifest)
+        if changes is not None:
+            subjects = changes.get_subjects()
+            logger.info(f"Importing interviews of {len(subjects)} changed subjects")
+
     logger.info("Getting all interviews")
-    get_all_interviews(config_file=config_file, data_root=data_root)
+    get_all_interviews(
+        config_file=config_file,
+        data_root=data_root,
+        subjects=subjects,
+        incremental=args.incremental,
+    )
+
+    if args.since_manifest is not None:
+        current_manifest.save(args.since_manifest)
 
     logger.info("Done")
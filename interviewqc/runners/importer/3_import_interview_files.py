@@ -19,16 +19,22 @@ except ValueError:
 
 
 import logging
-from typing import List, Tuple
-import os
+from argparse import ArgumentParser
+from typing import Collection, List, Optional, Tuple
 import concurrent.futures
 from concurrent.futures import ProcessPoolExecutor
 
 from rich.logging import RichHandler
 
-from interviewqc.helpers import utils, db
+from interviewqc.helpers import utils, db, query_stats, throttle
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.helpers.config import get_settings
+from interviewqc.helpers.digest_cache import CacheStats
+from interviewqc.helpers.query_stats import QueryStats
+from interviewqc.helpers.throttle import ThrottleStats
 from interviewqc.models.interview_raw import InterviewRaw
-from interviewqc.models.file import File
+from interviewqc.models.file import File, FileBatch
+from interviewqc.fs import manifest, walker
 
 MODULE_NAME = "interviewqc_import_interview_files"
 
@@ -48,21 +54,26 @@ logargs = {
 logging.basicConfig(**logargs)
 
 
-def get_all_interview_paths(config_file: Path) -> List[Tuple[Path, str]]:
+def get_all_interview_paths(
+    config_file: Path, imported: bool = False
+) -> List[Tuple[Path, str]]:
     """
     Retrieves a list of interview paths that have not been imported yet.
 
     Args:
         config_file (Path): The path to the configuration file.
+        imported (bool, optional): Retrieve the interviews that have been imported
+            instead. Defaults to False.
 
     Returns:
         List[Tuple[Path, str]]: A list of interview paths that have not been imported yet.
     """
-    sql_query = """
-    SELECT interview_path, interview_name
+    sql_query = f"""
+    SELECT interviewqc_path(directory_id, path_name) AS interview_path, interview_name
     FROM interviews
-    WHERE interview_path NOT IN (
-        SELECT interview_path FROM interview_raw
+    WHERE {"" if imported else "NOT "}EXISTS (
+        SELECT 1 FROM interview_raw
+        WHERE interview_raw.interview_id = interviews.interview_id
     );
     """
 
@@ -81,38 +92,92 @@ def get_all_interview_paths(config_file: Path) -> List[Tuple[Path, str]]:
     return interview_paths_with_name
 
 
-def scan_all_files_for_interview(interview_path: Path) -> List[File]:
+def scan_all_files_for_interview(interview_path: Path) -> FileBatch:
     """
-    Scans all files in the given interview_path directory and returns a list of File objects.
+    Scans all files in the given interview_path directory, and hashes them.
 
     Args:
         interview_path (Path): The path to the directory containing the interview files.
 
     Returns:
-        List[File]: A list of File objects representing the interview files found in the directory.
+        FileBatch: The interview files found in the directory, with their digests.
     """
-    interview_files: List[File] = []
-
     if interview_path.is_file():
-        interview_file = File.from_path(interview_path)
-        interview_files.append(interview_file)
-        return interview_files
+        file_batch = FileBatch.from_paths([interview_path])
+    else:
+        file_batch = FileBatch.from_dir_entries(
+            [
+                entry
+                for entry in walker.scan_files(interview_path)
+                if not entry.name.startswith(".checksum")  # ignore checksum files
+            ]
+        )
+
+    # hash the files in parallel, reading each file once
+    file_batch.compute_digests()
+
+    return file_batch
 
-    for root, dirs, files in os.walk(interview_path):
-        for file in files:
-            file_path = Path(root) / file
-            if file.startswith(".checksum"):  # ignore checksum files
-                continue
-            interview_file = File.from_path(file_path)
 
-            interview_files.append(interview_file)
+def copy_interview_files(
+    file_batch: FileBatch,
+    interview_name: str,
+    config_file: Path,
+    upsert: bool = False,
+) -> int:
+    """
+    Bulk loads the files of an interview into the 'files' table, and maps them
+    to the interview (interview_raw), in one transaction.
 
-    return interview_files
+    Files that have already been imported are skipped, or updated if modified
+    since (with `upsert`).
+
+    Args:
+        file_batch (FileBatch): The files of the interview.
+        interview_name (str): The name of the interview.
+        config_file (Path): The path to the configuration file.
+        upsert (bool, optional): Whether to update the files imported before.
+            Defaults to False.
+
+    Returns:
+        int: The number of files inserted (or updated).
+    """
+    if len(file_batch) == 0:
+        return 0
+
+    with db.get_connection(config_file) as conn:
+        with conn.cursor() as cur:
+            _, inserted = db.copy_rows_with_cursor(
+                cur=cur,
+                staging_table="file_staging",
+                columns=File.copy_columns(),
+                rows=file_batch.to_copy_rows(),
+                from_staging_query=File.from_staging_query(
+                    "file_staging", upsert=upsert
+                ),
+            )
+            db.copy_rows_with_cursor(
+                cur=cur,
+                staging_table="interview_raw_staging",
+                columns=InterviewRaw.copy_columns(),
+                rows=(
+                    InterviewRaw(
+                        interview_name=interview_name, file_path=Path(file_path)
+                    ).to_copy_row()
+                    for file_path in file_batch.file_paths
+                ),
+                from_staging_query=InterviewRaw.from_staging_query(
+                    "interview_raw_staging"
+                ),
+            )
+        conn.commit()
+
+    return inserted
 
 
 def process_interview_path(
     interview_path_with_name: Tuple[Path, str], config_file: Path
-):
+) -> Tuple[CacheStats, ThrottleStats, QueryStats]:
     """
     Processes a single interview path in a separate process.
 
@@ -121,25 +186,84 @@ def process_interview_path(
         config_file (Path): The path to the configuration file.
 
     Returns:
-        None
+        Tuple[CacheStats, ThrottleStats, QueryStats]: The digest cache and I/O
+            throttle counters, and the query timings, of this interview (as the
+            process' counters are not shared with the parent process).
     """
+    cache_stats = hash_helpers.get_cache_stats()
+    throttle_stats = throttle.get_stats()
+    statement_stats = query_stats.get_stats().copy()
     interview_path, interview_name = interview_path_with_name
 
-    files = scan_all_files_for_interview(interview_path=interview_path)
-    sql_queries = [interview_file.to_sql() for interview_file in files]
+    file_batch = scan_all_files_for_interview(interview_path=interview_path)
+    copy_interview_files(
+        file_batch=file_batch, interview_name=interview_name, config_file=config_file
+    )
 
-    for interview_file in files:
-        interview_mapping = InterviewRaw(
-            interview_name=interview_name, file_path=interview_file.file_path
+    return (
+        hash_helpers.get_cache_stats() - cache_stats,
+        throttle.get_stats() - throttle_stats,
+        query_stats.get_stats() - statement_stats,
+    )
+
+
+def update_interview_files(
+    interview_paths: List[Tuple[Path, str]], config_file: Path
+) -> None:
+    """
+    Imports the files of interviews that have already been imported, e.g. files
+    added since. Files that have already been imported are updated, if they
+    were modified since.
+
+    Args:
+        interview_paths (List[Tuple[Path, str]]): The interview paths, and names.
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        None
+    """
+    with utils.get_progress_bar() as progress:
+        task = progress.add_task(
+            "Updating imported interview files", total=len(interview_paths)
         )
-        sql_queries.append(interview_mapping.to_sql())
 
-    db.execute_queries(
+        for interview_path, interview_name in interview_paths:
+            file_batch = scan_all_files_for_interview(interview_path=interview_path)
+            copy_interview_files(
+                file_batch=file_batch,
+                interview_name=interview_name,
+                config_file=config_file,
+                upsert=True,
+            )
+            progress.update(task, advance=1)
+
+
+def delete_removed_files(file_paths: List[Path], config_file: Path) -> int:
+    """
+    Deletes the files removed from the filesystem (see manifest.ManifestDiff)
+    from the 'files' table, with their interview_raw and transcripts rows.
+
+    Args:
+        file_paths (List[Path]): The paths of the removed files.
+        config_file (Path): The path to the configuration file.
+
+    Returns:
+        int: The number of files deleted.
+    """
+    if not file_paths:
+        return 0
+
+    staging_table = "removed_file_staging"
+    _, deleted = db.copy_rows(
         config_file=config_file,
-        queries=sql_queries,
-        show_commands=False,
-        silent=True,
+        staging_table=staging_table,
+        columns=File.delete_copy_columns(),
+        rows=((str(file_path),) for file_path in file_paths),
+        from_staging_query=File.delete_staged_query(staging_table),
     )
+    logger.info(f"Deleted {deleted} removed files")
+
+    return deleted
 
 
 def wrapper_process_interview_path(args):
@@ -155,12 +279,23 @@ def wrapper_process_interview_path(args):
     return process_interview_path(*args)
 
 
-def scan_for_interview_files(config_file: Path):
+def scan_for_interview_files(
+    config_file: Path,
+    changed_paths: Optional[Collection[Path]] = None,
+    removed_file_paths: Optional[List[Path]] = None,
+):
     """
     Scans for interview files and processes them.
 
     Args:
         config_file (Path): The path to the configuration file.
+        changed_paths (Optional[Collection[Path]], optional): The paths of the
+            interviews with changes (see manifest.ManifestDiff). The files of those
+            that have already been imported are imported again (new and modified
+            files). Defaults to None.
+        removed_file_paths (Optional[List[Path]], optional): The paths of the
+            files removed since the previous run, deleted from the database.
+            Defaults to None.
 
     Returns:
         None
@@ -168,6 +303,24 @@ def scan_for_interview_files(config_file: Path):
     global PARALLEL
     global NUM_WORKERS
 
+    if removed_file_paths:
+        delete_removed_files(file_paths=removed_file_paths, config_file=config_file)
+
+    if changed_paths:
+        changed_interview_paths = [
+            (interview_path, interview_name)
+            for interview_path, interview_name in get_all_interview_paths(
+                config_file=config_file, imported=True
+            )
+            if interview_path in changed_paths
+        ]
+        logger.info(
+            f"Updating {len(changed_interview_paths)} imported interviews with changes"
+        )
+        update_interview_files(
+            interview_paths=changed_interview_paths, config_file=config_file
+        )
+
     interview_paths = get_all_interview_paths(config_file=config_file)
 
     with utils.get_progress_bar() as progress:
@@ -185,45 +338,43 @@ def scan_for_interview_files(config_file: Path):
                 ]
 
                 for future in concurrent.futures.as_completed(futures):
+                    cache_stats, throttle_stats, statement_stats = future.result()
+                    hash_helpers.record_cache_stats(cache_stats)
+                    throttle.record_stats(throttle_stats)
+                    query_stats.record_stats(statement_stats)
                     progress.update(task, advance=1)
 
         # with multiprocessing.Pool() as pool:
         #     pool.starmap(process_interview_path, [(path, config_file) for path in interview_paths])
 
         else:
-            for interview_path_with_name in interview_paths:
+            for interview_path, interview_name in interview_paths:
                 progress.update(task, advance=1)
-                files: List[File] = []
-
-                interview_path, interview_name = interview_path_with_name
 
-                interview_files = scan_all_files_for_interview(
+                file_batch = scan_all_files_for_interview(
                     interview_path=interview_path
                 )
-                files.extend(interview_files)
-
-                sql_queries: List[str] = []
-                for interview_file in files:
-                    query = interview_file.to_sql()
-                    sql_queries.append(query)
-
-                for interview_file in interview_files:
-                    interview_mapping = InterviewRaw(
-                        interview_name=interview_name,
-                        file_path=interview_file.file_path,
-                    )
-
-                    sql_queries.append(interview_mapping.to_sql())
-
-                db.execute_queries(
+                copy_interview_files(
+                    file_batch=file_batch,
+                    interview_name=interview_name,
                     config_file=config_file,
-                    queries=sql_queries,
-                    show_commands=False,
-                    silent=True,
                 )
 
 
 if __name__ == "__main__":
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--since-manifest",
+        dest="since_manifest",
+        type=Path,
+        nargs="?",
+        const=manifest.get_default_manifest_file(MODULE_NAME),
+        default=None,
+        help="Also import new and modified files of imported interviews, and delete \
+removed files, from the changes since the manifest of the previous run (default: data/manifests/<module>.manifest), and update it.",
+    )
+    args = arg_parser.parse_args()
+
     console.rule(f"[bold red]{MODULE_NAME}")
 
     config_file = utils.get_config_file_path()
@@ -233,7 +384,34 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
+    hash_helpers.configure(config_file=config_file)
+    # the worker processes share the I/O limits
+    throttle.configure(
+        config_file=config_file, processes=NUM_WORKERS if PARALLEL else 1
+    )
+
+    changed_paths: Optional[Collection[Path]] = None
+    removed_file_paths: Optional[List[Path]] = None
+    if args.since_manifest is not None:
+        data_root = get_settings(config_file).general.data_root
+        current_manifest = manifest.Manifest.scan(
+            data_root=data_root, data_type="raw", recursive=True
+        )
+        changes = manifest.get_changes(args.since_manifest, current_manifest)
+        if changes is not None:
+            changed_paths = changes.get_interview_paths(data_root)
+            removed_file_paths = changes.removed.get_file_paths()
+
     logger.info("Getting all interview files")
-    scan_for_interview_files(config_file=config_file)
+    scan_for_interview_files(
+        config_file=config_file,
+        changed_paths=changed_paths,
+        removed_file_paths=removed_file_paths,
+    )
+    hash_helpers.log_cache_stats(logger)
+    throttle.log_stats(logger)
+
+    if args.since_manifest is not None:
+        current_manifest.save(args.since_manifest)
 
     logger.info("Done")
@@ -18,12 +18,16 @@ except ValueError:
     pass
 
 import logging
-from typing import List, Optional
+import os
+from argparse import ArgumentParser
+from typing import Collection, List, Optional, Set
 
 from rich.logging import RichHandler
 
 from interviewqc.helpers import utils, db
-from interviewqc.helpers.config import config
+from interviewqc.helpers.config import get_settings
+from interviewqc.fs import manifest, walker
+from interviewqc.models.file import FileBatch
 from interviewqc.models.transcripts import Transcript
 
 
@@ -115,13 +119,17 @@ def get_transcript_days_since_consent(transcript_path: Path) -> int:
 
 
 def get_transcripts_from_dir(
-    config_file: Path, interview_type_path: Path, subject_id: str, interview_type: str
+    config_file: Path,
+    interview_type_entries: List[os.DirEntry],
+    subject_id: str,
+    interview_type: str,
 ) -> List[Transcript]:
     """
     Retrieves a list of transcripts from the specified interview type path.
 
     Args:
-        interview_type_path (Path): The path to the interview type directory.
+        interview_type_entries (List[os.DirEntry]): The entries of the interview
+            type directory (see walker.scandir).
         subject_id (str): The ID of the subject.
         interview_type (str): The type of interview.
 
@@ -131,11 +139,15 @@ def get_transcripts_from_dir(
     global MISALIGNED_TRANSCRIPTS_COUNT
     transcripts: List[Transcript] = []
 
-    transcripts_path = interview_type_path / "transcripts"
-    if not transcripts_path.exists():
-        return transcripts
-
-    transcript_files_path = transcripts_path.glob("*.txt")
+    transcript_files_path = [
+        Path(entry.path)
+        for relative_dir, entry in walker.iter_entries(
+            interview_type_entries, subdirectories=["transcripts"]
+        )
+        if relative_dir == "transcripts"
+        and entry.name.endswith(".txt")
+        and not entry.is_dir()
+    ]
 
     for transcript_path in transcript_files_path:
         days_since_consent = get_transcript_days_since_consent(transcript_path)
@@ -171,33 +183,28 @@ def get_transcripts_from_dir(
 
 def get_transcripts_from_subject(
     config_file: Path,
-    subject_path: Path,
+    subject_path: os.DirEntry,
 ) -> List[Transcript]:
     """
     Retrieves a list of interviews from the specified subject path.
 
     Args:
-        subject_path (Path): The path to the subject directory.
+        subject_path (os.DirEntry): The subject directory.
 
     Returns:
         List[Transcript]: A list of Interview objects.
     """
     subject_id = subject_path.name
-    interview_path = subject_path / "interviews"
 
     transcripts: List[Transcript] = []
 
-    interview_types = ["open", "psychs"]
-
-    for interview_type in interview_types:
-        interview_type_path = interview_path / interview_type
-        if not interview_type_path.exists():
-            continue
-
+    for interview_type, _, interview_type_entries in walker.iter_interview_types(
+        subject_path
+    ):
         subject_transcripts = get_transcripts_from_dir(
             config_file=config_file,
             interview_type=interview_type,
-            interview_type_path=interview_type_path,
+            interview_type_entries=interview_type_entries,
             subject_id=subject_id,
         )
         transcripts.extend(subject_transcripts)
@@ -207,31 +214,27 @@ def get_transcripts_from_subject(
 
 def get_transcripts_from_site(
     config_file: Path,
-    site_path: Path,
+    site_path: os.DirEntry,
+    subjects: Optional[Collection[str]] = None,
 ) -> List[Transcript]:
     """
     Retrieves a list of transcripts from the specified site path.
 
+    Sites without processed data are logged, and skipped.
+
     Args:
-        site_path (Path): The path to the site directory.
+        site_path (os.DirEntry): The site directory.
+        subjects (Optional[Collection[str]], optional): The subject IDs to get
+            transcripts from. Defaults to None (all subjects).
 
     Returns:
         List[Transcript]: A list of Transcript objects.
-
-    Raises:
-        FileNotFoundError: If the subjects path does not exist.
     """
-    subjects_path = site_path / "processed"
     transcripts: List[Transcript] = []
 
-    if not subjects_path.exists():
-        raise FileNotFoundError(f"Subjects path {subjects_path} does not exist")
-
-    subjects_path_list: List[Path] = []
-    for subject_path in subjects_path.iterdir():
-        if not subject_path.is_dir():
-            continue
-        subjects_path_list.append(subject_path)
+    subjects_path_list: List[os.DirEntry] = list(
+        walker.iter_subjects(site_path, data_type="processed", subjects=subjects)
+    )
 
     with utils.get_progress_bar() as progress:
         task = progress.add_task(
@@ -248,54 +251,58 @@ def get_transcripts_from_site(
     return transcripts
 
 
-def import_all_transcripts(config_file: Path, data_root: Path) -> None:
+def import_all_transcripts(
+    config_file: Path,
+    data_root: Path,
+    subjects: Optional[Collection[str]] = None,
+) -> None:
     """
     Retrieves all transcripts from the specified data root directory and imports them into a database.
 
     Args:
         config_file (Path): The path to the configuration file.
         data_root (Path): The root directory containing the study data.
+        subjects (Optional[Collection[str]], optional): The subject IDs to import
+            transcripts of. Defaults to None (all subjects).
 
     Returns:
         None
     """
-    sites_path = data_root / "PROTECTED"
     transcripts: List[Transcript] = []
 
-    for site_path in sites_path.iterdir():
-        if not site_path.is_dir():
-            continue
-
-        site_name = site_path.name
-        if site_name == "box_transfer":
-            continue
-
-        try:
-            site_transcripts = get_transcripts_from_site(
-                config_file=config_file, site_path=site_path
-            )
-            transcripts.extend(site_transcripts)
-            logger.info(
-                f"Got {len(site_transcripts)} transcripts from site {site_name}"
-            )
-
-        except FileNotFoundError:
-            logger.warning(f"Site {site_name} has no raw data")
+    for site_path in walker.iter_sites(data_root):
+        site_transcripts = get_transcripts_from_site(
+            config_file=config_file, site_path=site_path, subjects=subjects
+        )
+        transcripts.extend(site_transcripts)
+        logger.info(
+            f"Got {len(site_transcripts)} transcripts from site {site_path.name}"
+        )
 
     logger.info(f"Got {len(transcripts)} transcripts")
 
-    sql_queries: List[str] = []
-
-    for transcript in transcripts:
-        queries = transcript.to_sql()
-        sql_queries.extend(queries)
-
-    db.execute_queries(
-        config_file=config_file, queries=sql_queries, show_commands=False
+    # transcripts reference their file in the 'files' table
+    transcript_files = FileBatch.from_paths(
+        [transcript.transcript_path for transcript in transcripts]
     )
+    transcript_files.copy(config_file=config_file)
+    db.copy_models(config_file=config_file, models=transcripts)
 
 
 if __name__ == "__main__":
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--since-manifest",
+        dest="since_manifest",
+        type=Path,
+        nargs="?",
+        const=manifest.get_default_manifest_file(MODULE_NAME),
+        default=None,
+        help="Only import the transcripts of subjects with changes since the \
+manifest of the previous run (default: data/manifests/<module>.manifest), and update it.",
+    )
+    args = arg_parser.parse_args()
+
     console.rule(f"[bold red]{MODULE_NAME}")
 
     config_file = utils.get_config_file_path()
@@ -305,12 +312,26 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
-    config_params = config(config_file, "general")
-    data_root = Path(config_params["data_root"])
+    data_root = get_settings(config_file).general.data_root
     logger.info(f"Data root: {data_root}")
 
+    subjects: Optional[Set[str]] = None
+    if args.since_manifest is not None:
+        current_manifest = manifest.Manifest.scan(
+            data_root=data_root, data_type="processed", subdirectories=["transcripts"]
+        )
+        changes = manifest.get_changes(args.since_manifest, current_manifest)
+        if changes is not None:
+            subjects = changes.get_subjects()
+            logger.info(f"Importing transcripts of {len(subjects)} changed subjects")
+
     logger.info("Getting all interviews")
-    import_all_transcripts(config_file=config_file, data_root=data_root)
+    import_all_transcripts(
+        config_file=config_file, data_root=data_root, subjects=subjects
+    )
+
+    if args.since_manifest is not None:
+        current_manifest.save(args.since_manifest)
 
     logger.info(f"Got {MISALIGNED_TRANSCRIPTS_COUNT} misaligned transcripts")
     logger.debug(
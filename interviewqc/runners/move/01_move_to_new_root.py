@@ -20,13 +20,15 @@ except ValueError:
 
 import logging
 from argparse import ArgumentParser
-from typing import List
+from typing import Dict, List
 import os
 import shutil
 
 from rich.logging import RichHandler
 
-from interviewqc.helpers import utils, db
+from interviewqc.helpers import utils, db, move, throttle
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.fs import walker
 from interviewqc.models.moved_file import MovedFile
 
 MODULE_NAME = "interviewqc_move_to_new_root"
@@ -60,7 +62,9 @@ def get_new_path(old_path: Path, data_root: Path, backup_root: Path) -> Path:
     return new_path
 
 
-def log_move(config_file: Path, old_path: Path, new_path: Path):
+def log_move(
+    config_file: Path, old_path: Path, new_path: Path, digests: Dict[str, str]
+):
     """
     Logs a move to the database.
 
@@ -68,10 +72,13 @@ def log_move(config_file: Path, old_path: Path, new_path: Path):
         config_file (Path): The path to the configuration file.
         old_path (Path): The old path of the file.
         new_path (Path): The new path of the file.
+        digests (Dict[str, str]): The digests of the file, by algorithm.
     """
 
     moved_file = MovedFile(
-        source_file_path=str(old_path), destination_file_path=str(new_path)
+        source_file_path=str(old_path),
+        destination_file_path=str(new_path),
+        digests=digests,
     )
 
     query = moved_file.to_sql()
@@ -81,23 +88,16 @@ def log_move(config_file: Path, old_path: Path, new_path: Path):
 
 
 def move_subject(
-    config_file: Path, subject_dir: Path, data_root: Path, backup_root: Path
+    config_file: Path, subject_dir: os.DirEntry, data_root: Path, backup_root: Path
 ):
-    interviews_dir = subject_dir / "interviews"
-
-    interview_types: List[str] = ["open", "psychs"]
-
-    for interview_type in interview_types:
-        interview_type_dir = interviews_dir / interview_type
-
-        if not interview_type_dir.exists():
-            continue
+    for _, interview_type_dir, entries in walker.iter_interview_types(subject_dir):
+        interview_type_dir = Path(interview_type_dir)
 
-        interview_files: List[Path] = []
-        for root, dirs, files in os.walk(interview_type_dir):
-            for file in files:
-                file_path = Path(root) / file
-                interview_files.append(file_path)
+        interview_files: List[Path] = [
+            Path(entry.path)
+            for _, entry in walker.iter_entries(entries, recursive=True)
+            if not entry.is_dir()
+        ]
 
         for file_path in interview_files:
             new_path = get_new_path(
@@ -108,8 +108,17 @@ def move_subject(
                 new_path.parent.mkdir(parents=True, exist_ok=True)
 
             logger.debug(f"Moving {file_path} to {new_path}")
-            shutil.move(src=file_path, dst=new_path)
-            log_move(config_file=config_file, old_path=file_path, new_path=new_path)
+            digests = move.move_file(
+                source=file_path,
+                destination=new_path,
+                hash_types=MovedFile.hash_types(),
+            )
+            log_move(
+                config_file=config_file,
+                old_path=file_path,
+                new_path=new_path,
+                digests=digests,
+            )
 
         shutil.rmtree(path=interview_type_dir)
         # recreate the directory (empty)
@@ -126,8 +135,9 @@ def move_site(
         logger.error(f"Site path {site_path} does not exist")
         raise FileNotFoundError(f"Site path {site_path} does not exist")
 
-    subjects_dir = site_path.iterdir()
-    subjects_dir_list: List[Path] = [subject_dir for subject_dir in subjects_dir]
+    subjects_dir_list: List[os.DirEntry] = list(
+        walker.iter_subjects(site_path.parent, data_type="raw")
+    )
 
     with utils.get_progress_bar() as progress_bar:
         task = progress_bar.add_task(
@@ -152,15 +162,16 @@ if __name__ == "__main__":
     utils.configure_logging(
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
+    hash_helpers.configure(config_file=config_file)
+    throttle.configure(config_file=config_file)
 
-    config_params = utils.config(config_file, "general")
-    data_root = Path(config_params["data_root"])
-    network = config_params["network"]
+    settings = utils.get_settings(config_file)
+    data_root = settings.general.data_root
+    network = settings.general.require_network()
     logger.info(f"Data root: {data_root}")
     logger.info(f"Network: {network}")
 
-    config_params = utils.config(config_file, "move")
-    backup_root = Path(config_params["backup_root"])
+    backup_root = settings.move.backup_root
     logger.info(f"Backup root: {backup_root}")
 
     arg_parser = ArgumentParser()
@@ -186,4 +197,6 @@ if __name__ == "__main__":
             backup_root=backup_root,
         )
 
+    hash_helpers.log_cache_stats(logger)
+    throttle.log_stats(logger)
     logger.info("Done")
@@ -25,7 +25,9 @@ import os
 
 from rich.logging import RichHandler
 
-from interviewqc.helpers import utils, db, hash, cli
+from interviewqc.helpers import utils, cli, dedup, throttle
+from interviewqc.helpers import hash as hash_helpers
+from interviewqc.fs import walker
 
 MODULE_NAME = "interviewqc_move_remove_duplicates"
 
@@ -41,62 +43,35 @@ logargs = {
 logging.basicConfig(**logargs)
 
 
-def get_moved_files_by_hash(config_file: Path, md5_hash: str) -> List[Path]:
-    """
-    Get all the files that have been moved with the same hash.
-
-    Args:
-        config_file (Path): The path to the config file.
-        md5_hash (str): The hash to search for.
-
-    Returns:
-        List[Path]: A list of paths to the files that have been moved with the same hash.
-    """
-
-    query = f"""
-        SELECT destination_file_path FROM moved_files
-        WHERE md5 = '{md5_hash}';
-    """
-
-    moved_files_df = db.execute_sql(config_file=config_file, query=query)
-
-    moved_files: List[Path] = []
-    for _, row in moved_files_df.iterrows():
-        moved_files.append(Path(row["destination_file_path"]))
-
-    return moved_files
-
-
-def clear_subject(config_file: Path, subject_dir: Path, backup_root: Path):
-    interviews_dir = subject_dir / "interviews"
-
-    interview_types: List[str] = ["open", "psychs"]
-
-    for interview_type in interview_types:
-        interview_type_dir = interviews_dir / interview_type
-
-        if not interview_type_dir.exists():
-            continue
+def clear_subject(
+    moved_file_index: dedup.MovedFileIndex,
+    subject_dir: os.DirEntry,
+    backup_root: Path,
+):
+    for _, interview_type_dir, entries in walker.iter_interview_types(subject_dir):
+        interview_type_dir = Path(interview_type_dir)
 
-        interview_files: List[Path] = []
-        for root, dirs, files in os.walk(interview_type_dir):
-            for file in files:
-                file_path = Path(root) / file
-                interview_files.append(file_path)
+        interview_files: List[Path] = [
+            Path(entry.path)
+            for _, entry in walker.iter_entries(entries, recursive=True)
+            if not entry.is_dir()
+        ]
 
         for interview_file in interview_files:
-            md5_hash = hash.compute_hash(interview_file)
-            moved_files = get_moved_files_by_hash(
-                config_file=config_file, md5_hash=md5_hash
-            )
+            moved_files = moved_file_index.find_duplicates(interview_file)
 
-            logger.info(f"Found {len(moved_files)} files with hash {md5_hash}")
             if len(moved_files) >= 1:
+                logger.info(f"Found {len(moved_files)} copies of {interview_file}")
                 cli.remove_files(files=moved_files, base_dir=backup_root, logger=logger)
+                moved_file_index.remove(moved_files)
 
 
 def clear_site(
-    config_file: Path, site_name: str, network: str, data_root: Path, backup_root: Path
+    moved_file_index: dedup.MovedFileIndex,
+    site_name: str,
+    network: str,
+    data_root: Path,
+    backup_root: Path,
 ):
     logger.info(f"Clearing site {site_name}")
     site_path = data_root / "PROTECTED" / f"{network}{site_name}" / "raw"
@@ -105,8 +80,9 @@ def clear_site(
         logger.error(f"Site path {site_path} does not exist")
         raise FileNotFoundError(f"Site path {site_path} does not exist")
 
-    subjects_dir = site_path.iterdir()
-    subjects_dir_list: List[Path] = [subject_dir for subject_dir in subjects_dir]
+    subjects_dir_list: List[os.DirEntry] = list(
+        walker.iter_subjects(site_path.parent, data_type="raw")
+    )
 
     with utils.get_progress_bar() as progress_bar:
         task = progress_bar.add_task(
@@ -115,7 +91,7 @@ def clear_site(
         for subject_dir in subjects_dir_list:
             progress_bar.update(task, advance=1, description=subject_dir.name)
             clear_subject(
-                config_file=config_file,
+                moved_file_index=moved_file_index,
                 subject_dir=subject_dir,
                 backup_root=backup_root,
             )
@@ -130,15 +106,16 @@ if __name__ == "__main__":
     utils.configure_logging(
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
+    hash_helpers.configure(config_file=config_file)
+    throttle.configure(config_file=config_file)
 
-    config_params = utils.config(config_file, "general")
-    data_root = Path(config_params["data_root"])
-    network = config_params["network"]
+    settings = utils.get_settings(config_file)
+    data_root = settings.general.data_root
+    network = settings.general.require_network()
     logger.info(f"Data root: {data_root}")
     logger.info(f"Network: {network}")
 
-    config_params = utils.config(config_file, "move")
-    backup_root = Path(config_params["backup_root"])
+    backup_root = settings.move.backup_root
     logger.info(f"Backup root: {backup_root}")
 
     arg_parser = ArgumentParser()
@@ -155,13 +132,18 @@ if __name__ == "__main__":
     sites = args.sites
     logger.info(f"Sites: {sites}")
 
+    moved_file_index = dedup.MovedFileIndex.load(config_file=config_file)
+
     for site in sites:
         clear_site(
-            config_file=config_file,
+            moved_file_index=moved_file_index,
             site_name=site,
             network=network,
             data_root=data_root,
             backup_root=backup_root,
         )
 
+    logger.info(f"Duplicates: {moved_file_index.stats}")
+    hash_helpers.log_cache_stats(logger)
+    throttle.log_stats(logger)
     logger.info("Done")
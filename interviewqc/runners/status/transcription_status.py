@@ -21,17 +21,25 @@ except ValueError:
 
 
 import logging
-from typing import List, Dict, Set, Tuple
+import os
+from argparse import ArgumentParser
+from typing import Any, Collection, Iterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime
 
 from rich.logging import RichHandler
 import pandas as pd
+import psycopg2
 
 from interviewqc.helpers import cli, utils, db, dpdash, sheets
+from interviewqc.fs import manifest, walker
 from interviewqc.models.transcription_status import TranscriptionStatus
 
 MODULE_NAME = "interviewqc.runners.status.transcription_status"
 
+# Number of statuses committed per transaction, when inserting them one by one
+# after the bulk load failed (see status_df_to_db)
+CHUNK_SIZE = 1000
+
 console = utils.get_console()
 
 logger = logging.getLogger(MODULE_NAME)
@@ -112,21 +120,27 @@ def get_day_session_map(audio_dir: Path) -> Dict[int, int]:
         Dict[int, int]: A map of day to session number.
     """
     day_to_session_map: Dict[int, int] = {}
-    for audio in audio_dir.glob("*.wav"):
+    for audio in walker.scandir(audio_dir) or []:
         # site_subject_interviewAudioTranscript_<type>_day0001_session001.wav
         file_name = audio.name
+        if file_name.startswith(".") or not file_name.endswith(".wav"):
+            continue
         day, session = get_day_and_session_from_filename(file_name)
         day_to_session_map[day] = session
 
     return fix_day_to_session_map(day_to_session_map)
 
 
-def explore_subject_status(subject_interview_dir: Path) -> Dict[int, Tuple[int, str]]:
+def explore_subject_status(
+    subject_interview_dir: Path, subject_interview_entries: List[os.DirEntry]
+) -> Dict[int, Tuple[int, str]]:
     """
     Returns a Map of Day to Session number, Status
 
     Args:
         subject_interview_dir (Path): The directory containing the subject's interviews.
+        subject_interview_entries (List[os.DirEntry]): The entries of the directory
+            (see walker.scandir).
 
     Returns:
         Dict[int, Tuple[int, str]]: A map of day to session number and status.
@@ -141,9 +155,13 @@ def explore_subject_status(subject_interview_dir: Path) -> Dict[int, Tuple[int,
         "completed": subject_interview_dir / "completed_audio",
     }
 
+    existing_dirs = {
+        entry.name for entry in subject_interview_entries if entry.is_dir()
+    }
+
     day_to_session_maps: Dict[str, Dict[int, int]] = {}
     for status, status_dir in status_dir_map.items():
-        if not status_dir.exists():
+        if status_dir.name not in existing_dirs:
             continue
 
         day_to_session_map = get_day_session_map(status_dir)
@@ -173,83 +191,97 @@ map as {day_status_map[day]}"
     return day_to_session_status_map
 
 
-def get_pipeline_status_df(data_root: Path, network: str) -> pd.DataFrame:
+def get_pipeline_status_df(
+    data_root: Path,
+    network: Optional[str] = None,
+    subjects: Optional[Collection[str]] = None,
+) -> pd.DataFrame:
     """
     Get the pipeline status of the interviews.
 
     Args:
         data_root (Path): The root directory of the data.
-        network (str): The network name.
+        network (Optional[str], optional): The network name. Defaults to None
+            (all networks).
+        subjects (Optional[Collection[str]], optional): The subject IDs to get
+            the status of. Defaults to None (all subjects).
 
     Returns:
         pd.DataFrame: A DataFrame containing the pipeline status of the interviews.
     """
-    df = pd.DataFrame()
-    protected_dir = data_root / "PROTECTED"
+    data: List[Dict[str, Any]] = []
 
-    studies = protected_dir.iterdir()
-    studies = [s.name for s in studies if s.is_dir() and s.name.startswith(network)]
-    studies = sorted(studies)
-
-    def add_data_to_df(
+    def add_data(
         subject: str,
         study: str,
         interview_type: str,
         status_map: Dict[int, Tuple[int, str]],
-        df: pd.DataFrame,
-    ) -> pd.DataFrame:
-        data = []
+    ) -> None:
         for day, session_status in status_map.items():
-            interview_name = dpdash.get_dpdash_name(
-                study=study,
-                subject=subject,
-                data_type="interview",
-                category=interview_type,
-                time_range=f"day{day:04d}",
-            )
             session, status = session_status
             data.append(
                 {
                     "subject_id": subject,
                     "study_id": study,
                     "interview_type": interview_type,
-                    "interview_name": interview_name,
                     "day": day,
                     "session": session,
                     "pipeline_status": status,
                 }
             )
-        df = pd.concat([df, pd.DataFrame(data)])
-
-        return df
 
-    for study in studies:
-        study_dir = protected_dir / study
-        interviews_dir = study_dir / "processed"
-        if not interviews_dir.exists():
-            continue
-
-        subjects = interviews_dir.iterdir()
-        subjects = [s.name for s in subjects if s.is_dir()]
-
-        for subject in subjects:
-            subject_dir = interviews_dir / subject
-            interview_dir = subject_dir / "interviews"
-
-            for interview_type in ["open", "psychs"]:
-                interview_type_dir = interview_dir / interview_type
-                if not interview_type_dir.exists():
-                    continue
-
-                status_dict = explore_subject_status(interview_type_dir)
-                df = add_data_to_df(
+    # sites and subjects are listed in order of name
+    for study_dir in walker.iter_sites(data_root, network=network):
+        study = study_dir.name
+        for subject_dir in walker.iter_subjects(
+            study_dir, data_type="processed", subjects=subjects
+        ):
+            subject = subject_dir.name
+
+            for (
+                interview_type,
+                interview_type_dir,
+                interview_type_entries,
+            ) in walker.iter_interview_types(subject_dir):
+                status_dict = explore_subject_status(
+                    Path(interview_type_dir), interview_type_entries
+                )
+                add_data(
                     subject=subject,
                     study=study,
                     interview_type=interview_type,
                     status_map=status_dict,
-                    df=df,
                 )
 
+    if len(data) == 0:
+        return pd.DataFrame(
+            columns=[
+                "subject_id",
+                "study_id",
+                "interview_type",
+                "interview_name",
+                "day",
+                "session",
+                "pipeline_status",
+            ]
+        )
+
+    df = pd.DataFrame(data)
+
+    # Generate the names of all the interviews at once
+    interview_names = dpdash.get_dpdash_names(
+        pd.DataFrame(
+            {
+                "study": df["study_id"],
+                "subject": df["subject_id"],
+                "data_type": "interview",
+                "category": df["interview_type"],
+                "time_range": "day" + df["day"].astype(str).str.zfill(4),
+            }
+        )
+    )
+    df.insert(3, "interview_name", interview_names)
+
     return df
 
 
@@ -407,18 +439,30 @@ def add_qc_to_df(
 
 
 def add_qc_status(
-    status_df: pd.DataFrame, data_root: Path, network: str
+    status_df: pd.DataFrame,
+    data_root: Path,
+    network: Optional[str] = None,
+    subjects: Optional[Collection[str]] = None,
 ) -> pd.DataFrame:
     """
     Adds the QC status to the DataFrame.
 
     Args:
         status_df (pd.DataFrame): The DataFrame containing the status of the interviews.
+        data_root (Path): The root directory of the data.
+        network (Optional[str], optional): The network name. Defaults to None
+            (all networks).
+        subjects (Optional[Collection[str]], optional): The subject IDs to add
+            the QC status of. Defaults to None (all subjects).
     """
     general_dir = data_root / "GENERAL"
 
     studies = general_dir.iterdir()
-    studies = [s.name for s in studies if s.is_dir() and s.name.startswith(network)]
+    studies = [
+        s.name
+        for s in studies
+        if s.is_dir() and (network is None or s.name.startswith(network))
+    ]
 
     for study in studies:
         study_dir = general_dir / study
@@ -426,10 +470,14 @@ def add_qc_status(
         if not interviews_dir.exists():
             continue
 
-        subjects = interviews_dir.iterdir()
-        subjects = [s.name for s in subjects if s.is_dir()]
+        subject_ids = interviews_dir.iterdir()
+        subject_ids = [
+            s.name
+            for s in subject_ids
+            if s.is_dir() and (subjects is None or s.name in subjects)
+        ]
 
-        for subject in subjects:
+        for subject in subject_ids:
             subject_dir = interviews_dir / subject
             interview_dir = subject_dir / "interviews"
 
@@ -458,6 +506,33 @@ def add_qc_status(
     return status_df
 
 
+def merge_with_previous_df(
+    status_df: pd.DataFrame, previous_df: pd.DataFrame, subjects: Collection[str]
+) -> pd.DataFrame:
+    """
+    Merges the status of the changed subjects with the previous status of the
+    other subjects.
+
+    Args:
+        status_df (pd.DataFrame): The status of the changed subjects.
+        previous_df (pd.DataFrame): The previous status of all subjects.
+        subjects (Collection[str]): The IDs of the changed subjects.
+
+    Returns:
+        pd.DataFrame: The status of all subjects.
+    """
+    unchanged_df = previous_df[~previous_df["subject_id"].isin(list(subjects))]
+    logger.info(
+        f"Reusing {len(unchanged_df)} statuses of \
+{unchanged_df['subject_id'].nunique()} unchanged subjects"
+    )
+
+    if status_df.empty:
+        return unchanged_df.copy()
+
+    return pd.concat([unchanged_df, status_df], ignore_index=True)
+
+
 def finalize_df(status_df: pd.DataFrame) -> pd.DataFrame:
     """
     Fills in missing values in the DataFrame with meaningful defaults.
@@ -499,12 +574,19 @@ def status_df_to_db(config_file: Path, status_df: pd.DataFrame) -> None:
 
     Note: This will delete all existing data in the 'transcription_status' table!
 
+    The statuses are bulk loaded in one transaction. If that fails, they are
+    inserted one by one in chunks of CHUNK_SIZE (see db.execute_queries), so
+    that only the failing rows are left out.
+
     Args:
         config_file (Path): The path to the configuration file.
         status_df (pd.DataFrame): The DataFrame containing the status of the interviews.
 
     Returns:
         None
+
+    Raises:
+        db.QueryBatchError: If rows failed to be inserted one by one.
     """
     sql_queries: List[str] = [
         TranscriptionStatus.drop_table_query(),
@@ -514,38 +596,64 @@ def status_df_to_db(config_file: Path, status_df: pd.DataFrame) -> None:
         "This will delete all existing data in the 'transcription_status' table!"
     )
 
-    for _, row in status_df.iterrows():
-        session = row["session"]
-        if pd.isna(session):
-            session = None
-        else:
-            session = int(session)
+    def get_transcription_statuses() -> Iterator[TranscriptionStatus]:
+        for _, row in status_df.iterrows():
+            session = row["session"]
+            if pd.isna(session):
+                session = None
+            else:
+                session = int(session)
+
+            if pd.isna(row["interview_length_minutes"]):
+                interview_length_minutes = None
+            else:
+                interview_length_minutes = row["interview_length_minutes"]
+
+            transcription_status = TranscriptionStatus(
+                subject_id=row["subject_id"],
+                study_id=row["study_id"],
+                interview_type=row["interview_type"],
+                interview_name=row["interview_name"],
+                session=session,
+                pipeline_status=row["pipeline_status"],
+                transcript_file_status=row["transcript_status"],
+                qc_status=row["qc_status"],
+                interview_length_minutes=interview_length_minutes,
+            )
 
-        if pd.isna(row["interview_length_minutes"]):
-            interview_length_minutes = None
-        else:
-            interview_length_minutes = row["interview_length_minutes"]
-
-        transcription_status = TranscriptionStatus(
-            subject_id=row["subject_id"],
-            study_id=row["study_id"],
-            interview_type=row["interview_type"],
-            interview_name=row["interview_name"],
-            session=session,
-            pipeline_status=row["pipeline_status"],
-            transcript_file_status=row["transcript_status"],
-            qc_status=row["qc_status"],
-            interview_length_minutes=interview_length_minutes,
-        )
+            yield transcription_status
 
-        sql_queries.append(transcription_status.to_sql())
+    # recreated in the same transaction as the COPY, so a failure keeps the old rows
+    try:
+        inserted = db.copy_models(
+            config_file=config_file,
+            models=get_transcription_statuses(),
+            pre_queries=sql_queries,
+        )
+    except psycopg2.Error:
+        # isolate the failing rows: the others are committed, the failing rows
+        # are reported (and retried by the next run) and raise QueryBatchError
+        logger.warning(
+            f"Bulk load failed, inserting the statuses in chunks of {CHUNK_SIZE}"
+        )
+        sql_queries.extend(
+            transcription_status.to_sql()
+            for transcription_status in get_transcription_statuses()
+        )
+        db.execute_queries(
+            config_file=config_file,
+            queries=sql_queries,
+            show_commands=False,
+            chunk_size=CHUNK_SIZE,
+        )
+        return
 
-    db.execute_queries(
-        config_file=config_file,
-        queries=sql_queries,
-        show_commands=False,
-        show_progress=True,
-    )
+    skipped = len(status_df) - inserted
+    if skipped > 0:
+        logger.warning(
+            f"Skipped {skipped} rows with an existing subject, study, "
+            "interview type and session"
+        )
 
 
 def status_df_to_sheets(config_file: Path, status_df: pd.DataFrame) -> None:
@@ -559,8 +667,8 @@ def status_df_to_sheets(config_file: Path, status_df: pd.DataFrame) -> None:
     Returns:
         None
     """
-    sheets_params = utils.config(path=config_file, section="sheets")
-    datailed_worksheet_name = sheets_params["datailed_worksheet_name"]
+    sheets_settings = utils.get_settings(config_file).sheets
+    datailed_worksheet_name = sheets_settings.datailed_worksheet_name
 
     worksheet = sheets.get_worksheet(
         config_file=config_file, sheet_name=datailed_worksheet_name
@@ -584,6 +692,19 @@ def status_df_to_sheets(config_file: Path, status_df: pd.DataFrame) -> None:
 
 
 if __name__ == "__main__":
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--since-manifest",
+        dest="since_manifest",
+        type=Path,
+        nargs="?",
+        const=manifest.get_default_manifest_file(MODULE_NAME),
+        default=None,
+        help="Only update the status of subjects with changes since the manifest \
+of the previous run (default: data/manifests/<module>.manifest), and update it.",
+    )
+    args = arg_parser.parse_args()
+
     console.rule(f"[bold red]{MODULE_NAME}")
 
     config_file = utils.get_config_file_path()
@@ -595,20 +716,53 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
-    config_params = utils.config(config_file, "general")
-    data_root = Path(config_params["data_root"])
-    network = config_params["network"]
+    settings = utils.get_settings(config_file)
+    data_root = settings.general.data_root
+    network = settings.general.network
     logger.info(f"Data root: {data_root}")
     logger.info(f"Network: {network}")
 
-    status_df = get_pipeline_status_df(data_root=data_root, network=network)
+    export_path = repo_root / "data" / "transcription_status.csv"
+
+    subjects: Optional[Set[str]] = None
+    if args.since_manifest is not None:
+        current_manifest = manifest.Manifest.scan(
+            data_root=data_root,
+            data_type="processed",
+            sections=("PROTECTED", "GENERAL"),
+            network=network,
+            subdirectories=[
+                "pending_audio",
+                "rejected_audio",
+                "completed_audio",
+                "transcripts",
+            ],
+        )
+        changes = manifest.get_changes(args.since_manifest, current_manifest)
+        if changes is not None and not export_path.exists():
+            logger.warning(f"No previous status at {export_path}: updating everything")
+        elif changes is not None:
+            subjects = changes.get_subjects()
+            logger.info(f"Updating the status of {len(subjects)} changed subjects")
+
+    status_df = get_pipeline_status_df(
+        data_root=data_root, network=network, subjects=subjects
+    )
 
     status_df = add_transcript_files_status(status_df=status_df, data_root=data_root)
 
-    status_df = add_qc_status(status_df=status_df, data_root=data_root, network=network)
+    status_df = add_qc_status(
+        status_df=status_df, data_root=data_root, network=network, subjects=subjects
+    )
+
+    if subjects is not None:
+        status_df = merge_with_previous_df(
+            status_df=status_df,
+            previous_df=pd.read_csv(export_path),
+            subjects=subjects,
+        )
 
     status_df = finalize_df(status_df)
-    export_path = repo_root / "data" / "transcription_status.csv"
     logger.info(f"Exporting to {export_path}")
     status_df.to_csv(export_path, index=False)
     logger.info(f"Found {len(status_df)} transcript statuses.")
@@ -618,4 +772,7 @@ if __name__ == "__main__":
 
     status_df_to_db(config_file=config_file, status_df=status_df)
 
+    if args.since_manifest is not None:
+        current_manifest.save(args.since_manifest)
+
     console.log("[bold green]Done!")
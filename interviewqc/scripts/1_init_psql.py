@@ -18,11 +18,12 @@ except ValueError:
     pass
 
 import logging
+from argparse import ArgumentParser
 
 from rich.logging import RichHandler
 
 from interviewqc.helpers import utils
-from interviewqc import models
+from interviewqc import migrations, models
 
 MODULE_NAME = "interviewqc_init_psql"
 
@@ -47,7 +48,21 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
-    logger.info("Initializing database...")
-    models.init_db(config_file=config_file)
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument(
+        "--reset",
+        dest="reset",
+        action="store_true",
+        help="Drop all tables (and their data) before creating them.",
+    )
+    args = arg_parser.parse_args()
+
+    if args.reset:
+        logger.warning("Dropping and recreating all tables...")
+        models.init_db(config_file=config_file)
+    else:
+        logger.info("Upgrading database schema...")
+        version = migrations.upgrade(config_file=config_file)
+        logger.info(f"Database schema at version {version}")
 
     logger.info("Done.")
@@ -24,7 +24,7 @@ import json
 from rich.logging import RichHandler
 
 from interviewqc.helpers import utils, db
-from interviewqc.helpers.config import config
+from interviewqc.helpers.config import get_settings
 from interviewqc.models.site import Site
 
 MODULE_NAME = "interviewqc_import_sites"
@@ -78,8 +78,9 @@ if __name__ == "__main__":
         config_file=config_file, module_name=MODULE_NAME, logger=logger
     )
 
-    config_params = config(config_file, "general")
-    sites_json = Path(config_params["sites_json"])
+    sites_json = get_settings(config_file).general.sites_json
+    if sites_json is None:
+        raise ValueError(f"sites_json not set in the [general] section of {config_file}")
     logger.debug(f"Using sites json file: {sites_json}")
 
     logger.info("Importing sites json file to database")
@@ -0,0 +1,121 @@
+import os
+
+from interviewqc.helpers.checksum import (
+    SidecarEntry,
+    get_sidecar_algorithm,
+    parse_sidecar,
+)
+
+MD5 = "0123456789abcdef0123456789abcdef"
+SHA256 = "ab" * 32
+SIDECAR_MTIME_NS = 2_000
+
+
+def make_stat(size: int, mtime_ns: int) -> os.stat_result:
+    # st_mode, st_ino, st_dev, st_nlink, st_uid, st_gid, st_size, the integer
+    # and float (atime, mtime, ctime), then (atime, mtime, ctime) in ns
+    return os.stat_result((0, 0, 0, 0, 0, 0, size, 0, 0, 0, 0, 0, 0, 0, mtime_ns, 0))
+
+
+def test_parse_gnu_lines_infers_algorithm_from_length():
+    entries = parse_sidecar(
+        [f"{MD5}  a.wav\n", f"{SHA256} *b file.wav\n"],
+        algorithm=None,
+        sidecar_mtime_ns=SIDECAR_MTIME_NS,
+    )
+
+    assert entries == {
+        ("a.wav", "md5"): SidecarEntry(digest=MD5, sidecar_mtime_ns=SIDECAR_MTIME_NS),
+        ("b file.wav", "sha256"): SidecarEntry(
+            digest=SHA256, sidecar_mtime_ns=SIDECAR_MTIME_NS
+        ),
+    }
+
+
+def test_parse_bsd_lines_and_uppercase_digests():
+    entries = parse_sidecar(
+        [f"MD5 (a.wav) = {MD5.upper()}", f"SHA-256 (b.wav) = {SHA256}"],
+        algorithm=None,
+        sidecar_mtime_ns=SIDECAR_MTIME_NS,
+    )
+
+    assert entries[("a.wav", "md5")].digest == MD5
+    assert entries[("b.wav", "sha256")].digest == SHA256
+
+
+def test_parse_uses_the_algorithm_of_the_sidecar_name():
+    algorithm = get_sidecar_algorithm(".checksum.blake2b")
+    entries = parse_sidecar(
+        [f"{MD5}  a.wav"], algorithm=algorithm, sidecar_mtime_ns=SIDECAR_MTIME_NS
+    )
+
+    assert algorithm == "blake2b"
+    assert get_sidecar_algorithm(".checksum") is None
+    assert list(entries) == [("a.wav", "blake2b")]
+
+
+def test_parse_skips_unknown_lengths_and_invalid_lines():
+    entries = parse_sidecar(
+        ["abc123  short.wav", "not a checksum line", "", f"{MD5}  a.wav"],
+        algorithm=None,
+        sidecar_mtime_ns=SIDECAR_MTIME_NS,
+    )
+
+    assert list(entries) == [("a.wav", "md5")]
+
+
+def test_parse_attaches_the_stat_comment_to_the_next_digest_only():
+    entries = parse_sidecar(
+        [
+            "# size=10 mtime_ns=1000",
+            f"{MD5}  a.wav",
+            f"{MD5}  b.wav",
+            "# size=20 mtime_ns=1500",
+            "invalid line",
+            f"{MD5}  c.wav",
+        ],
+        algorithm=None,
+        sidecar_mtime_ns=SIDECAR_MTIME_NS,
+    )
+
+    assert (entries[("a.wav", "md5")].size, entries[("a.wav", "md5")].mtime_ns) == (
+        10,
+        1000,
+    )
+    assert entries[("b.wav", "md5")].size is None
+    # an invalid line between a comment and its digest drops the comment
+    assert entries[("c.wav", "md5")].size is None
+
+
+def test_parse_later_entries_replace_earlier_ones():
+    other = "f" * 32
+    entries = parse_sidecar(
+        [f"{MD5}  a.wav", f"{other}  a.wav"],
+        algorithm=None,
+        sidecar_mtime_ns=SIDECAR_MTIME_NS,
+    )
+
+    assert entries[("a.wav", "md5")].digest == other
+
+
+def test_entry_is_trusted_only_with_a_matching_recorded_stat():
+    entry = SidecarEntry(
+        digest=MD5, sidecar_mtime_ns=SIDECAR_MTIME_NS, size=10, mtime_ns=1000
+    )
+
+    assert entry.matches(make_stat(size=10, mtime_ns=1000))
+    assert not entry.matches(make_stat(size=11, mtime_ns=1000))
+    assert not entry.matches(make_stat(size=10, mtime_ns=1001))
+
+
+def test_entry_without_recorded_size_is_not_trusted():
+    entry = SidecarEntry(digest=MD5, sidecar_mtime_ns=SIDECAR_MTIME_NS)
+
+    assert not entry.matches(make_stat(size=10, mtime_ns=1000))
+
+
+def test_entry_is_not_trusted_for_files_modified_after_the_sidecar():
+    entry = SidecarEntry(digest=MD5, sidecar_mtime_ns=SIDECAR_MTIME_NS, size=10)
+
+    assert entry.matches(make_stat(size=10, mtime_ns=SIDECAR_MTIME_NS))
+    assert not entry.matches(make_stat(size=10, mtime_ns=SIDECAR_MTIME_NS + 1))
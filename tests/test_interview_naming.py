@@ -0,0 +1,100 @@
+"""
+The interview naming functions of migrations.v0008_interview_naming, against
+their Python counterparts.
+
+These tests need a PostgreSQL database: set INTERVIEWQC_TEST_CONFIG to a
+configuration file with a [postgresql] section. The functions are created in a
+transaction that is rolled back, so the database is left unchanged.
+"""
+
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from interviewqc.helpers import db, dpdash
+from interviewqc.migrations import v0008_interview_naming
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+CONSENT_DATE = datetime(2023, 1, 15, 0, 0)
+
+EVENT_DATES: List[datetime] = [
+    CONSENT_DATE,
+    CONSENT_DATE + timedelta(hours=5),
+    CONSENT_DATE + timedelta(days=1),
+    CONSENT_DATE + timedelta(days=31, hours=23, minutes=59),
+    CONSENT_DATE - timedelta(hours=1),
+    CONSENT_DATE - timedelta(days=1),
+    CONSENT_DATE - timedelta(days=40, hours=12),
+    CONSENT_DATE + timedelta(days=12000),
+]
+
+
+@pytest.fixture(scope="module")
+def cursor() -> Iterator:
+    config_file = os.environ.get("INTERVIEWQC_TEST_CONFIG")
+    if not config_file:
+        pytest.skip("INTERVIEWQC_TEST_CONFIG is not set")
+
+    try:
+        conn = psycopg2.connect(**db.get_connection_params(Path(config_file)))
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Cannot connect to the test database: {e}")
+
+    try:
+        with conn.cursor() as cur:
+            for query in v0008_interview_naming.QUERIES:
+                cur.execute(query)
+            yield cur
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def get_sql_naming(cursor, event_date: datetime) -> Tuple[int, str, str]:
+    cursor.execute(
+        """
+        SELECT interviewqc_days_since_consent(%(consent)s, %(event)s),
+            interviewqc_dpdash_timepoint(%(consent)s, %(event)s),
+            interviewqc_interview_name(
+                'YA00001', 'open',
+                interviewqc_dpdash_timepoint(%(consent)s, %(event)s)
+            );
+        """,
+        {"consent": CONSENT_DATE, "event": event_date},
+    )
+    return cursor.fetchone()
+
+
+@pytest.mark.parametrize("event_date", EVENT_DATES, ids=str)
+def test_sql_naming_matches_python(cursor, event_date: datetime):
+    timepoint = dpdash.get_dpdash_timepoint(
+        consent_date=CONSENT_DATE, event_date=event_date
+    )
+    name = dpdash.get_dpdash_name(
+        study="YA",
+        subject="YA00001",
+        data_type="interview",
+        category="open",
+        optional_tag=None,
+        time_range=timepoint,
+    )
+    days_since_consent = (event_date - CONSENT_DATE).days + 1
+
+    assert get_sql_naming(cursor, event_date) == (days_since_consent, timepoint, name)
+
+
+def test_sql_interview_name_without_type(cursor):
+    cursor.execute("SELECT interviewqc_interview_name('YA00001', '', 'day0');")
+
+    assert cursor.fetchone()[0] == dpdash.get_dpdash_name(
+        study="YA",
+        subject="YA00001",
+        data_type="interview",
+        category=None,
+        optional_tag=None,
+        time_range="day0",
+    )
@@ -0,0 +1,141 @@
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from interviewqc.fs import walker
+from interviewqc.fs.manifest import KIND_CODES, Manifest
+
+DATA_ROOT = Path("/data")
+SUBJECT_DIR = "PROTECTED/PronetYA/raw/YA00001/interviews/open"
+
+FILE = KIND_CODES[walker.KIND_FILE]
+DIR = KIND_CODES[walker.KIND_DIR]
+
+# path -> (size, mtime_ns, inode, kind, digest)
+Entries = Dict[str, Tuple[int, int, int, int, bytes]]
+
+
+def make_manifest(entries: Entries) -> Manifest:
+    paths = np.empty(len(entries), dtype=object)
+    paths[:] = list(entries)
+    columns = list(zip(*entries.values())) or [()] * 5
+
+    return Manifest(
+        data_root=DATA_ROOT,
+        paths=paths,
+        sizes=np.asarray(columns[0], dtype=np.int64),
+        mtimes_ns=np.asarray(columns[1], dtype=np.int64),
+        inodes=np.asarray(columns[2], dtype=np.int64),
+        kinds=np.asarray(columns[3], dtype=np.uint8),
+        digests=np.asarray(columns[4], dtype=np.bytes_),
+    )
+
+
+def diff_paths(current: Entries, previous: Entries) -> Tuple[set, set, set]:
+    diff = make_manifest(current).diff(make_manifest(previous))
+    return (
+        set(diff.added.paths.tolist()),
+        set(diff.removed.paths.tolist()),
+        set(diff.modified.paths.tolist()),
+    )
+
+
+def test_diff_of_identical_manifests_is_empty():
+    entries = {
+        f"{SUBJECT_DIR}/a": (10, 100, 1, DIR, b""),
+        f"{SUBJECT_DIR}/a/audio.m4a": (20, 200, 2, FILE, b"d" * 32),
+    }
+
+    diff = make_manifest(entries).diff(make_manifest(entries))
+
+    assert len(diff) == 0
+    assert diff.get_subjects() == set()
+
+
+def test_diff_finds_added_removed_and_modified_entries():
+    previous = {
+        f"{SUBJECT_DIR}/kept.wav": (10, 100, 1, FILE, b""),
+        f"{SUBJECT_DIR}/removed.wav": (10, 100, 2, FILE, b""),
+        f"{SUBJECT_DIR}/resized.wav": (10, 100, 3, FILE, b""),
+        f"{SUBJECT_DIR}/touched.wav": (10, 100, 4, FILE, b""),
+        f"{SUBJECT_DIR}/replaced.wav": (10, 100, 5, FILE, b""),
+        f"{SUBJECT_DIR}/now_a_dir": (10, 100, 6, FILE, b""),
+    }
+    current = {
+        f"{SUBJECT_DIR}/added.wav": (10, 100, 7, FILE, b""),
+        f"{SUBJECT_DIR}/kept.wav": (10, 100, 1, FILE, b""),
+        f"{SUBJECT_DIR}/resized.wav": (11, 100, 3, FILE, b""),
+        f"{SUBJECT_DIR}/touched.wav": (10, 101, 4, FILE, b""),
+        f"{SUBJECT_DIR}/replaced.wav": (10, 100, 8, FILE, b""),
+        f"{SUBJECT_DIR}/now_a_dir": (10, 100, 6, DIR, b""),
+    }
+
+    added, removed, modified = diff_paths(current, previous)
+
+    assert added == {f"{SUBJECT_DIR}/added.wav"}
+    assert removed == {f"{SUBJECT_DIR}/removed.wav"}
+    assert modified == {
+        f"{SUBJECT_DIR}/resized.wav",
+        f"{SUBJECT_DIR}/touched.wav",
+        f"{SUBJECT_DIR}/replaced.wav",
+        f"{SUBJECT_DIR}/now_a_dir",
+    }
+
+
+def test_diff_compares_digests_only_if_both_are_known():
+    previous = {
+        f"{SUBJECT_DIR}/changed.wav": (10, 100, 1, FILE, b"a" * 32),
+        f"{SUBJECT_DIR}/newly_hashed.wav": (10, 100, 2, FILE, b""),
+        f"{SUBJECT_DIR}/no_longer_cached.wav": (10, 100, 3, FILE, b"a" * 32),
+    }
+    current = {
+        f"{SUBJECT_DIR}/changed.wav": (10, 100, 1, FILE, b"b" * 32),
+        f"{SUBJECT_DIR}/newly_hashed.wav": (10, 100, 2, FILE, b"b" * 32),
+        f"{SUBJECT_DIR}/no_longer_cached.wav": (10, 100, 3, FILE, b""),
+    }
+
+    added, removed, modified = diff_paths(current, previous)
+
+    assert added == set()
+    assert removed == set()
+    assert modified == {f"{SUBJECT_DIR}/changed.wav"}
+
+
+def test_diff_against_an_empty_manifest_adds_everything():
+    current = {
+        f"{SUBJECT_DIR}/a.wav": (10, 100, 1, FILE, b""),
+        "PROTECTED/PronetYB/raw/YB00002/interviews/psychs/b.wav": (
+            10,
+            100,
+            2,
+            FILE,
+            b"",
+        ),
+    }
+
+    diff = make_manifest(current).diff(make_manifest({}))
+
+    assert set(diff.added.paths.tolist()) == set(current)
+    assert len(diff.removed) == 0
+    assert len(diff.modified) == 0
+    assert diff.get_subjects() == {"YA00001", "YB00002"}
+    assert diff.get_interview_paths(DATA_ROOT) == {
+        DATA_ROOT / SUBJECT_DIR / "a.wav",
+        DATA_ROOT / "PROTECTED/PronetYB/raw/YB00002/interviews/psychs/b.wav",
+    }
+
+
+def test_saved_manifest_diffs_empty_against_itself(tmp_path):
+    entries = {
+        f"{SUBJECT_DIR}/a": (10, 100, 1, DIR, b""),
+        f"{SUBJECT_DIR}/a/audio é.m4a": (20, 200, 2, FILE, b"d" * 32),
+    }
+    manifest_file = tmp_path / "test.manifest"
+
+    make_manifest(entries).save(manifest_file)
+    loaded = Manifest.load(manifest_file)
+
+    assert loaded is not None
+    assert loaded.paths.tolist() == list(entries)
+    assert len(make_manifest(entries).diff(loaded)) == 0
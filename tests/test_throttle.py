@@ -0,0 +1,76 @@
+from datetime import time as dtime
+
+import pytest
+
+from interviewqc.helpers import throttle
+from interviewqc.helpers.throttle import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(throttle.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def test_bucket_starts_full(clock: FakeClock):
+    bucket = TokenBucket(rate=10, capacity=50)
+
+    assert bucket.take(50) == 0.0
+
+
+def test_taking_more_than_available_waits_for_the_debt(clock: FakeClock):
+    bucket = TokenBucket(rate=10, capacity=50)
+
+    assert bucket.take(40) == 0.0
+    # 10 tokens left: 20 more are paid back at 10 per second
+    assert bucket.take(30) == pytest.approx(2.0)
+    # the debt accumulates
+    assert bucket.take(10) == pytest.approx(3.0)
+
+
+def test_tokens_refill_at_rate_up_to_capacity(clock: FakeClock):
+    bucket = TokenBucket(rate=10, capacity=50)
+    bucket.take(50)
+
+    clock.now += 2
+    assert bucket.take(20) == 0.0
+    assert bucket.take(1) == pytest.approx(0.1)
+
+    # a long pause only refills up to the capacity
+    clock.now += 3600
+    assert bucket.take(50) == 0.0
+    assert bucket.take(10) == pytest.approx(1.0)
+
+
+def test_capacity_is_at_least_one_token(clock: FakeClock):
+    bucket = TokenBucket(rate=2, capacity=0)
+
+    assert bucket.capacity == 1.0
+    assert bucket.take(1) == 0.0
+    assert bucket.take(1) == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (dtime(21, 59), False),
+        (dtime(22, 0), True),
+        (dtime(3, 0), True),
+        (dtime(6, 0), False),
+        (dtime(12, 30), True),
+        (dtime(13, 0), False),
+    ],
+)
+def test_is_in_hours_with_windows_spanning_midnight(now: dtime, expected: bool):
+    hours = [(dtime(22, 0), dtime(6, 0)), (dtime(12, 0), dtime(13, 0))]
+
+    assert throttle.is_in_hours(now, hours) is expected